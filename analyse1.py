@@ -3,15 +3,24 @@ import pandas as pd
 import plotly.express as px
 from docx import Document
 from docx.shared import Inches
-import tempfile
-import os
-from config import translations  # Import translation dictionary
+from io import BytesIO
+from config import translations, LAZY_CHARTS_PRELOAD  # Import translation dictionary
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint, get_or_build_figure
+from figure_export import get_render_service, RENDER_TIMEOUT_SECONDS
+from viz_utils import VisualizationUtilities
+from chart_bundle import register_chart
+from report_jobs import report_export_button, report_progress
+from docx_tables import add_bulk_table
 # Import du module de crédits
 try:
     from credits import add_credits_to_word_report
     CREDITS_AVAILABLE = True
 except ImportError:
     CREDITS_AVAILABLE = False
+
+# Distribution figures (as dicts) keyed by indicator data and language
+_DISTRIBUTION_CACHE = LRUCache(max_entries=64)
+
 def show_statistical_overview(df, language):
     """
     Displays descriptive statistics and visualizations for selected variables.
@@ -87,27 +96,20 @@ def show_statistical_overview(df, language):
             
             # Word Export
             with col2:
-                if st.button(t.get("export_word", "📄 Export to Word")):
-                    try:
-                        doc = create_word_report(df_filtered, stats_summary, selected_columns, t, language)
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                            doc.save(tmp.name)
-                            with open(tmp.name, 'rb') as f:
-                                docx = f.read()
-                            st.download_button(
-                                t.get("download_word", "📥 Download Word Report"),
-                                docx,
-                                "descriptive_statistics.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.error(f"Error creating Word report: {str(e)}")
+                report_export_button(
+                    t.get("export_word", "📄 Export to Word"),
+                    "descriptive_statistics",
+                    create_word_report,
+                    "descriptive_statistics.docx",
+                    t,
+                    download_label=t.get("download_word", "📥 Download Word Report"),
+                    args=(df_filtered, stats_summary, selected_columns, t, language)
+                )
             
             # Detailed display by indicator
             st.subheader(t.get("distribution_scores", "📊 Distribution of Scores"))
             
-            for column in selected_columns:
+            for index, column in enumerate(selected_columns):
                 # Create columns for each indicator
                 col1, col2 = st.columns(2)
                 
@@ -118,21 +120,25 @@ def show_statistical_overview(df, language):
                     st.dataframe(indicator_stats)
                 
                 with col2:
-                    # Generate histogram with box plot
+                    # Registered for the chart bundle whether or not it is opened
+                    register_chart(
+                        "analyse1", f"distribution_{column}",
+                        lambda column=column: get_distribution_figure(df_filtered[column], column, t, language)
+                    )
+                    
+                    # Charts beyond the first few are only built once opened
+                    show_chart = st.toggle(
+                        t.get("show_chart", "Show chart"),
+                        value=index < LAZY_CHARTS_PRELOAD,
+                        key=f"show_distribution_{column}"
+                    )
+                    
+                    # Generate histogram with box plot (bins and quartiles computed here,
+                    # so the page size does not grow with the number of pupils)
                     try:
-                        fig = px.histogram(
-                            df_filtered,
-                            x=column,
-                            nbins=20,
-                            marginal="box",
-                            opacity=0.7,
-                            title=t.get("histogram_title", "Distribution of {}").format(
-                                t["columns_of_interest"].get(column, column)
-                            ),
-                            color_discrete_sequence=px.colors.qualitative.Plotly
-                        )
-                        fig.update_layout(showlegend=False)
-                        st.plotly_chart(fig, use_container_width=True)
+                        if show_chart:
+                            fig = get_distribution_figure(df_filtered[column], column, t, language)
+                            st.plotly_chart(fig, use_container_width=True)
                     except Exception as e:
                         st.error(f"Error creating visualization for {column}: {str(e)}")
                 
@@ -144,6 +150,50 @@ def show_statistical_overview(df, language):
     else:
         st.warning(t.get("warning_select_variable", "Please select at least one variable to analyze."))
 
+def get_distribution_figure(series, column, t, language):
+    """
+    Returns the distribution figure of one indicator, reusing the figure built
+    on an earlier rerun when the data and language are unchanged (as a new
+    figure object each time).
+    
+    Args:
+        series (pandas.Series): Scores of the indicator
+        column (str): Indicator column name
+        t (dict): Translation dictionary
+        language (str): Selected language
+        
+    Returns:
+        plotly.graph_objects.Figure: Histogram figure
+    """
+    key = make_cache_key("distribution", dataframe_fingerprint(series.to_frame()), column, language)
+    return get_or_build_figure(
+        _DISTRIBUTION_CACHE, key, lambda: create_distribution_figure(series, column, t, language)
+    )
+
+def create_distribution_figure(series, column, t, language):
+    """
+    Creates the histogram with marginal box plot of one indicator from
+    server-side aggregates (bin counts and box statistics).
+    
+    Args:
+        series (pandas.Series): Scores of the indicator
+        column (str): Indicator column name
+        t (dict): Translation dictionary
+        language (str): Selected language
+        
+    Returns:
+        plotly.graph_objects.Figure: Histogram figure
+    """
+    column_name = t["columns_of_interest"].get(column, column)
+    return VisualizationUtilities(language=language).create_binned_histogram(
+        series,
+        title=t.get("histogram_title", "Distribution of {}").format(column_name),
+        xaxis_title=column_name,
+        yaxis_title=t.get("count", "Count"),
+        bins=20,
+        color=px.colors.qualitative.Plotly[0]
+    )
+
 def create_word_report(df_filtered, stats_summary, selected_columns, t, language):
     """
     Creates a Word report with statistics and graphs.
@@ -167,77 +217,54 @@ def create_word_report(df_filtered, stats_summary, selected_columns, t, language
     
     # Create table with statistics
     # Add +1 to columns for row headers
-    table = doc.add_table(rows=len(stats_summary.index) + 1, cols=len(stats_summary.columns) + 1)
-    table.style = 'Table Grid'
-    
-    # Add column headers
-    header_cells = table.rows[0].cells
-    header_cells[0].text = "Statistic"
-    for idx, col in enumerate(stats_summary.columns):
-        header_cells[idx + 1].text = t["columns_of_interest"].get(col, col)
-    
-    # Add row data
-    for i, stat_name in enumerate(stats_summary.index):
-        row_cells = table.rows[i + 1].cells
-        row_cells[0].text = str(stat_name)
-        for j, col in enumerate(stats_summary.columns):
-            row_cells[j + 1].text = str(stats_summary.loc[stat_name, col])
+    add_bulk_table(
+        doc,
+        stats_summary.itertuples(name=None),
+        headers=["Statistic"] + [t["columns_of_interest"].get(col, col) for col in stats_summary.columns],
+        bold_header=False
+    )
     
     doc.add_paragraph("")  # Space
     
     # Section for each indicator
     doc.add_heading(t.get("distribution_scores", "Distribution of Scores"), level=2)
     
-    # Create temporary directory for images
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        for col in selected_columns:
-            # Indicator title
-            doc.add_heading(t["columns_of_interest"].get(col, col), level=3)
-            
-            # Specific indicator statistics
-            indicator_stats = df_filtered[col].describe(percentiles=[.25, .5, .75, .9]).round(2)
-            
-            # Create table for this indicator
-            table = doc.add_table(rows=len(indicator_stats.index) + 1, cols=2)
-            table.style = 'Table Grid'
-            
-            # Headers
-            header_cells = table.rows[0].cells
-            header_cells[0].text = "Statistic"
-            header_cells[1].text = "Value"
-            
-            # Fill statistics
-            for i, stat_name in enumerate(indicator_stats.index):
-                row_cells = table.rows[i + 1].cells
-                row_cells[0].text = str(stat_name)
-                row_cells[1].text = str(indicator_stats.loc[stat_name])
-            
-            doc.add_paragraph("")  # Space
-            
-            # Create and add histogram
-            try:
-                fig = px.histogram(
-                    df_filtered,
-                    x=col,
-                    nbins=20,
-                    marginal="box",
-                    opacity=0.7,
-                    title=t.get("histogram_title", "Distribution of {}").format(
-                        t["columns_of_interest"].get(col, col)
-                    ),
-                    color_discrete_sequence=px.colors.qualitative.Plotly
-                )
-                
-                img_path = os.path.join(tmp_dir, f"{col}_histogram.png")
-                fig.write_image(img_path, width=1000, height=600)
+    # Queue all histograms at once so they render in parallel
+    render_service = get_render_service()
+    rendered = {}
+    for col in selected_columns:
+        try:
+            fig = create_distribution_figure(df_filtered[col], col, t, language)
+            rendered[col] = render_service.submit(fig, width=1000, height=600)
+        except Exception as e:
+            rendered[col] = e
+    
+    for index, col in enumerate(selected_columns):
+        report_progress(index / len(selected_columns), t["columns_of_interest"].get(col, col))
+        
+        # Indicator title
+        doc.add_heading(t["columns_of_interest"].get(col, col), level=3)
+
+        # Specific indicator statistics
+        indicator_stats = df_filtered[col].describe(percentiles=[.25, .5, .75, .9]).round(2)
+
+        # Create table for this indicator
+        add_bulk_table(doc, indicator_stats.items(), headers=["Statistic", "Value"], bold_header=False)
+
+        doc.add_paragraph("")  # Space
+
+        # Add the rendered histogram
+        try:
+            if isinstance(rendered[col], Exception):
+                raise rendered[col]
                 
-                # Add image to document
-                doc.add_picture(img_path, width=Inches(6))
-                doc.add_paragraph("")  # Space after image
-            except Exception as e:
-                # Add error message if visualization fails
-                doc.add_paragraph(f"Error generating visualization: {str(e)}")
-        # ========== AJOUTER LES CRÉDITS ==========
+            # Add image to document
+            doc.add_picture(BytesIO(rendered[col].result(timeout=RENDER_TIMEOUT_SECONDS)), width=Inches(6))
+            doc.add_paragraph("")  # Space after image
+        except Exception as e:
+            # Add error message if visualization fails
+            doc.add_paragraph(f"Error generating visualization: {str(e)}")
+    # ========== AJOUTER LES CRÉDITS ==========
     if CREDITS_AVAILABLE:
         doc = add_credits_to_word_report(doc, language=language)
 
@@ -5,9 +5,10 @@ import plotly.express as px
 import scipy.stats as stats
 from docx import Document
 from docx.shared import Inches
-import tempfile
-import os
 from config import translations, egra_columns, egma_columns
+from figure_export import figure_to_stream
+from report_jobs import report_export_button
+from chart_bundle import register_chart
 # Import du module de crédits
 try:
     from credits import add_credits_to_word_report
@@ -196,6 +197,7 @@ def show_gender_effect(df, language):
                 height=600
             )
             
+            register_chart("analyse10", "gender_means", fig)
             st.plotly_chart(fig, use_container_width=True)
             
             # Distribution plots (Box plots) by gender for each variable
@@ -234,6 +236,7 @@ def show_gender_effect(df, language):
                             height=400
                         )
                         
+                        register_chart("analyse10", f"gender_box_{column}", box_fig)
                         st.plotly_chart(box_fig, use_container_width=True)
                 
                 with col2:
@@ -264,6 +267,7 @@ def show_gender_effect(df, language):
                             height=400
                         )
                         
+                        register_chart("analyse10", f"gender_box_{column}", box_fig)
                         st.plotly_chart(box_fig, use_container_width=True)
             
             # Statistical significance testing (Mann-Whitney U test)
@@ -412,25 +416,15 @@ def show_gender_effect(df, language):
                     """))
             
             # Export to Word 
-            if st.button(t.get("export_gender_word", "📄 Export to Word")):
-                try:
-                    doc = create_gender_effect_word_report(
-                        df_analysis, test_results, mean_scores_by_gender, selected_columns, t, language
-                    )
-                    
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                        doc.save(tmp.name)
-                        with open(tmp.name, 'rb') as f:
-                            docx = f.read()
-                        st.download_button(
-                            t.get("download_gender_word", "📥 Download Word Report"),
-                            docx,
-                            "gender_effect_analysis.docx",
-                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        )
-                    os.unlink(tmp.name)
-                except Exception as e:
-                    st.error(f"Error creating Word report: {str(e)}")
+            report_export_button(
+                t.get("export_gender_word", "📄 Export to Word"),
+                "gender_effect_analysis",
+                create_gender_effect_word_report,
+                "gender_effect_analysis.docx",
+                t,
+                download_label=t.get("download_gender_word", "📥 Download Word Report"),
+                args=(df_analysis, test_results, mean_scores_by_gender, selected_columns, t, language)
+            )
         
         except Exception as e:
             st.error(f"Error in gender effect analysis: {str(e)}")
@@ -546,34 +540,29 @@ def create_gender_effect_word_report(df, test_results, mean_scores, selected_col
     # Distribution plots for each variable
     doc.add_heading(t.get("distribution_gender", "Score Distributions by Gender"), level=2)
     
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        for column in selected_columns:
-            col_name = t["columns_of_interest"].get(column, column)
-            doc.add_heading(col_name, level=3)
-            
-            # Create box plot
-            fig = px.box(
-                df,
-                x="gender",
-                y=column,
-                color="gender",
-                labels={
-                    "gender": t.get("gender", "Gender"),
-                    column: col_name
-                },
-                color_discrete_map={
-                    t.get("boy", "Boy"): "#3498DB",
-                    t.get("girl", "Girl"): "#E83E8C"
-                }
-            )
-            
-            # Save plot
-            img_path = os.path.join(tmp_dir, f"{column}_gender_boxplot.png")
-            fig.write_image(img_path, width=800, height=400)
-            
-            # Add plot to document
-            doc.add_picture(img_path, width=Inches(6))
-            doc.add_paragraph()
+    for column in selected_columns:
+        col_name = t["columns_of_interest"].get(column, column)
+        doc.add_heading(col_name, level=3)
+
+        # Create box plot
+        fig = px.box(
+            df,
+            x="gender",
+            y=column,
+            color="gender",
+            labels={
+                "gender": t.get("gender", "Gender"),
+                column: col_name
+            },
+            color_discrete_map={
+                t.get("boy", "Boy"): "#3498DB",
+                t.get("girl", "Girl"): "#E83E8C"
+            }
+        )
+
+        # Add plot to document
+        doc.add_picture(figure_to_stream(fig, width=800, height=400), width=Inches(6))
+        doc.add_paragraph()
     
     # Summary of gender differences
     doc.add_heading(t.get("gender_summary", "Summary of Gender Differences"), level=2)
@@ -5,9 +5,10 @@ import plotly.express as px
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import tempfile
-import os
 from config import translations, egra_columns, egma_columns
+from figure_export import figure_to_stream
+from report_jobs import report_export_button
+from chart_bundle import register_chart
 # Import du module de crédits
 try:
     from credits import add_credits_to_word_report
@@ -188,6 +189,7 @@ def show_international_comparison(df, language):
                 height=600
             )
             
+            register_chart("analyse12", "benchmark_comparison", fig)
             st.plotly_chart(fig, use_container_width=True)
             
             # Visualization of percentage achieved
@@ -241,6 +243,7 @@ def show_international_comparison(df, language):
                 height=600
             )
             
+            register_chart("analyse12", "benchmark_percentage", percentage_fig)
             st.plotly_chart(percentage_fig, use_container_width=True)
             
             # Analysis of results
@@ -366,25 +369,16 @@ def show_international_comparison(df, language):
             
             # Word Export
             with col2:
-                if st.button(t.get("export_international_word", "📄 Export to Word")):
-                    try:
-                        doc = create_international_comparison_word_report(
-                            comparison_data, fig, percentage_fig, reading_percentage, math_percentage, overall_percentage, t, language
-                        )
-                        
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                            doc.save(tmp.name)
-                            with open(tmp.name, 'rb') as f:
-                                docx = f.read()
-                            st.download_button(
-                                t.get("download_international_word", "📥 Download Word Report"),
-                                docx,
-                                "international_comparison.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.error(f"Error creating Word report: {str(e)}")
+                report_export_button(
+                    t.get("export_international_word", "📄 Export to Word"),
+                    "international_comparison",
+                    create_international_comparison_word_report,
+                    "international_comparison.docx",
+                    t,
+                    download_label=t.get("download_international_word", "📥 Download Word Report"),
+                    args=(comparison_data, fig, percentage_fig, reading_percentage, math_percentage,
+                          overall_percentage, t, language)
+                )
         
         except Exception as e:
             st.error(f"Error in international comparison analysis: {str(e)}")
@@ -444,18 +438,13 @@ def create_international_comparison_word_report(comparison_data, fig1, fig2, rea
     doc.add_heading(t.get("visualizations", "Visualizations"), level=2)
     
     # Save and add charts
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        # Comparison bar chart
-        img1_path = os.path.join(tmp_dir, "comparison_chart.png")
-        fig1.write_image(img1_path, width=900, height=500)
-        doc.add_picture(img1_path, width=Inches(6))
-        doc.add_paragraph()
-        
-        # Percentage achievement chart
-        img2_path = os.path.join(tmp_dir, "percentage_chart.png")
-        fig2.write_image(img2_path, width=900, height=500)
-        doc.add_picture(img2_path, width=Inches(6))
-        doc.add_paragraph()
+    # Comparison bar chart
+    doc.add_picture(figure_to_stream(fig1, width=900, height=500), width=Inches(6))
+    doc.add_paragraph()
+
+    # Percentage achievement chart
+    doc.add_picture(figure_to_stream(fig2, width=900, height=500), width=Inches(6))
+    doc.add_paragraph()
     
     # Analysis of results
     doc.add_heading(t.get("results_analysis", "Analysis of Results"), level=2)
@@ -11,9 +11,10 @@ except ImportError:
     CREDITS_AVAILABLE = False
     st.warning("⚠️ Module 'credits.py' non trouvé. Les crédits ne seront pas affichés.")
 from docx.shared import Inches
-import tempfile
-import os
 from config import translations, egra_columns, egma_columns
+from figure_export import figure_to_stream
+from report_jobs import report_export_button
+from chart_bundle import register_chart
 
 def show_language_comparison(df, language):
     """
@@ -179,6 +180,7 @@ def show_language_comparison(df, language):
                 height=600
             )
             
+            register_chart("analyse13", "language_means", fig)
             st.plotly_chart(fig, use_container_width=True)
             
             # Distribution plots (Box plots) by language for each variable
@@ -217,6 +219,7 @@ def show_language_comparison(df, language):
                             height=400
                         )
                         
+                        register_chart("analyse13", f"language_box_{column}", box_fig)
                         st.plotly_chart(box_fig, use_container_width=True)
                 
                 with col2:
@@ -247,6 +250,7 @@ def show_language_comparison(df, language):
                             height=400
                         )
                         
+                        register_chart("analyse13", f"language_box_{column}", box_fig)
                         st.plotly_chart(box_fig, use_container_width=True)
             
             # Statistical significance testing (Mann-Whitney U test)
@@ -397,26 +401,16 @@ def show_language_comparison(df, language):
                         """))
                 
                 # Export to Word
-                if st.button(t.get("export_language_word", "📄 Export to Word")):
-                    try:
-                        doc = create_language_comparison_word_report(
-                            df_analysis, test_results if has_english and has_dutch else [], 
-                            mean_scores, sample_sizes, selected_columns, t, language
-                        )
-                        
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                            doc.save(tmp.name)
-                            with open(tmp.name, 'rb') as f:
-                                docx = f.read()
-                            st.download_button(
-                                t.get("download_language_word", "📥 Download Word Report"),
-                                docx,
-                                "language_comparison_analysis.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.error(f"Error creating Word report: {str(e)}")
+                report_export_button(
+                    t.get("export_language_word", "📄 Export to Word"),
+                    "language_comparison_analysis",
+                    create_language_comparison_word_report,
+                    "language_comparison_analysis.docx",
+                    t,
+                    download_label=t.get("download_language_word", "📥 Download Word Report"),
+                    args=(df_analysis, test_results if has_english and has_dutch else [],
+                          mean_scores, sample_sizes, selected_columns, t, language)
+                )
             else:
                 st.info(t.get("cannot_perform_tests", "Statistical tests cannot be performed because data for both English and Dutch instruction is not available."))
         
@@ -533,34 +527,29 @@ def create_language_comparison_word_report(df, test_results, mean_scores, sample
     # Distribution plots for each variable
     doc.add_heading(t.get("distribution_language", "Score Distributions by Language of Instruction"), level=2)
     
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        for column in selected_columns:
-            col_name = t["columns_of_interest"].get(column, column)
-            doc.add_heading(col_name, level=3)
-            
-            # Create box plot
-            fig = px.box(
-                df[df["language_teaching"].isin(["English", "Dutch"])],
-                x="language_teaching",
-                y=column,
-                color="language_teaching",
-                labels={
-                    "language_teaching": t.get("language_of_instruction", "Language of Instruction"),
-                    column: col_name
-                },
-                color_discrete_map={
-                    "English": "#3498DB",
-                    "Dutch": "#F39C12"
-                }
-            )
-            
-            # Save plot
-            img_path = os.path.join(tmp_dir, f"{column}_language_boxplot.png")
-            fig.write_image(img_path, width=800, height=400)
-            
-            # Add plot to document
-            doc.add_picture(img_path, width=Inches(6))
-            doc.add_paragraph()
+    for column in selected_columns:
+        col_name = t["columns_of_interest"].get(column, column)
+        doc.add_heading(col_name, level=3)
+
+        # Create box plot
+        fig = px.box(
+            df[df["language_teaching"].isin(["English", "Dutch"])],
+            x="language_teaching",
+            y=column,
+            color="language_teaching",
+            labels={
+                "language_teaching": t.get("language_of_instruction", "Language of Instruction"),
+                column: col_name
+            },
+            color_discrete_map={
+                "English": "#3498DB",
+                "Dutch": "#F39C12"
+            }
+        )
+
+        # Add plot to document
+        doc.add_picture(figure_to_stream(fig, width=800, height=400), width=Inches(6))
+        doc.add_paragraph()
     
     # Summary of language differences
     if test_results:
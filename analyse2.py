@@ -3,8 +3,6 @@ import pandas as pd
 import plotly.express as px
 from docx import Document
 from docx.shared import Inches, RGBColor
-import tempfile
-import os
 import warnings
 from io import BytesIO
 from dotenv import load_dotenv
@@ -15,9 +13,13 @@ warnings.filterwarnings('ignore', category=FutureWarning)
 
 # Import configuration depuis le fichier de config principal
 from config import translations
+from figure_export import figure_to_stream
+from markdown_docx import add_markdown
 
 # Import configuration depuis le fichier de config principal
 from config import translations
+from chart_bundle import register_chart
+from report_jobs import report_export_button
 
 # Import du module de crédits
 try:
@@ -298,13 +300,10 @@ def create_complete_word_report(df_zero_scores: pd.DataFrame, fig, t: dict, ai_i
     doc.add_heading(t.get("visualization_title", "Visualization"), level=2)
     
     # Exporter le graphique en image
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        img_path = os.path.join(tmp_dir, "zero_scores_chart.png")
-        try:
-            fig.write_image(img_path, width=1200, height=600)
-            doc.add_picture(img_path, width=Inches(6.5))
-        except Exception as e:
-            doc.add_paragraph(f"[{t.get('visualization_title', 'Visualization')} not available: {str(e)}]")
+    try:
+        doc.add_picture(figure_to_stream(fig, width=1200, height=600), width=Inches(6.5))
+    except Exception as e:
+        doc.add_paragraph(f"[{t.get('visualization_title', 'Visualization')} not available: {str(e)}]")
     
     doc.add_paragraph()
     
@@ -314,21 +313,8 @@ def create_complete_word_report(df_zero_scores: pd.DataFrame, fig, t: dict, ai_i
         doc.add_paragraph(t.get("ai_interpretation_notice", "🤖 This interpretation was generated by artificial intelligence (Gemini)"))
         doc.add_paragraph("_" * 50)
         
-        # Ajouter l'interprétation IA (en préservant le formatage Markdown basique)
-        for line in ai_interpretation.split('\n'):
-            if line.strip().startswith('##'):
-                # Titre de niveau 2
-                doc.add_heading(line.replace('##', '').strip(), level=3)
-            elif line.strip().startswith('**') and line.strip().endswith('**'):
-                # Texte en gras
-                p = doc.add_paragraph()
-                p.add_run(line.strip().replace('**', '')).bold = True
-            elif line.strip().startswith('- ') or line.strip().startswith('* '):
-                # Liste à puces
-                doc.add_paragraph(line.strip()[2:], style='List Bullet')
-            elif line.strip():
-                # Paragraphe normal
-                doc.add_paragraph(line.strip())
+        # Ajouter l'interprétation IA (titres, listes, gras/italique, tableaux Markdown)
+        add_markdown(doc, ai_interpretation, heading_offset=1)
         
         doc.add_paragraph()
     else:
@@ -413,8 +399,6 @@ import pandas as pd
 import plotly.express as px
 from docx import Document
 from docx.shared import Inches, RGBColor
-import tempfile
-import os
 import warnings
 from io import BytesIO
 
@@ -723,6 +707,7 @@ def show_zero_scores(df: pd.DataFrame, language: str) -> None:
                 )
                 
                 st.session_state.zero_scores_fig = fig
+                register_chart("analyse2", "zero_scores", fig)
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating visualization: {str(e)}")
@@ -777,40 +762,20 @@ def show_zero_scores(df: pd.DataFrame, language: str) -> None:
                 )
             
             # Bouton 2: Rapport Complet (juste en dessous)
-            if st.button(
-                "📄 " + t.get("export_complete_report", "Générer Rapport Complet (Word)"),
-                use_container_width=True,
-                key="btn_report"
-            ):
-                try:
-                    if st.session_state.zero_scores_fig is not None:
-                        with st.spinner(t.get("generating_report", "📝 Génération du rapport complet...")):
-                            doc = create_complete_word_report(
-                                styled_df,
-                                st.session_state.zero_scores_fig,
-                                t,
-                                st.session_state.ai_interpretation_text,
-                                language=language
-                            )
-                            
-                            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                                doc.save(tmp.name)
-                                with open(tmp.name, 'rb') as f:
-                                    docx_data = f.read()
-                                
-                                st.download_button(
-                                    "📥 " + t.get("download_complete_report", "Télécharger le rapport"),
-                                    docx_data,
-                                    "rapport_complet_zero_scores.docx",
-                                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                    key='download-complete-report',
-                                    use_container_width=True
-                                )
-                        st.success(t.get("report_ready", "✅ Rapport généré avec succès!"))
-                    else:
-                        st.warning(t.get("wait_for_graph", "⚠️ Veuillez patienter, le graphique se charge..."))
-                except Exception as e:
-                    st.error(t.get("error_generating_report", "❌ Erreur: {error}").format(error=str(e)))
+            if st.session_state.zero_scores_fig is not None:
+                report_export_button(
+                    "📄 " + t.get("export_complete_report", "Générer Rapport Complet (Word)"),
+                    "zero_scores_report",
+                    create_complete_word_report,
+                    "rapport_complet_zero_scores.docx",
+                    t,
+                    download_label="📥 " + t.get("download_complete_report", "Télécharger le rapport"),
+                    args=(styled_df, st.session_state.zero_scores_fig, t, st.session_state.ai_interpretation_text),
+                    kwargs={"language": language},
+                    use_container_width=True
+                )
+            else:
+                st.warning(t.get("wait_for_graph", "⚠️ Veuillez patienter, le graphique se charge..."))
             
             # Section d'interprétation IA (affichée si générée)
             if st.session_state.show_interpretation and st.session_state.ai_interpretation_text:
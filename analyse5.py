@@ -1,15 +1,15 @@
 import streamlit as st
 import pandas as pd
-import tempfile
-import os
 from config import translations, egra_columns, egma_columns
 
 # Import modular components
-from correlation_modules.matrix import display_correlation_heatmap
+from correlation_modules.matrix import display_correlation_heatmap, create_correlation_heatmap
 from correlation_modules.interactive import display_interactive_analysis
 from correlation_modules.significant import display_significant_correlations
 from correlation_modules.interpretation import provide_educational_interpretation
 from correlation_modules.report import create_correlation_word_report
+from chart_bundle import register_chart
+from report_jobs import report_export_button
 # Import du module de crédits
 try:
     from credits import initialize_credits, add_credits_to_word_report
@@ -18,6 +18,26 @@ except ImportError:
     CREDITS_AVAILABLE = False
     st.warning("⚠️ Module 'credits.py' non trouvé. Les crédits ne seront pas affichés.")
 
+def build_correlation_report(corr_matrix, df_strong, t, df, language):
+    """
+    Creates the correlation Word report with the credits.
+    
+    Args:
+        corr_matrix (pandas.DataFrame): Correlation matrix
+        df_strong (pandas.DataFrame): Significant correlations
+        t (dict): Translation dictionary
+        df (pandas.DataFrame): The analyzed data
+        language (str): Report language (credits)
+        
+    Returns:
+        Document: The Word document
+    """
+    doc = create_correlation_word_report(corr_matrix, df_strong, t, df)
+    # ========== AJOUTER LES CRÉDITS ==========
+    if CREDITS_AVAILABLE:
+        doc = add_credits_to_word_report(doc, language=language)
+    return doc
+
 def show_correlation(df, language):
     """
     Displays correlation analysis between EGRA and EGMA variables with enhanced
@@ -99,28 +119,39 @@ def show_correlation(df, language):
             else:
                 df_strong = pd.DataFrame(columns=["task1", "task2", "correlation"])
             
-            # Create tabs for different analyses
-            tab1, tab2, tab3, tab4 = st.tabs([
-                t.get("heatmap_tab", "Correlation Matrix"), 
-                t.get("interactive_tab", "Interactive Analysis"),
-                t.get("significant_tab", "Significant Correlations"),
-                t.get("interpretation_tab", "Educational Interpretation")
-            ])
+            # The heatmap is cheap to build, so it is part of the chart bundle whatever the view
+            register_chart("analyse5", "correlation_heatmap", lambda: create_correlation_heatmap(corr_matrix, t))
+            
+            # Only the selected view is computed; tabs would build all four on every rerun
+            views = {
+                "heatmap": t.get("heatmap_tab", "Correlation Matrix"),
+                "interactive": t.get("interactive_tab", "Interactive Analysis"),
+                "significant": t.get("significant_tab", "Significant Correlations"),
+                "interpretation": t.get("interpretation_tab", "Educational Interpretation")
+            }
+            view = st.radio(
+                t.get("correlation_view", "View"),
+                options=list(views),
+                format_func=views.get,
+                horizontal=True,
+                label_visibility="collapsed",
+                key="correlation_view"
+            )
             
-            # Tab 1: Correlation Matrix
-            with tab1:
+            # View 1: Correlation Matrix
+            if view == "heatmap":
                 display_correlation_heatmap(corr_matrix, t)
             
-            # Tab 2: Interactive Correlation Analysis
-            with tab2:
+            # View 2: Interactive Correlation Analysis
+            elif view == "interactive":
                 display_interactive_analysis(df, selected_columns, t)
             
-            # Tab 3: Significant Correlations
-            with tab3:
+            # View 3: Significant Correlations
+            elif view == "significant":
                 display_significant_correlations(df, df_strong, t)
             
-            # Tab 4: Educational Interpretation
-            with tab4:
+            # View 4: Educational Interpretation
+            else:
                 if not df_strong.empty:
                     provide_educational_interpretation(df_strong, t)
                 else:
@@ -159,27 +190,15 @@ def show_correlation(df, language):
            
             # Word Export
             with col2:
-                if st.button(t.get("export_correlation_word", "📄 Export to Word")):
-                    try:
-                        doc = create_correlation_word_report(corr_matrix, df_strong, t, df)
-                        # ========== AJOUTER LES CRÉDITS ==========
-                        if CREDITS_AVAILABLE:
-                            doc = add_credits_to_word_report(doc, language=language)
-            
-            
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                            doc.save(tmp.name)
-                            with open(tmp.name, 'rb') as f:
-                                docx = f.read()
-                            st.download_button(
-                                t.get("download_correlation_word", "📥 Download Word Report"),
-                                docx,
-                                "correlation_analysis.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.error(f"Error creating Word report: {str(e)}")
+                report_export_button(
+                    t.get("export_correlation_word", "📄 Export to Word"),
+                    "correlation_analysis",
+                    build_correlation_report,
+                    "correlation_analysis.docx",
+                    t,
+                    download_label=t.get("download_correlation_word", "📥 Download Word Report"),
+                    args=(corr_matrix, df_strong, t, df, language)
+                )
         
         except Exception as e:
             st.error(f"Error in correlation analysis: {str(e)}")
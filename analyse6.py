@@ -5,9 +5,15 @@ import plotly.express as px
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
+from scipy import stats
 from config import translations, egra_columns, egma_columns
+from figure_export import figure_to_stream
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint
+from irt_calibration import show_irt_calibration
+from chart_bundle import register_chart
+from report_jobs import report_export_button
 # Import du module de crédits
 try:
     from credits import initialize_credits, add_credits_to_word_report
@@ -47,6 +53,280 @@ def cronbach_alpha(data):
     
     return alpha
 
+def grouped_item_covariance(df, items, group_col):
+    """
+    Computes the item covariance matrix of every group in a single sorted pass.
+    
+    Rows with a missing group or item value are dropped (listwise deletion, as in
+    cronbach_alpha). Rows are sorted once by group code and the per-group sums of
+    items and item cross-products are accumulated with np.add.reduceat, so the
+    cost does not depend on the number of groups.
+    
+    Args:
+        df (pandas.DataFrame): Data containing the item columns and the group column
+        items (list): Item/variable column names
+        group_col (str): Column defining the groups (e.g. "school")
+        
+    Returns:
+        tuple: (group labels (numpy.ndarray), counts (numpy.ndarray of shape (G,)),
+               covariance matrices (numpy.ndarray of shape (G, k, k)))
+    """
+    items = list(items)
+    data = df[[group_col] + items].dropna()
+    n_items = len(items)
+    
+    if data.empty:
+        return np.array([]), np.zeros(0, dtype=int), np.zeros((0, n_items, n_items))
+    
+    codes, labels = pd.factorize(data[group_col], sort=True)
+    values = data[items].to_numpy(dtype=float)
+    
+    # Centre on the overall means to limit cancellation in the raw-moment formula
+    values = values - values.mean(axis=0)
+    
+    # Sort once by group so each group is a contiguous block of rows
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    values = values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    
+    # Per-group sums of items and of item cross-products
+    sums = np.add.reduceat(values, starts, axis=0)
+    cross = np.empty((len(starts), n_items, n_items))
+    for i in range(n_items):
+        cross[:, i, :] = np.add.reduceat(values * values[:, [i]], starts, axis=0)
+    
+    # Unbiased covariance (ddof=1); groups with a single row get NaN
+    n = counts[:, None, None].astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (cross - sums[:, :, None] * sums[:, None, :] / n) / (n - 1)
+    
+    return np.asarray(labels)[codes[starts]], counts, cov
+
+def alpha_from_covariance(cov, counts=None):
+    """
+    Calculates Cronbach's Alpha from one or many item covariance matrices.
+    
+    Args:
+        cov (numpy.ndarray): Covariance matrix (k, k) or stack of matrices (G, k, k)
+        counts (numpy.ndarray, optional): Number of respondents per matrix; alphas
+            based on fewer than 3 respondents are returned as NaN
+        
+    Returns:
+        numpy.ndarray or float: Cronbach's Alpha for each matrix (NaN if not computable)
+    """
+    cov = np.asarray(cov, dtype=float)
+    n_items = cov.shape[-1]
+    
+    if n_items < 2:
+        return np.full(cov.shape[:-2], np.nan) if cov.ndim > 2 else np.nan
+    
+    item_variance_sum = np.trace(cov, axis1=-2, axis2=-1)
+    total_variance = cov.sum(axis=(-2, -1))
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = (n_items / (n_items - 1)) * (1 - item_variance_sum / total_variance)
+    alpha = np.where(total_variance > 0, alpha, np.nan)
+    
+    if counts is not None:
+        alpha = np.where(np.asarray(counts) >= 3, alpha, np.nan)
+    
+    return alpha
+
+def grouped_cronbach_alpha(df, items, group_col):
+    """
+    Calculates Cronbach's Alpha for every group of a grouping column at once.
+    
+    Args:
+        df (pandas.DataFrame): Data containing the item columns and the group column
+        items (list): Item/variable column names
+        group_col (str): Column defining the groups (e.g. "school", "stgender")
+        
+    Returns:
+        pandas.DataFrame: One row per group with columns "group", "n_students",
+        "n_items" and "alpha" (NaN where alpha cannot be computed)
+    """
+    labels, counts, cov = grouped_item_covariance(df, items, group_col)
+    
+    return pd.DataFrame({
+        "group": labels,
+        "n_students": counts,
+        "n_items": len(items),
+        "alpha": alpha_from_covariance(cov, counts)
+    })
+
+# Confidence intervals keyed by data fingerprint, group, item set and method
+_ALPHA_CI_CACHE = LRUCache(max_entries=1024)
+
+def feldt_confidence_interval(alpha, n_students, n_items, confidence=0.95):
+    """
+    Calculates the Feldt analytic confidence interval for Cronbach's Alpha.
+    
+    Works element-wise on arrays so a whole table of groups is handled at once.
+    
+    Args:
+        alpha (float or array-like): Cronbach's Alpha value(s)
+        n_students (int or array-like): Number of respondents used for each alpha
+        n_items (int or array-like): Number of items
+        confidence (float): Confidence level (default 0.95)
+        
+    Returns:
+        tuple: (lower bound(s), upper bound(s)); NaN where not computable
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    n_students = np.asarray(n_students, dtype=float)
+    n_items = np.asarray(n_items, dtype=float)
+    
+    df1 = n_students - 1
+    df2 = (n_students - 1) * (n_items - 1)
+    valid = (df1 > 0) & (df2 > 0) & np.isfinite(alpha)
+    df1 = np.where(valid, df1, 1)
+    df2 = np.where(valid, df2, 1)
+    
+    tail = (1 - confidence) / 2
+    lower = 1 - (1 - alpha) * stats.f.ppf(1 - tail, df1, df2)
+    upper = 1 - (1 - alpha) * stats.f.ppf(tail, df1, df2)
+    
+    return np.where(valid, lower, np.nan), np.where(valid, upper, np.nan)
+
+def _bootstrap_alpha_batch(values, n_boot, seed):
+    """
+    Computes bootstrap replicates of Cronbach's Alpha for one batch.
+    
+    Each replicate resamples the respondents with replacement. Instead of copying
+    the data, the resample is expressed as a matrix of row counts W (n_boot x n),
+    so the replicate sums and cross-product sums (and hence the covariance
+    matrices) are obtained with matrix products.
+    
+    Args:
+        values (numpy.ndarray): Centred item scores (n x k) without missing values
+        n_boot (int): Number of replicates in this batch
+        seed: Seed or SeedSequence for the random generator
+        
+    Returns:
+        numpy.ndarray: Alpha for each replicate
+    """
+    rng = np.random.default_rng(seed)
+    n, n_items = values.shape
+    
+    # Row counts of each resample, built with a single bincount
+    draws = rng.integers(0, n, size=(n_boot, n))
+    offsets = (np.arange(n_boot) * n)[:, None]
+    weights = np.bincount((draws + offsets).ravel(), minlength=n_boot * n).reshape(n_boot, n).astype(float)
+    
+    sums = weights @ values
+    cross = np.empty((n_boot, n_items, n_items))
+    for i in range(n_items):
+        cross[:, i, :] = weights @ (values * values[:, [i]])
+    
+    cov = (cross - sums[:, :, None] * sums[:, None, :] / n) / (n - 1)
+    return alpha_from_covariance(cov)
+
+def bootstrap_alpha_ci(data, n_boot=1000, confidence=0.95, seed=0, n_workers=None, batch_size=50):
+    """
+    Calculates a percentile bootstrap confidence interval for Cronbach's Alpha.
+    
+    Replicates are split into batches that run concurrently on a thread pool
+    (the matrix products release the GIL). Seeds are derived from a single
+    SeedSequence so results are reproducible for a given seed.
+    
+    Args:
+        data (pandas.DataFrame): DataFrame with items/variables as columns
+        n_boot (int): Number of bootstrap replicates
+        confidence (float): Confidence level (default 0.95)
+        seed (int): Random seed
+        n_workers (int, optional): Number of worker threads (default: CPU count)
+        batch_size (int): Number of replicates computed per task
+        
+    Returns:
+        tuple: (lower bound, upper bound) or (None, None) if not computable
+    """
+    items = data.dropna(axis=0)
+    
+    if items.shape[1] < 2 or items.shape[0] < 3:
+        return None, None
+    
+    values = items.to_numpy(dtype=float)
+    values = values - values.mean(axis=0)
+    
+    batches = [min(batch_size, n_boot - start) for start in range(0, n_boot, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    
+    with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        replicates = list(executor.map(
+            lambda args: _bootstrap_alpha_batch(values, *args),
+            zip(batches, seeds)
+        ))
+    
+    alphas = np.concatenate(replicates)
+    alphas = alphas[np.isfinite(alphas)]
+    
+    if alphas.size == 0:
+        return None, None
+    
+    tail = (1 - confidence) / 2
+    lower, upper = np.quantile(alphas, [tail, 1 - tail])
+    return float(lower), float(upper)
+
+def alpha_confidence_interval(data, group_label, method="feldt", confidence=0.95, n_boot=1000):
+    """
+    Returns the confidence interval of Cronbach's Alpha for one group, using the cache.
+    
+    Intervals are cached by the content of the group's data, the group label,
+    the item set and the method parameters.
+    
+    Args:
+        data (pandas.DataFrame): The group's data with items/variables as columns
+        group_label (str): Identifier of the group (used in the cache key)
+        method (str): "feldt" (analytic) or "bootstrap"
+        confidence (float): Confidence level
+        n_boot (int): Number of bootstrap replicates (bootstrap method only)
+        
+    Returns:
+        tuple: (lower bound, upper bound), None values if not computable
+    """
+    key = make_cache_key(
+        "alpha_ci", dataframe_fingerprint(data), group_label, list(data.columns),
+        method, confidence, n_boot if method == "bootstrap" else None
+    )
+    
+    def _compute():
+        if method == "bootstrap":
+            return bootstrap_alpha_ci(data, n_boot=n_boot, confidence=confidence)
+        
+        complete = data.dropna(axis=0)
+        alpha_value = cronbach_alpha(data)
+        if alpha_value is None:
+            return None, None
+        lower, upper = feldt_confidence_interval(alpha_value, len(complete), data.shape[1], confidence)
+        return float(lower), float(upper)
+    
+    return _ALPHA_CI_CACHE.get_or_compute(key, _compute)
+
+def interpret_alpha_range(lower, upper, t):
+    """
+    Describes the reliability levels covered by a confidence interval, so that a
+    threshold is not read as a hard cutoff when the interval straddles it.
+    
+    Args:
+        lower (float or None): Lower confidence bound
+        upper (float or None): Upper confidence bound
+        t (dict): Translation dictionary
+        
+    Returns:
+        str: Reliability level, or "lower level – upper level" if they differ
+    """
+    if lower is None or upper is None or pd.isna(lower) or pd.isna(upper):
+        return t.get("not_available", "N/A")
+    
+    low_category, low_description, _ = interpret_alpha(lower)
+    high_category, high_description, _ = interpret_alpha(upper)
+    
+    if low_category == high_category:
+        return t.get(low_category, low_description)
+    return f"{t.get(low_category, low_description)} – {t.get(high_category, high_description)}"
+
 def interpret_alpha(alpha):
     """
     Interprets the value of Cronbach's Alpha coefficient.
@@ -104,6 +384,34 @@ def show_reliability(df, language):
         st.error(t.get("no_assessment_columns", "No EGRA or EGMA assessment columns found in the data."))
         return
     
+    # Confidence interval options
+    col1, col2 = st.columns(2)
+    with col1:
+        use_bootstrap = st.checkbox(
+            t.get("alpha_ci_bootstrap", "Bootstrap confidence intervals (slower, no normality assumption)"),
+            value=False,
+            key="alpha_ci_bootstrap"
+        )
+    with col2:
+        n_boot = st.number_input(
+            t.get("alpha_ci_replicates", "Bootstrap replicates"),
+            min_value=200,
+            max_value=10000,
+            value=1000,
+            step=100,
+            key="alpha_ci_replicates",
+            disabled=not use_bootstrap
+        )
+    ci_method = "bootstrap" if use_bootstrap else "feldt"
+    
+    def _confidence_interval(data, group_label):
+        lower, upper = alpha_confidence_interval(data, group_label, method=ci_method, n_boot=int(n_boot))
+        return {
+            "ci_lower": lower,
+            "ci_upper": upper,
+            "uncertainty": interpret_alpha_range(lower, upper, t)
+        }
+    
     try:
         # Check if language_teaching column exists for separating English and Dutch
         has_language_column = "language_teaching" in df.columns
@@ -111,38 +419,47 @@ def show_reliability(df, language):
         # Calculate Cronbach's Alpha for different assessment groups
         alpha_results = []
         
-        # EGRA by language (if language column exists)
+        # EGRA by language (if language column exists), all languages in one grouped pass
         if has_language_column and available_egra:
-            # Filter by language
-            for language_code, language_name in [("English", t.get("english", "English")), 
-                                                 ("Dutch", t.get("dutch", "Dutch"))]:
-                df_language = df[df["language_teaching"] == language_code]
+            language_alphas = grouped_cronbach_alpha(df, available_egra, "language_teaching")
+            
+            for _, row in language_alphas.iterrows():
+                alpha_value = None if pd.isna(row["alpha"]) else float(row["alpha"])
+                interpretation, description, color = interpret_alpha(alpha_value)
+                language_name = t.get(str(row["group"]).lower(), str(row["group"]))
+                
+                ci = _confidence_interval(
+                    df.loc[df["language_teaching"] == row["group"], available_egra],
+                    f"language_teaching={row['group']}"
+                )
                 
-                if not df_language.empty:
-                    # Calculate alpha for this language group
-                    alpha_value = cronbach_alpha(df_language[available_egra])
-                    interpretation, description, color = interpret_alpha(alpha_value)
-                    
-                    alpha_results.append({
-                        "test_group": f"EGRA ({language_name})",
-                        "n_items": len(available_egra),
-                        "n_students": len(df_language),
-                        "alpha": alpha_value,
-                        "interpretation": t.get(interpretation, description),
-                        "color": color
-                    })
+                alpha_results.append({
+                    "test_group": f"EGRA ({language_name})",
+                    "n_items": len(available_egra),
+                    "n_students": int(row["n_students"]),
+                    "alpha": alpha_value,
+                    "ci_lower": ci["ci_lower"],
+                    "ci_upper": ci["ci_upper"],
+                    "interpretation": t.get(interpretation, description),
+                    "uncertainty": ci["uncertainty"],
+                    "color": color
+                })
         
         # EGRA (all students) if no language column or as additional info
         if available_egra:
             alpha_value = cronbach_alpha(df[available_egra])
             interpretation, description, color = interpret_alpha(alpha_value)
+            ci = _confidence_interval(df[available_egra], "all")
             
             alpha_results.append({
                 "test_group": t.get("egra_all", "EGRA (All Students)"),
                 "n_items": len(available_egra),
-                "n_students": len(df),
+                "n_students": int(df[available_egra].dropna().shape[0]),
                 "alpha": alpha_value,
+                "ci_lower": ci["ci_lower"],
+                "ci_upper": ci["ci_upper"],
                 "interpretation": t.get(interpretation, description),
+                "uncertainty": ci["uncertainty"],
                 "color": color
             })
         
@@ -150,13 +467,17 @@ def show_reliability(df, language):
         if available_egma:
             alpha_value = cronbach_alpha(df[available_egma])
             interpretation, description, color = interpret_alpha(alpha_value)
+            ci = _confidence_interval(df[available_egma], "all")
             
             alpha_results.append({
                 "test_group": t.get("egma_all", "EGMA (All Students)"),
                 "n_items": len(available_egma),
-                "n_students": len(df),
+                "n_students": int(df[available_egma].dropna().shape[0]),
                 "alpha": alpha_value,
+                "ci_lower": ci["ci_lower"],
+                "ci_upper": ci["ci_upper"],
                 "interpretation": t.get(interpretation, description),
+                "uncertainty": ci["uncertainty"],
                 "color": color
             })
         
@@ -171,19 +492,32 @@ def show_reliability(df, language):
         formatted_results.columns = [
             t.get("test_group", "Test Group"),
             t.get("n_items", "Number of Items"),
-            t.get("n_students", "Number of Students"),
+            t.get("n_students_complete", "Students with complete scores"),
             t.get("cronbach_alpha", "Cronbach's Alpha"),
+            t.get("ci_lower", "95% CI Lower"),
+            t.get("ci_upper", "95% CI Upper"),
             t.get("reliability", "Reliability"),
+            t.get("reliability_range", "Reliability Range (95% CI)"),
             "color"  # Hidden column for visualization
         ]
         
-        # Format the Alpha value to 3 decimal places or "N/A"
-        formatted_results[t.get("cronbach_alpha", "Cronbach's Alpha")] = formatted_results[
-            t.get("cronbach_alpha", "Cronbach's Alpha")
-        ].apply(lambda x: f"{x:.3f}" if x is not None else t.get("not_available", "N/A"))
+        # Format the Alpha value and its bounds to 3 decimal places or "N/A"
+        for column in [
+            t.get("cronbach_alpha", "Cronbach's Alpha"),
+            t.get("ci_lower", "95% CI Lower"),
+            t.get("ci_upper", "95% CI Upper")
+        ]:
+            formatted_results[column] = formatted_results[column].apply(
+                lambda x: f"{x:.3f}" if x is not None and not pd.isna(x) else t.get("not_available", "N/A")
+            )
         
         # Display the table without the color column
         st.dataframe(formatted_results.drop(columns=["color"]))
+        st.caption(t.get(
+            "n_students_complete_note",
+            "Alpha is computed on the students with a score for every item of the assessment; "
+            "students with a missing score are left out."
+        ))
         
         # Visualization of results
         st.subheader(t.get("reliability_visualization", "📈 Reliability Visualization"))
@@ -201,11 +535,17 @@ def show_reliability(df, language):
             lambda x: interpret_alpha(x)[0] if x is not None else "insufficient_data"
         )
         
+        # Distances from alpha to the confidence bounds for the error bars
+        chart_data["ci_plus"] = (df_results["ci_upper"].astype(float) - df_results["alpha"].astype(float)).fillna(0)
+        chart_data["ci_minus"] = (df_results["alpha"].astype(float) - df_results["ci_lower"].astype(float)).fillna(0)
+        
         fig = px.bar(
             chart_data,
             x=t.get("test_group", "Test Group"),
             y="alpha_numeric",
             color="reliability_level",
+            error_y="ci_plus",
+            error_y_minus="ci_minus",
             labels={
                 "alpha_numeric": t.get("cronbach_alpha", "Cronbach's Alpha"),
                 "reliability_level": t.get("reliability_level", "Reliability Level")
@@ -237,8 +577,16 @@ def show_reliability(df, language):
             height=500
         )
         
+        register_chart("analyse6", "reliability_comparison", fig)
         st.plotly_chart(fig, use_container_width=True)
         
+        # Reliability for every school, gender or language group
+        show_group_reliability(df, available_egra, available_egma, t)
+        
+        # Item-level calibration when 0/1 item columns are available
+        with st.expander(t.get("irt_expander", "🧮 Item calibration (Rasch / 2PL)")):
+            show_irt_calibration(df, language)
+        
         # Export options
         col1, col2 = st.columns(2)
         
@@ -255,22 +603,15 @@ def show_reliability(df, language):
         
         # Word Export
         with col2:
-            if st.button(t.get("export_cronbach_word", "📄 Export to Word")):
-                try:
-                    doc = create_reliability_word_report(df_results, fig, t)
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                        doc.save(tmp.name)
-                        with open(tmp.name, 'rb') as f:
-                            docx = f.read()
-                        st.download_button(
-                            t.get("download_cronbach_word", "📥 Download Word Report"),
-                            docx,
-                            "reliability_analysis.docx",
-                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        )
-                    os.unlink(tmp.name)
-                except Exception as e:
-                    st.error(f"Error creating Word report: {str(e)}")
+            report_export_button(
+                t.get("export_cronbach_word", "📄 Export to Word"),
+                "reliability_analysis",
+                create_reliability_word_report,
+                "reliability_analysis.docx",
+                t,
+                download_label=t.get("download_cronbach_word", "📥 Download Word Report"),
+                args=(df_results, fig, t)
+            )
         
         # Educational Interpretation Section
         st.subheader(t.get("educational_interpretation", "🔍 Educational Interpretation"))
@@ -379,6 +720,119 @@ def show_reliability(df, language):
     except Exception as e:
         st.error(f"Error calculating reliability: {str(e)}")
 
+def show_group_reliability(df, available_egra, available_egma, t):
+    """
+    Displays Cronbach's Alpha for every group of a selected grouping column
+    (school, gender or language of instruction) with a sortable table and a
+    chart of the alpha distribution across groups.
+    
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        available_egra (list): EGRA columns present in the data
+        available_egma (list): EGMA columns present in the data
+        t (dict): Translation dictionary
+    """
+    group_columns = [col for col in ["school", "stgender", "language_teaching"] if col in df.columns]
+    
+    if not group_columns:
+        return
+    
+    st.subheader(t.get("group_reliability", "🏫 Reliability by Group"))
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        group_col = st.selectbox(
+            t.get("reliability_group_by", "Compute reliability by:"),
+            options=group_columns,
+            format_func=lambda x: t.get("gender", "Gender") if x == "stgender" else t.get(x, x),
+            key="reliability_group_col"
+        )
+    
+    with col2:
+        min_students = st.number_input(
+            t.get("min_students_per_group", "Minimum number of students per group"),
+            min_value=3,
+            value=10,
+            step=1,
+            key="reliability_min_students"
+        )
+    
+    # One grouped pass per assessment
+    group_results = []
+    for assessment, items in [("EGRA", available_egra), ("EGMA", available_egma)]:
+        if len(items) < 2:
+            continue
+        
+        result = grouped_cronbach_alpha(df, items, group_col)
+        result.insert(0, "assessment", assessment)
+        group_results.append(result)
+    
+    if not group_results:
+        st.info(t.get("insufficient_items", "At least two items are needed to calculate reliability."))
+        return
+    
+    df_groups = pd.concat(group_results, ignore_index=True)
+    df_groups = df_groups[df_groups["n_students"] >= min_students]
+    
+    if df_groups.empty:
+        st.info(t.get("no_groups_large_enough", "No group has enough students for a reliability estimate."))
+        return
+    
+    def _interpretation_label(alpha):
+        category, description, _ = interpret_alpha(None if pd.isna(alpha) else alpha)
+        return t.get(category, description)
+    
+    # Analytic (Feldt) intervals for all groups at once
+    ci_lower, ci_upper = feldt_confidence_interval(
+        df_groups["alpha"].to_numpy(), df_groups["n_students"].to_numpy(), df_groups["n_items"].to_numpy()
+    )
+    df_groups["ci_lower"] = ci_lower
+    df_groups["ci_upper"] = ci_upper
+    df_groups["interpretation"] = df_groups["alpha"].apply(_interpretation_label)
+    df_groups["uncertainty"] = [
+        interpret_alpha_range(lower, upper, t) for lower, upper in zip(ci_lower, ci_upper)
+    ]
+    
+    # Sortable table (weakest reliability first)
+    display_groups = df_groups.sort_values("alpha", na_position="first").copy()
+    display_groups[["alpha", "ci_lower", "ci_upper"]] = display_groups[["alpha", "ci_lower", "ci_upper"]].round(3)
+    display_groups.columns = [
+        t.get("assessment", "Assessment"),
+        t.get("group", "Group"),
+        t.get("n_students_complete", "Students with complete scores"),
+        t.get("n_items", "Number of Items"),
+        t.get("cronbach_alpha", "Cronbach's Alpha"),
+        t.get("ci_lower", "95% CI Lower"),
+        t.get("ci_upper", "95% CI Upper"),
+        t.get("reliability", "Reliability"),
+        t.get("reliability_range", "Reliability Range (95% CI)")
+    ]
+    st.dataframe(display_groups, use_container_width=True, hide_index=True)
+    
+    # Distribution of alpha across groups
+    fig = px.histogram(
+        df_groups.dropna(subset=["alpha"]),
+        x="alpha",
+        color="assessment",
+        nbins=30,
+        barmode="overlay",
+        opacity=0.7,
+        labels={
+            "alpha": t.get("cronbach_alpha", "Cronbach's Alpha"),
+            "assessment": t.get("assessment", "Assessment")
+        },
+        title=t.get("alpha_distribution_title", "Distribution of Cronbach's Alpha across groups")
+    )
+    fig.add_vline(x=0.7, line_dash="dash", line_color="#F4D03F",
+                  annotation_text=t.get("acceptable_threshold", "Acceptable (0.7)"))
+    fig.update_layout(
+        yaxis_title=t.get("number_of_groups", "Number of groups"),
+        height=400
+    )
+    register_chart("analyse6", "group_alpha_distribution", fig)
+    st.plotly_chart(fig, use_container_width=True)
+
 def create_reliability_word_report(df_results, fig, t):
     """
     Creates a Word report with reliability analysis results.
@@ -411,16 +865,17 @@ def create_reliability_word_report(df_results, fig, t):
     doc.add_heading(t.get("cronbach_results", "Cronbach's Alpha Results"), level=2)
     
     # Create table
-    table = doc.add_table(rows=1, cols=5)
+    table = doc.add_table(rows=1, cols=6)
     table.style = 'Table Grid'
     
     # Add headers
     header_cells = table.rows[0].cells
     header_cells[0].text = t.get("test_group", "Test Group")
     header_cells[1].text = t.get("n_items", "Number of Items")
-    header_cells[2].text = t.get("n_students", "Number of Students")
+    header_cells[2].text = t.get("n_students_complete", "Students with complete scores")
     header_cells[3].text = t.get("cronbach_alpha", "Cronbach's Alpha")
-    header_cells[4].text = t.get("reliability", "Reliability")
+    header_cells[4].text = t.get("confidence_interval", "95% CI")
+    header_cells[5].text = t.get("reliability", "Reliability")
     
     # Apply header formatting
     for cell in header_cells:
@@ -442,16 +897,20 @@ def create_reliability_word_report(df_results, fig, t):
         else:
             row_cells[3].text = t.get("not_available", "N/A")
         
-        row_cells[4].text = row["interpretation"]
+        # Format confidence interval
+        ci_lower, ci_upper = row.get("ci_lower"), row.get("ci_upper")
+        if ci_lower is not None and ci_upper is not None and not pd.isna(ci_lower) and not pd.isna(ci_upper):
+            row_cells[4].text = f"[{ci_lower:.3f}, {ci_upper:.3f}]"
+        else:
+            row_cells[4].text = t.get("not_available", "N/A")
+        
+        row_cells[5].text = row["interpretation"]
     
     # Add visualization
     doc.add_heading(t.get("reliability_visualization", "Reliability Visualization"), level=2)
     
     # Save and add chart
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        img_path = os.path.join(tmp_dir, "reliability_chart.png")
-        fig.write_image(img_path, width=800, height=500, format='png', engine='kaleido')
-        doc.add_picture(img_path, width=Inches(6))
+    doc.add_picture(figure_to_stream(fig, width=800, height=500, format='png'), width=Inches(6))
     
     # Educational interpretation
     doc.add_heading(t.get("educational_interpretation", "Educational Interpretation"), level=2)
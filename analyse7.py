@@ -6,9 +6,17 @@ import scipy.stats as stats
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import tempfile
 import os
-from config import translations, egra_columns, egma_columns
+from config import translations, egra_columns, egma_columns, SCHOOL_RANKING_THRESHOLD
+from figure_export import figure_to_stream
+from school_ranking import (
+    school_aggregates, select_schools, create_caterpillar_plot,
+    create_school_means_histogram, create_ranked_box_plot
+)
+from chart_bundle import register_chart
+from report_jobs import report_export_button, report_progress
+from report.report_burst import burst_reports_zip
+from docx_tables import add_bulk_table
 # Import du module de crédits
 try:
     from credits import add_credits_to_word_report
@@ -145,9 +153,8 @@ def show_performance_school(df, language):
             for col in selected_columns:
                 col_name = t["columns_of_interest"].get(col, col)
                 
-                # Group data by school for this variable
-                groups = [df[df["school"] == school][col].dropna() for school in schools]
-                groups = [g for g in groups if len(g) > 0]  # Remove empty groups
+                # Group data by school for this variable (one pass instead of one mask per school)
+                groups = [g.to_numpy() for _, g in df[["school", col]].dropna().groupby("school")[col]]
                 
                 # Perform Kruskal-Wallis test if we have at least two groups with data
                 if len(groups) >= 2:
@@ -200,46 +207,51 @@ def show_performance_school(df, language):
             # Visualization of distributions by school
             st.subheader(t.get("distribution_title", "📈 Score Distributions by School"))
             
-            # Allow selection of distribution plot type
-            plot_type = st.radio(
-                t.get("plot_type", "Select plot type:"),
-                [t.get("boxplot", "Box Plots"), t.get("violinplot", "Violin Plots")],
-                horizontal=True
-            )
-            
-            # Create distribution plots for each selected variable
-            for column in selected_columns:
-                col_name = t["columns_of_interest"].get(column, column)
+            if len(schools) > SCHOOL_RANKING_THRESHOLD:
+                # Too many schools for one box each: rank them from per-school aggregates
+                show_school_ranking(df, selected_columns, t)
+            else:
+                # Allow selection of distribution plot type
+                plot_type = st.radio(
+                    t.get("plot_type", "Select plot type:"),
+                    [t.get("boxplot", "Box Plots"), t.get("violinplot", "Violin Plots")],
+                    horizontal=True
+                )
                 
-                if plot_type == t.get("boxplot", "Box Plots"):
-                    fig = px.box(
-                        df,
-                        x="school",
-                        y=column,
-                        color="school",
-                        title=f"{col_name} - {t.get('by_school', 'by School')}",
-                        labels={"school": t.get("school", "School"), column: col_name}
-                    )
-                else:  # Violin plots
-                    fig = px.violin(
-                        df,
-                        x="school",
-                        y=column,
-                        color="school",
-                        box=True,  # Include box plot inside violin
-                        title=f"{col_name} - {t.get('by_school', 'by School')}",
-                        labels={"school": t.get("school", "School"), column: col_name}
-                    )
+                # Create distribution plots for each selected variable
+                for column in selected_columns:
+                    col_name = t["columns_of_interest"].get(column, column)
                 
-                # Update layout
-                fig.update_layout(
-                    xaxis_title=t.get("school", "School"),
-                    yaxis_title=col_name,
-                    legend_title=t.get("school", "School"),
-                    height=500
-                )
+                    if plot_type == t.get("boxplot", "Box Plots"):
+                        fig = px.box(
+                            df,
+                            x="school",
+                            y=column,
+                            color="school",
+                            title=f"{col_name} - {t.get('by_school', 'by School')}",
+                            labels={"school": t.get("school", "School"), column: col_name}
+                        )
+                    else:  # Violin plots
+                        fig = px.violin(
+                            df,
+                            x="school",
+                            y=column,
+                            color="school",
+                            box=True,  # Include box plot inside violin
+                            title=f"{col_name} - {t.get('by_school', 'by School')}",
+                            labels={"school": t.get("school", "School"), column: col_name}
+                        )
+                
+                    # Update layout
+                    fig.update_layout(
+                        xaxis_title=t.get("school", "School"),
+                        yaxis_title=col_name,
+                        legend_title=t.get("school", "School"),
+                        height=500
+                    )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                    register_chart("analyse7", f"distribution_{column}", fig)
+                    st.plotly_chart(fig, use_container_width=True)
             
             # Export options
             col1, col2 = st.columns(2)
@@ -280,26 +292,27 @@ def show_performance_school(df, language):
             
             # Word Export
             with col2:
-                if st.button(t.get("export_performance_word", "📄 Export to Word")):
-                    try:
-                        doc = create_performance_word_report(
-                            df, mean_scores_by_school, highlight_df, 
-                            test_results, selected_columns, t, language
-                        )
-                        
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                            doc.save(tmp.name)
-                            with open(tmp.name, 'rb') as f:
-                                docx = f.read()
-                            st.download_button(
-                                t.get("download_performance_word", "📥 Download Word Report"),
-                                docx,
-                                "school_performance_analysis.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            )
-                        os.unlink(tmp.name)
-                    except Exception as e:
-                        st.error(f"Error creating Word report: {str(e)}")
+                report_export_button(
+                    t.get("export_performance_word", "📄 Export to Word"),
+                    "school_performance_analysis",
+                    create_performance_word_report,
+                    "school_performance_analysis.docx",
+                    t,
+                    download_label=t.get("download_performance_word", "📥 Download Word Report"),
+                    args=(df, mean_scores_by_school, highlight_df, test_results, selected_columns, t, language)
+                )
+
+            # One report per school, built in parallel and bundled in a ZIP
+            report_export_button(
+                t.get("export_school_reports", "🗂️ Export one report per school (ZIP)"),
+                "school_reports_burst",
+                burst_reports_zip,
+                "school_reports.zip",
+                t,
+                download_label=t.get("download_school_reports", "📥 Download school reports"),
+                args=(df, selected_columns, t, language),
+                mime="application/zip"
+            )
         
         except Exception as e:
             st.error(f"Error in school performance analysis: {str(e)}")
@@ -307,6 +320,73 @@ def show_performance_school(df, language):
     else:
         st.warning(t.get("warning_select_variable", "Please select at least one variable to analyze."))
 
+def show_school_ranking(df, selected_columns, t):
+    """
+    Displays school rankings built from per-school aggregates: a caterpillar plot
+    of school means with confidence intervals, the distribution of school means
+    and the boxes of the highest and/or lowest ranked schools.
+    
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        selected_columns (list): Selected columns for analysis
+        t (dict): Translation dictionary
+    """
+    st.info(t.get("school_ranking_info", "There are too many schools to draw one box per school; schools are ranked by their mean score instead."))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        n_schools = st.number_input(
+            t.get("ranking_n_schools", "Number of schools to show"),
+            min_value=1,
+            max_value=50,
+            value=10
+        )
+    with col2:
+        modes = {
+            "both": t.get("ranking_top_bottom", "Top and bottom"),
+            "top": t.get("ranking_top", "Top"),
+            "bottom": t.get("ranking_bottom", "Bottom")
+        }
+        mode = st.radio(
+            t.get("ranking_selection", "Schools shown:"),
+            options=list(modes),
+            format_func=modes.get,
+            horizontal=True
+        )
+    
+    for column in selected_columns:
+        col_name = t["columns_of_interest"].get(column, column)
+        aggregates = school_aggregates(df, column)
+        if aggregates.empty:
+            continue
+        
+        st.markdown(f"#### {col_name}")
+        fig = create_caterpillar_plot(
+            aggregates, t,
+            title=f"{col_name} - {t.get('school_means_ci', 'School means with 95% confidence intervals')}",
+            yaxis_title=col_name
+        )
+        register_chart("analyse7", f"ranking_{column}", fig)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = create_school_means_histogram(
+                aggregates, t,
+                title=t.get("school_means_distribution", "Distribution of school means"),
+                xaxis_title=col_name
+            )
+            register_chart("analyse7", f"school_means_{column}", fig)
+            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            fig = create_ranked_box_plot(
+                select_schools(aggregates, n_schools, mode), t,
+                title=f"{col_name} - {modes[mode]} {n_schools}",
+                yaxis_title=col_name
+            )
+            register_chart("analyse7", f"top_bottom_{column}", fig)
+            st.plotly_chart(fig, use_container_width=True)
+
 def create_performance_word_report(df, mean_scores, highlight_df, test_results, selected_columns, t,language):
     """
     Creates a Word report with school performance analysis.
@@ -337,46 +417,19 @@ def create_performance_word_report(df, mean_scores, highlight_df, test_results,
     mean_scores_table = mean_scores.reset_index()
     
     # Create table
-    table = doc.add_table(rows=len(mean_scores_table) + 1, cols=len(mean_scores_table.columns))
-    table.style = 'Table Grid'
-    
-    # Add headers
-    header_cells = table.rows[0].cells
-    header_cells[0].text = t.get("school", "School")
-    
-    for i, col in enumerate(mean_scores_table.columns[1:], 1):
-        header_cells[i].text = t["columns_of_interest"].get(col, col)
-    
-    # Apply header formatting
-    for cell in header_cells:
-        cell.paragraphs[0].runs[0].bold = True
-    
-    # Add data rows
-    for i, (_, row) in enumerate(mean_scores_table.iterrows(), 1):
-        row_cells = table.rows[i].cells
-        
-        for j, value in enumerate(row):
-            row_cells[j].text = str(value)
+    add_bulk_table(
+        doc,
+        mean_scores_table,
+        headers=[t.get("school", "School")] + [
+            t["columns_of_interest"].get(col, col) for col in mean_scores_table.columns[1:]
+        ]
+    )
     
     # Performance highlights
     doc.add_heading(t.get("performance_highlights", "Performance Highlights"), level=2)
     
     # Create highlights table
-    highlight_table = doc.add_table(rows=len(highlight_df) + 1, cols=len(highlight_df.columns))
-    highlight_table.style = 'Table Grid'
-    
-    # Add headers
-    header_cells = highlight_table.rows[0].cells
-    for i, col in enumerate(highlight_df.columns):
-        header_cells[i].text = col
-        header_cells[i].paragraphs[0].runs[0].bold = True
-    
-    # Add data rows
-    for i, (_, row) in enumerate(highlight_df.iterrows(), 1):
-        row_cells = highlight_table.rows[i].cells
-        
-        for j, value in enumerate(row):
-            row_cells[j].text = str(value)
+    add_bulk_table(doc, highlight_df, headers=list(highlight_df.columns))
     
     # Statistical significance testing
     doc.add_heading(t.get("statistical_testing", "Statistical Significance Testing"), level=2)
@@ -392,42 +445,42 @@ def create_performance_word_report(df, mean_scores, highlight_df, test_results,
         test_df = pd.DataFrame(test_results)
         
         # Create table
-        test_table = doc.add_table(rows=len(test_df) + 1, cols=4)  # Assuming 4 columns: variable, h_stat, p_value, significant
-        test_table.style = 'Table Grid'
-        
-        # Add headers
-        header_cells = test_table.rows[0].cells
-        header_cells[0].text = t.get("variable", "Variable")
-        header_cells[1].text = t.get("h_statistic", "H Statistic")
-        header_cells[2].text = t.get("p_value", "p-value")
-        header_cells[3].text = t.get("significant", "Significant Difference")
+        def _statistic(value):
+            return f"{value:.4f}" if value is not None else "N/A"
         
-        # Apply header formatting
-        for cell in header_cells:
-            cell.paragraphs[0].runs[0].bold = True
+        def _significance(value):
+            if value is None:
+                return "N/A"
+            return t.get("significant_yes", "Yes") if value else t.get("significant_no", "No")
         
-        # Add data rows
-        for i, row in enumerate(test_results, 1):
-            row_cells = test_table.rows[i].cells
-            
-            row_cells[0].text = row["variable"]
-            row_cells[1].text = f"{row['h_statistic']:.4f}" if row['h_statistic'] is not None else "N/A"
-            row_cells[2].text = f"{row['p_value']:.4f}" if row['p_value'] is not None else "N/A"
-            
-            if row['significant'] is not None:
-                row_cells[3].text = t.get("significant_yes", "Yes") if row['significant'] else t.get("significant_no", "No")
-            else:
-                row_cells[3].text = "N/A"
+        add_bulk_table(
+            doc,
+            [(row["variable"], row["h_statistic"], row["p_value"], row["significant"]) for row in test_results],
+            headers=[
+                t.get("variable", "Variable"),
+                t.get("h_statistic", "H Statistic"),
+                t.get("p_value", "p-value"),
+                t.get("significant", "Significant Difference")
+            ],
+            formatters={1: _statistic, 2: _statistic, 3: _significance}
+        )
     
     # Distribution plots for each variable
     doc.add_heading(t.get("distribution_title", "Score Distributions by School"), level=2)
     
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        for column in selected_columns:
-            col_name = t["columns_of_interest"].get(column, column)
-            doc.add_heading(col_name, level=3)
+    for index, column in enumerate(selected_columns):
+        col_name = t["columns_of_interest"].get(column, column)
+        report_progress(index / len(selected_columns), col_name)
+        doc.add_heading(col_name, level=3)
             
-            # Create box plot
+        # Create box plot (caterpillar plot of school means when there are many schools)
+        if df["school"].nunique() > SCHOOL_RANKING_THRESHOLD:
+            fig = create_caterpillar_plot(
+                school_aggregates(df, column), t,
+                title=f"{col_name} - {t.get('school_means_ci', 'School means with 95% confidence intervals')}",
+                yaxis_title=col_name
+            )
+        else:
             fig = px.box(
                 df,
                 x="school",
@@ -439,12 +492,9 @@ def create_performance_word_report(df, mean_scores, highlight_df, test_results,
 
             )
             
-            # Save plot
-            img_path = os.path.join(tmp_dir, f"{column}_boxplot.png")
-            fig.write_image(img_path, width=800, height=500, format='png', engine='kaleido')            
-            # Add plot to document
-            doc.add_picture(img_path, width=Inches(6))
-            doc.add_paragraph()
+        # Add plot to document
+        doc.add_picture(figure_to_stream(fig, width=800, height=500, format='png'), width=Inches(6))
+        doc.add_paragraph()
     
     # Summary and recommendations
     doc.add_heading(t.get("summary_recommendations", "Summary and Recommendations"), level=2)
@@ -0,0 +1,378 @@
+# cache_utils.py
+# Shared in-process caches for analysis results, keyed by content fingerprints
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def make_cache_key(*parts):
+    """
+    Build a stable cache key from arbitrary parts.
+
+    Args:
+        *parts: Values identifying the cached item (strings, numbers, tuples,
+            lists, dicts); non-JSON values are converted with str()
+
+    Returns:
+        str: Hex digest identifying the combination of parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def dataframe_fingerprint(df, columns=None):
+    """
+    Compute a content fingerprint of a DataFrame (values, index and column names).
+
+    Args:
+        df (pd.DataFrame): DataFrame to fingerprint
+        columns (list, optional): Restrict the fingerprint to these columns
+
+    Returns:
+        str: Hex digest that changes whenever the selected data changes
+    """
+    if columns is not None:
+        df = df[list(columns)]
+
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([str(col) for col in df.columns]).encode("utf-8"))
+    hasher.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def get_or_build_figure(cache, key, build):
+    """
+    Return a Plotly figure from a shared cache, building it on a miss.
+
+    The cache holds the figure as a dict and every call returns a new figure,
+    so changes made to it (layout updates, chart registration) stay with the
+    caller instead of leaking into other sessions and threads.
+
+    Args:
+        cache (LRUCache): Cache of figure dicts
+        key: Cache key
+        build (callable): Function without arguments creating the figure
+
+    Returns:
+        plotly.graph_objects.Figure: A figure of its own
+    """
+    import plotly.graph_objects as go
+
+    return go.Figure(cache.get_or_compute(key, lambda: build().to_dict()))
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with hit/miss statistics.
+
+    Entries are evicted least-recently-used first once either the number of
+    entries or, when a size function is given, the total size exceeds its bound.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, size_of=None, on_evict=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept
+            max_bytes (int, optional): Maximum total size of the entries
+            size_of (callable, optional): Function returning the size of a value
+                (required for max_bytes to take effect)
+            on_evict (callable, optional): Called with (key, value) for every
+                entry evicted to respect the bounds
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is not cached
+
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        size = self.size_of(value) if self.size_of is not None else 0
+
+        with self._lock:
+            if key in self._data:
+                self._total_bytes -= self._sizes.pop(key, 0)
+                del self._data[key]
+
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            evicted = self._evict()
+
+        if self.on_evict is not None:
+            for evicted_key, evicted_value in evicted:
+                self.on_evict(evicted_key, evicted_value)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute (callable): Function without arguments producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        """Remove an entry and return its value."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._total_bytes -= self._sizes.pop(key, 0)
+            return self._data.pop(key)
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries and total size in bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._data),
+                "bytes": self._total_bytes
+            }
+
+    def _evict(self):
+        """
+        Evict least recently used entries until the bounds are respected.
+
+        Returns:
+            list: Evicted (key, value) pairs
+        """
+        evicted = []
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._total_bytes > self.max_bytes and len(self._data) > 1
+        ):
+            key, value = self._data.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key, 0)
+            evicted.append((key, value))
+        return evicted
+
+
+class DiskLRUCache:
+    """
+    Size-bounded cache of bytes values stored as files in a directory.
+
+    Files are named after their key; the least recently used files are deleted
+    once the total size exceeds the bound. Entries left by earlier runs are
+    picked up in order of their modification time.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, suffix=".bin"):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): Directory holding the cached files
+            max_bytes (int): Maximum total size of the files
+            suffix (str): File name suffix
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._index = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+        # Owner-only when created here: cached files may hold student data
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(suffix):
+                path = os.path.join(directory, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((info.st_mtime, name[:-len(suffix)], info.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._index
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
+
+    def get(self, key, default=None):
+        """
+        Read a cached value and mark it as recently used.
+
+        Args:
+            key (str): Cache key (used as file name)
+            default: Value returned when the key is not cached
+
+        Returns:
+            bytes: The cached value or default
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return default
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = f.read()
+                os.utime(self._path(key))
+            except OSError:
+                self._total_bytes -= self._index.pop(key)
+                self.misses += 1
+                return default
+            self._index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Store a value, deleting the least recently used files if needed.
+
+        Args:
+            key (str): Cache key (used as file name)
+            value (bytes): Value to store
+        """
+        self._store(key, lambda f: f.write(value))
+
+    def set_file(self, key, fileobj):
+        """
+        Store the content of a file without reading it all into memory.
+
+        Args:
+            key (str): Cache key (used as file name)
+            fileobj (file-like): Binary file to copy from its start
+        """
+        def write(f):
+            fileobj.seek(0)
+            shutil.copyfileobj(fileobj, f, 1024 * 1024)
+        self._store(key, write)
+
+    def _store(self, key, write):
+        """Write a cached file with write(f) and account for its size."""
+        with self._lock:
+            # Write to a temporary name first so readers never see partial files
+            tmp_path = self._path(key) + ".tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    write(f)
+                    size = f.tell()
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                return
+
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict()
+
+    def clear(self):
+        """Delete all cached files and reset statistics."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries and total size in bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "bytes": self._total_bytes
+            }
+
+    def _remove(self, key):
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Delete least recently used files until the size bound is respected."""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            self._remove(next(iter(self._index)))
@@ -0,0 +1,188 @@
+# chart_bundle.py
+# "Download all charts": figures registered by the analysis pages are rendered
+# on the figure rendering pool and streamed into a ZIP archive
+
+import re
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import streamlit as st
+
+from figure_export import get_render_service, RENDER_WORKERS
+
+# Images rendered but not yet written to the archive (bounds memory use)
+BUNDLE_MAX_PENDING = 2 * RENDER_WORKERS
+# Archives larger than this are spooled to a temporary file on disk
+BUNDLE_SPOOL_BYTES = 32 * 1024 * 1024
+BUNDLE_FORMATS = ("png", "svg")
+
+_STATE_KEY = "chart_bundle"
+
+
+def _registry():
+    """Get the charts registered in this session, per analysis module."""
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {}
+    return st.session_state[_STATE_KEY]
+
+
+def track_dataset(fingerprint):
+    """
+    Forget all registered charts when the dataset changes.
+
+    Called before the analysis page runs, so the charts it registers are kept.
+
+    Args:
+        fingerprint (str): Content fingerprint of the current dataset
+    """
+    if st.session_state.get(f"{_STATE_KEY}_dataset") != fingerprint:
+        st.session_state[f"{_STATE_KEY}_dataset"] = fingerprint
+        st.session_state[_STATE_KEY] = {}
+
+
+def reset_charts(analysis):
+    """
+    Forget the charts registered by an analysis before it runs again, so the
+    bundle follows its current selections.
+
+    Args:
+        analysis (str): Analysis module name (e.g. "analyse1")
+    """
+    _registry().pop(analysis, None)
+
+
+def register_chart(analysis, name, figure):
+    """
+    Register a chart of the current selections for the chart bundle.
+
+    Args:
+        analysis (str): Analysis module name (e.g. "analyse1")
+        name (str): Chart name, used as file name in the archive
+        figure: Plotly figure, or a function without arguments building it
+            (for charts that are not displayed until opened)
+    """
+    _registry().setdefault(analysis, {})[name] = figure
+
+
+def registered_charts():
+    """
+    List the registered charts.
+
+    Returns:
+        list: (archive path without extension, figure or builder) tuples
+    """
+    charts = []
+    for analysis, figures in sorted(_registry().items()):
+        for name, figure in figures.items():
+            safe_name = re.sub(r"[^\w\-]+", "_", str(name)).strip("_") or "chart"
+            charts.append((f"{analysis}/{safe_name}", figure))
+    return charts
+
+
+def write_chart_bundle(charts, fileobj, format="png", width=1000, height=600,
+                       max_pending=BUNDLE_MAX_PENDING, progress=None):
+    """
+    Render charts concurrently and write each image to a ZIP archive as soon as
+    it is ready.
+
+    At most max_pending renders are outstanding at any time, so only a few
+    images are held in memory whatever the number of charts.
+
+    Args:
+        charts (list): (archive path without extension, figure or builder) tuples
+        fileobj: Writable binary file receiving the archive
+        format (str): Image format ('png' or 'svg')
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        max_pending (int): Maximum number of renders in flight
+        progress (callable, optional): Called with (done, total) after each chart
+
+    Returns:
+        dict: written (number of images) and failed (list of (path, error))
+    """
+    service = get_render_service()
+    # PNG data is already compressed
+    compression = zipfile.ZIP_STORED if format == "png" else zipfile.ZIP_DEFLATED
+    pending = {}
+    written = 0
+    failed = []
+    total = len(charts)
+
+    with zipfile.ZipFile(fileobj, "w", compression=compression) as archive:
+        def _collect(done_futures):
+            nonlocal written
+            for future in done_futures:
+                path = pending.pop(future)
+                try:
+                    archive.writestr(f"{path}.{format}", future.result())
+                    written += 1
+                except Exception as e:
+                    failed.append((path, str(e)))
+                if progress is not None:
+                    progress(written + len(failed), total)
+
+        for path, figure in charts:
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+            try:
+                fig = figure() if callable(figure) else figure
+                future = service.submit(fig, format=format, width=width, height=height)
+            except Exception as e:
+                failed.append((path, str(e)))
+                if progress is not None:
+                    progress(written + len(failed), total)
+                continue
+            pending[future] = path
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done)
+
+    return {"written": written, "failed": failed}
+
+
+def show_chart_bundle_export(t):
+    """
+    Display the "download all charts" section in the sidebar.
+
+    Args:
+        t (dict): Translation dictionary
+    """
+    charts = registered_charts()
+    if not charts:
+        return
+
+    with st.sidebar.expander(t.get("chart_bundle_title", "🗂️ Download all charts")):
+        analyses = len({path.split("/")[0] for path, _ in charts})
+        st.write(t.get("chart_bundle_count", "{n} charts from {m} analyses").format(n=len(charts), m=analyses))
+        format = st.selectbox(
+            t.get("chart_bundle_format", "Format"),
+            BUNDLE_FORMATS,
+            key="chart_bundle_format"
+        )
+
+        if st.button(t.get("chart_bundle_prepare", "Prepare ZIP"), key="chart_bundle_prepare"):
+            progress_bar = st.progress(0.0)
+            spool = tempfile.SpooledTemporaryFile(max_size=BUNDLE_SPOOL_BYTES)
+            result = write_chart_bundle(
+                charts, spool, format=format,
+                progress=lambda done, total: progress_bar.progress(done / total)
+            )
+            # Streamlit serves downloads from its in-memory media store, so the
+            # finished archive is held in memory once; while it is written, only
+            # a few rendered images are
+            spool.seek(0)
+            data = spool.read()
+            spool.close()
+
+            for path, error in result["failed"]:
+                st.warning(f"{path}: {error}")
+            st.download_button(
+                t.get("chart_bundle_download", "📥 Download ZIP"),
+                data,
+                f"charts_{format}.zip",
+                "application/zip",
+                key="chart_bundle_download"
+            )
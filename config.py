@@ -13,6 +13,22 @@ AVAILABLE_LANGUAGES = {
 # Default language
 DEFAULT_LANGUAGE = "en"
 
+# Scatter plots: above this number of points WebGL traces are used
+SCATTER_WEBGL_THRESHOLD = 10000
+# Above this number of points a server-side density grid is drawn instead of points
+SCATTER_DENSITY_THRESHOLD = 100000
+# Number of bins per axis of the density grid
+SCATTER_DENSITY_BINS = 120
+# Number of indicator charts drawn without being opened on the statistical overview
+LAZY_CHARTS_PRELOAD = 3
+# Above this number of schools, ranking charts replace one box per school
+SCHOOL_RANKING_THRESHOLD = 30
+# Correlation heatmaps: up to this many cells every value is written in its cell
+HEATMAP_FULL_TEXT_CELLS = 400
+# Up to this many cells only values with |r| >= HEATMAP_TEXT_THRESHOLD are written; above, none
+HEATMAP_MAX_TEXT_CELLS = 2500
+HEATMAP_TEXT_THRESHOLD = 0.5
+
 # Translation dictionary
 translations = {
     "en": {
@@ -2,9 +2,9 @@
 Module for interactive correlation analysis with scatter plots and statistics.
 """
 import streamlit as st
-import plotly.express as px
-import numpy as np
 from scipy import stats
+from correlation_modules.regression import create_large_scatter, grouped_regression, add_regression_line
+from chart_bundle import register_chart
 
 def display_interactive_analysis(df, selected_columns, t):
     """
@@ -60,49 +60,38 @@ def create_scatter_plot(df, x_var, y_var, color_var, t):
         color_var (str or None): Variable for color grouping
         t (dict): Translation dictionary for UI elements
     """
-    # Create the scatter plot with regression line
-    scatter_fig = px.scatter(
+    # Create the scatter plot with regression line (WebGL or density grid for large samples)
+    scatter_fig, render_mode = create_large_scatter(
         df,
-        x=x_var,
-        y=y_var,
-        color=color_var,
-        trendline="ols" if color_var is None else None,
+        x_var,
+        y_var,
+        color_var=color_var,
         labels={
             x_var: t["columns_of_interest"].get(x_var, x_var),
             y_var: t["columns_of_interest"].get(y_var, y_var),
             color_var: color_var if color_var else ""
         },
-        title=f"{t['columns_of_interest'].get(y_var, y_var)} vs {t['columns_of_interest'].get(x_var, x_var)}"
+        title=f"{t['columns_of_interest'].get(y_var, y_var)} vs {t['columns_of_interest'].get(x_var, x_var)}",
+        trendline=color_var is None
     )
     
-    # If color variable is selected, add trendline for each category
+    # If color variable is selected, add trendline for each category (one grouped pass)
     if color_var is not None:
-        for i, group in enumerate(df[color_var].unique()):
-            group_df = df[df[color_var] == group]
-            if len(group_df) > 2:  # Need at least 3 points for regression
-                try:
-                    # Calculate trendline
-                    slope, intercept, r_value, p_value, std_err = stats.linregress(
-                        group_df[x_var].dropna(), 
-                        group_df[y_var].dropna()
-                    )
-                    # Create range of x values
-                    x_range = np.linspace(df[x_var].min(), df[x_var].max(), 100)
-                    y_range = intercept + slope * x_range
-                    
-                    # Add trendline as a scatter plot with line
-                    scatter_fig.add_scatter(
-                        x=x_range, 
-                        y=y_range, 
-                        mode='lines', 
-                        name=f"{group} trendline",
-                        line=dict(dash='dash')
-                    )
-                except:
-                    # Skip if regression fails
-                    pass
-    
+        group_lines = grouped_regression(df, x_var, y_var, color_var)
+        
+        for group, line in group_lines.iterrows():
+            add_regression_line(
+                scatter_fig,
+                line,
+                f"{group} trendline",
+                dash='dash'
+            )
+    
+    register_chart("analyse5", f"scatter_{y_var}_vs_{x_var}", scatter_fig)
     st.plotly_chart(scatter_fig, use_container_width=True)
+    
+    if render_mode == "density":
+        st.caption(t.get("density_mode_note", "Large sample: point density is shown instead of individual students."))
 
 def display_correlation_statistics(df, x_var, y_var, t):
     """
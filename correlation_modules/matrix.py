@@ -2,7 +2,11 @@
 Module for generating and displaying correlation matrix visualizations.
 """
 import streamlit as st
-import plotly.figure_factory as ff
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint, get_or_build_figure
+from viz_utils import correlation_heatmap
+
+# Heatmap figures (as dicts) keyed by matrix content, labels and ordering
+_HEATMAP_CACHE = LRUCache(max_entries=32)
 
 def display_correlation_heatmap(corr_matrix, t):
     """
@@ -12,25 +16,44 @@ def display_correlation_heatmap(corr_matrix, t):
         corr_matrix (pandas.DataFrame): Correlation matrix to visualize
         t (dict): Translation dictionary for UI elements
     """
-    # Create correlation heatmap
+    cluster = False
+    if len(corr_matrix) > 2:
+        cluster = st.checkbox(
+            t.get("cluster_variables", "Group related variables (hierarchical clustering)"),
+            value=len(corr_matrix) > 10,
+            key="correlation_heatmap_cluster"
+        )
+    
     translated_labels = [t["columns_of_interest"].get(col, col) for col in corr_matrix.columns]
+    key = make_cache_key(
+        "heatmap", dataframe_fingerprint(corr_matrix), translated_labels, cluster,
+        t.get("correlation_heatmap_title", "Correlation Heatmap")
+    )
+    fig = get_or_build_figure(_HEATMAP_CACHE, key, lambda: create_correlation_heatmap(corr_matrix, t, cluster))
+    st.plotly_chart(fig, use_container_width=True)
+
+def create_correlation_heatmap(corr_matrix, t, cluster=False):
+    """
+    Create the correlation matrix heatmap figure.
     
-    # Use Plotly's figure factory for annotated heatmap
-    fig = ff.create_annotated_heatmap(
-        z=corr_matrix.values,
-        x=translated_labels,
-        y=translated_labels,
-        annotation_text=corr_matrix.values.round(2),
+    Args:
+        corr_matrix (pandas.DataFrame): Correlation matrix to visualize
+        t (dict): Translation dictionary for UI elements
+        cluster (bool): Reorder variables by hierarchical clustering
+        
+    Returns:
+        plotly.graph_objects.Figure: Heatmap (values written only where readable)
+    """
+    fig = correlation_heatmap(
+        corr_matrix,
+        labels=t["columns_of_interest"],
+        title=t.get("correlation_heatmap_title", "Correlation Heatmap"),
         colorscale='Viridis',
-        showscale=True,
-        zmin=-1, zmax=1
+        cluster=cluster
     )
     
     # Update layout for better readability
     fig.update_layout(
-        height=600,
-        xaxis={'side': 'bottom'},
-        title=t.get("correlation_heatmap_title", "Correlation Heatmap"),
         xaxis_title=t.get("variables", "Variables"),
         yaxis_title=t.get("variables", "Variables")
     )
@@ -38,4 +61,4 @@ def display_correlation_heatmap(corr_matrix, t):
     # Rotate x-axis labels for better readability
     fig.update_xaxes(tickangle=-45)
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
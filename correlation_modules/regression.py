@@ -0,0 +1,274 @@
+"""
+Module for regression lines and large-sample scatter plots built from
+sufficient statistics.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from scipy import stats
+from config import SCATTER_WEBGL_THRESHOLD, SCATTER_DENSITY_THRESHOLD, SCATTER_DENSITY_BINS
+
+def sufficient_statistics(df, x_var, y_var):
+    """
+    Compute the sums needed for a simple linear regression of y on x.
+
+    Only rows where both x and y are present are used.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        x_var (str): Predictor variable name
+        y_var (str): Outcome variable name
+
+    Returns:
+        dict: n, sum_x, sum_y, sum_xx, sum_yy, sum_xy, min_x and max_x
+    """
+    valid = df[[x_var, y_var]].dropna()
+    x = valid[x_var].to_numpy(dtype=float)
+    y = valid[y_var].to_numpy(dtype=float)
+    return {
+        "n": len(x),
+        "sum_x": x.sum(),
+        "sum_y": y.sum(),
+        "sum_xx": x @ x,
+        "sum_yy": y @ y,
+        "sum_xy": x @ y,
+        "min_x": x.min() if len(x) else np.nan,
+        "max_x": x.max() if len(x) else np.nan
+    }
+
+def grouped_sufficient_statistics(df, x_var, y_var, group_col):
+    """
+    Compute the regression sums of y on x for every group in one grouped pass.
+
+    Only rows where x, y and the group are all present are used, so the x and y
+    values of each pair stay aligned.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        x_var (str): Predictor variable name
+        y_var (str): Outcome variable name
+        group_col (str): Grouping variable name
+
+    Returns:
+        pandas.DataFrame: One row per group (index) with n, sum_x, sum_y, sum_xx,
+            sum_yy, sum_xy, min_x and max_x
+    """
+    valid = df[[group_col, x_var, y_var]].dropna()
+    x = valid[x_var].astype(float)
+    y = valid[y_var].astype(float)
+    terms = pd.DataFrame({
+        "group": valid[group_col],
+        "n": 1,
+        "sum_x": x,
+        "sum_y": y,
+        "sum_xx": x * x,
+        "sum_yy": y * y,
+        "sum_xy": x * y,
+        "min_x": x,
+        "max_x": x
+    })
+    return terms.groupby("group", sort=True).agg({
+        "n": "sum", "sum_x": "sum", "sum_y": "sum", "sum_xx": "sum",
+        "sum_yy": "sum", "sum_xy": "sum", "min_x": "min", "max_x": "max"
+    })
+
+def regression_from_sums(sums):
+    """
+    Compute the ordinary least squares line from sufficient statistics.
+
+    Works element-wise, so a table of per-group sums gives the regression of
+    every group at once.
+
+    Args:
+        sums (dict or pandas.DataFrame): Output of sufficient_statistics or
+            grouped_sufficient_statistics
+
+    Returns:
+        dict: n, slope, intercept, r, r_squared, slope_se, intercept_se and
+            p_value (slope), as scalars or arrays; NaN when fewer than 3 points
+            or no variance
+    """
+    n = np.asarray(sums["n"], dtype=float)
+    valid_n = np.where(n > 0, n, np.nan)
+
+    mean_x = np.asarray(sums["sum_x"], dtype=float) / valid_n
+    mean_y = np.asarray(sums["sum_y"], dtype=float) / valid_n
+    ss_xx = np.asarray(sums["sum_xx"], dtype=float) - n * mean_x ** 2
+    ss_yy = np.asarray(sums["sum_yy"], dtype=float) - n * mean_y ** 2
+    ss_xy = np.asarray(sums["sum_xy"], dtype=float) - n * mean_x * mean_y
+
+    # Relative tolerance: a constant variable can leave rounding residue in the sums
+    valid = (
+        (n >= 3)
+        & (ss_xx > 1e-12 * np.asarray(sums["sum_xx"], dtype=float))
+        & (ss_yy > 1e-12 * np.asarray(sums["sum_yy"], dtype=float))
+    )
+    ss_xx = np.where(valid, ss_xx, np.nan)
+    ss_yy = np.where(valid, ss_yy, np.nan)
+
+    slope = ss_xy / ss_xx
+    r = np.clip(ss_xy / np.sqrt(ss_xx * ss_yy), -1, 1)
+    residual_var = np.maximum(ss_yy - slope * ss_xy, 0) / np.where(valid, n - 2, np.nan)
+    slope_se = np.sqrt(residual_var / ss_xx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_value = np.abs(slope / slope_se)
+    p_value = np.where(slope_se > 0, 2 * stats.t.sf(t_value, np.where(valid, n - 2, 1)), 0.0)
+
+    result = {
+        "n": sums["n"],
+        "slope": slope,
+        "intercept": mean_y - slope * mean_x,
+        "r": r,
+        "r_squared": r ** 2,
+        "slope_se": slope_se,
+        "intercept_se": np.sqrt(residual_var * (1 / valid_n + mean_x ** 2 / ss_xx)),
+        "p_value": np.where(valid, p_value, np.nan)
+    }
+
+    if np.ndim(n) == 0:
+        result = {k: (v if k == "n" else float(v)) for k, v in result.items()}
+    return result
+
+def grouped_regression(df, x_var, y_var, group_col):
+    """
+    Regression of y on x for every group, from one grouped pass of sums.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        x_var (str): Predictor variable name
+        y_var (str): Outcome variable name
+        group_col (str): Grouping variable name
+
+    Returns:
+        pandas.DataFrame: One row per group (index) with n, slope, intercept, r,
+            r_squared, slope_se, intercept_se, p_value, min_x and max_x
+    """
+    sums = grouped_sufficient_statistics(df, x_var, y_var, group_col)
+    result = pd.DataFrame(regression_from_sums(sums), index=sums.index)
+    result["min_x"] = sums["min_x"]
+    result["max_x"] = sums["max_x"]
+    return result
+
+def fit_line(df, x_var, y_var):
+    """
+    Regression of y on x from the sufficient statistics.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        x_var (str): Predictor variable name
+        y_var (str): Outcome variable name
+
+    Returns:
+        dict: Regression results (see regression_from_sums) with min_x and max_x
+    """
+    sums = sufficient_statistics(df, x_var, y_var)
+    return {**regression_from_sums(sums), "min_x": sums["min_x"], "max_x": sums["max_x"]}
+
+def add_regression_line(fig, line, name, **line_style):
+    """
+    Add a straight regression line over the observed x range to a figure.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to update
+        line (dict): Output of fit_line
+        name (str): Legend name of the line
+        **line_style: Line properties (color, dash, width)
+    """
+    if not np.isfinite(line["slope"]):
+        return
+
+    x_range = np.array([line["min_x"], line["max_x"]])
+    fig.add_trace(go.Scatter(
+        x=x_range,
+        y=line["intercept"] + line["slope"] * x_range,
+        mode="lines",
+        name=name,
+        line=line_style,
+        hovertemplate=f"y = {line['slope']:.3f}x + {line['intercept']:.3f}<br>R² = {line['r_squared']:.3f}<extra></extra>"
+    ))
+
+def create_density_figure(df, x_var, y_var, labels, title, bins=SCATTER_DENSITY_BINS):
+    """
+    Build a 2D density (binned counts) figure computed on the server.
+
+    Only the bin counts are sent to the browser, so the figure size does not
+    depend on the number of observations.
+
+    Args:
+        df (pandas.DataFrame): The data to plot
+        x_var (str): X-axis variable name
+        y_var (str): Y-axis variable name
+        labels (dict): Axis labels keyed by variable name
+        title (str): Figure title
+        bins (int): Number of bins per axis
+
+    Returns:
+        plotly.graph_objects.Figure: Heatmap of counts (empty bins transparent)
+    """
+    valid = df[[x_var, y_var]].dropna()
+    counts, x_edges, y_edges = np.histogram2d(
+        valid[x_var].to_numpy(dtype=float), valid[y_var].to_numpy(dtype=float), bins=bins
+    )
+    counts = np.where(counts > 0, counts, np.nan)
+
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=counts.T,
+        colorscale="Blues",
+        colorbar=dict(title="n"),
+        hovertemplate=f"{labels.get(x_var, x_var)}: %{{x:.1f}}<br>{labels.get(y_var, y_var)}: %{{y:.1f}}<br>n = %{{z}}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x_var, x_var),
+        yaxis_title=labels.get(y_var, y_var)
+    )
+    return fig
+
+def create_large_scatter(df, x_var, y_var, color_var=None, labels=None, title=None, trendline=True):
+    """
+    Build a scatter plot that stays responsive for large samples.
+
+    Up to SCATTER_WEBGL_THRESHOLD points a regular SVG scatter is drawn, up to
+    SCATTER_DENSITY_THRESHOLD points WebGL traces are used, and above that a
+    server-side density grid replaces the points. The regression line is taken
+    from the sufficient statistics instead of being refitted by
+    statsmodels on every rerun.
+
+    Args:
+        df (pandas.DataFrame): The data to plot
+        x_var (str): X-axis variable name
+        y_var (str): Y-axis variable name
+        color_var (str or None): Variable for color grouping
+        labels (dict, optional): Axis/legend labels keyed by variable name
+        title (str, optional): Figure title
+        trendline (bool): Whether to add the overall regression line
+
+    Returns:
+        tuple: (plotly.graph_objects.Figure, render mode: "svg", "webgl" or "density")
+    """
+    labels = labels or {}
+    columns = [x_var, y_var] + ([color_var] if color_var else [])
+    n_points = len(df[[x_var, y_var]].dropna())
+
+    if n_points > SCATTER_DENSITY_THRESHOLD:
+        fig = create_density_figure(df, x_var, y_var, labels, title)
+        render_mode = "density"
+    else:
+        render_mode = "webgl" if n_points > SCATTER_WEBGL_THRESHOLD else "svg"
+        fig = px.scatter(
+            df[columns],
+            x=x_var,
+            y=y_var,
+            color=color_var,
+            labels=labels,
+            title=title,
+            render_mode=render_mode
+        )
+
+    if trendline:
+        add_regression_line(fig, fit_line(df, x_var, y_var), "OLS", color="#E74C3C", width=2)
+
+    return fig, render_mode
@@ -9,6 +9,7 @@ import os
 import pandas as pd
 import plotly.figure_factory as ff
 from config import egra_columns, egma_columns
+from docx_tables import add_bulk_table
 
 def create_correlation_word_report(corr_matrix, df_strong, t, df):
     """
@@ -72,50 +73,40 @@ def add_interpretation_guide(doc, t):
     doc.add_paragraph(t.get("correlation_point3", "A correlation close to 0 indicates a weak or no relationship"), style='List Bullet')
     doc.add_paragraph(t.get("correlation_point4", "Correlations > 0.5 or < -0.5 are considered significant"), style='List Bullet')
 
+def _column_label(t):
+    """Get a function translating column names for table cells."""
+    return lambda col: t["columns_of_interest"].get(col, col)
+
+def _format_correlation(value):
+    """Format a correlation coefficient for table cells."""
+    return f"{value:.2f}"
+
 def add_correlation_matrix_section(doc, corr_matrix, t):
     """Add correlation matrix section with table."""
     doc.add_heading(t.get("correlation_matrix", "Correlation Matrix"), level=1)
     
     # Add correlation matrix table
     # Add +1 to rows and columns for headers
-    table = doc.add_table(rows=len(corr_matrix.index) + 1, cols=len(corr_matrix.columns) + 1)
-    table.style = 'Table Grid'
-    
-    # Add column headers
-    header_cells = table.rows[0].cells
-    header_cells[0].text = ""  # Top-left cell
-    for i, col in enumerate(corr_matrix.columns):
-        header_cells[i + 1].text = t["columns_of_interest"].get(col, col)
-    
-    # Add row headers and data
-    for i, idx in enumerate(corr_matrix.index):
-        row_cells = table.rows[i + 1].cells
-        row_cells[0].text = t["columns_of_interest"].get(idx, idx)
-        for j, col in enumerate(corr_matrix.columns):
-            value = corr_matrix.loc[idx, col]
-            cell_text = f"{value:.2f}"
-            row_cells[j + 1].text = cell_text
+    add_bulk_table(
+        doc,
+        corr_matrix.itertuples(name=None),
+        headers=[""] + [t["columns_of_interest"].get(col, col) for col in corr_matrix.columns],
+        bold_header=False,
+        formatters=[_column_label(t)] + [_format_correlation] * len(corr_matrix.columns)
+    )
 
 def add_significant_correlations_section(doc, df_strong, t):
     """Add significant correlations section."""
     doc.add_heading(t.get("strong_correlations", "Significant Correlations"), level=1)
     
     # Create significant correlations table
-    table = doc.add_table(rows=len(df_strong) + 1, cols=3)
-    table.style = 'Table Grid'
-    
-    # Add headers
-    header_cells = table.rows[0].cells
-    header_cells[0].text = t.get("task_1", "Task 1")
-    header_cells[1].text = t.get("task_2", "Task 2")
-    header_cells[2].text = t.get("correlation", "Correlation")
-    
-    # Add data rows
-    for i, (_, row) in enumerate(df_strong.iterrows(), 1):
-        row_cells = table.rows[i].cells
-        row_cells[0].text = t["columns_of_interest"].get(row["task1"], row["task1"])
-        row_cells[1].text = t["columns_of_interest"].get(row["task2"], row["task2"])
-        row_cells[2].text = f"{row['correlation']:.2f}"
+    add_bulk_table(
+        doc,
+        df_strong[["task1", "task2", "correlation"]].itertuples(index=False, name=None),
+        headers=[t.get("task_1", "Task 1"), t.get("task_2", "Task 2"), t.get("correlation", "Correlation")],
+        bold_header=False,
+        formatters=[_column_label(t), _column_label(t), _format_correlation]
+    )
 
 def add_educational_interpretation_section(doc, df_strong, t):
     """Add educational interpretation section."""
@@ -5,8 +5,9 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from scipy import stats
 from config import egra_columns, egma_columns
+from correlation_modules.regression import create_large_scatter, fit_line
+from chart_bundle import register_chart
 
 def display_significant_correlations(df, df_strong, t):
     """
@@ -98,12 +99,11 @@ def create_correlation_scatterplot(df, var1, var2, corr_value, t):
     var1_name = t["columns_of_interest"].get(var1, var1)
     var2_name = t["columns_of_interest"].get(var2, var2)
     
-    # Create scatter plot with regression line
-    fig = px.scatter(
+    # Create scatter plot with regression line (WebGL or density grid for large samples)
+    fig, _ = create_large_scatter(
         df,
-        x=var1,
-        y=var2,
-        trendline="ols",
+        var1,
+        var2,
         labels={
             var1: var1_name,
             var2: var2_name
@@ -115,21 +115,14 @@ def create_correlation_scatterplot(df, var1, var2, corr_value, t):
     fig.update_layout(height=350)
     
     # Display plot
+    register_chart("analyse5", f"scatter_{var2}_vs_{var1}", fig)
     st.plotly_chart(fig, use_container_width=True)
     
-    # Calculate and display regression equation
-    try:
-        # Calculate linear regression
-        valid_data = df[[var1, var2]].dropna()
-        slope, intercept, r_value, p_value, std_err = stats.linregress(
-            valid_data[var1], valid_data[var2]
-        )
-        r_squared = r_value ** 2
-        
-        equation = f"y = {slope:.3f}x + {intercept:.3f} (R² = {r_squared:.3f})"
+    # Display regression equation (from the same cached sums as the trendline)
+    line = fit_line(df, var1, var2)
+    if np.isfinite(line["slope"]):
+        equation = f"y = {line['slope']:.3f}x + {line['intercept']:.3f} (R² = {line['r_squared']:.3f})"
         st.caption(equation)
-    except:
-        pass
 
 def display_correlation_network(df_strong, t):
     """
@@ -253,4 +246,5 @@ def create_network_visualization(nodes_df, edges_df, t):
         legend=dict(title=t.get("skill_type", "Skill Type"))
     )
     
+    register_chart("analyse5", "correlation_network", fig)
     st.plotly_chart(fig, use_container_width=True)
@@ -7,9 +7,12 @@ This module handles credits, licensing, and attribution display.
 """
 
 import streamlit as st
+from copy import deepcopy
 from datetime import datetime
 import hashlib
 
+from cache_utils import LRUCache
+
 
 # ==================== CONFIGURATION ====================
 CREDITS_CONFIG = {
@@ -35,6 +38,9 @@ def generate_app_hash():
 
 APP_HASH = generate_app_hash()
 
+# Blocs de crédits déjà construits, par langue
+_CREDITS_CACHE = LRUCache(max_entries=8)
+
 
 # ==================== FONCTIONS D'AFFICHAGE ====================
 def get_translations(language="en"):
@@ -245,25 +251,20 @@ For questions, suggestions or collaboration:
     )
 
 
-def add_credits_to_word_report(doc, language="en"):
+def _build_credits_block(language):
     """
-    Ajoute les crédits à un document Word.
-    
-    Args:
-        doc: Document python-docx
-        language (str): Code langue (en/fr/ar)
+    Construit le bloc de crédits (sans la ligne horodatée) dans un document vierge.
     
     Returns:
-        doc: Document avec crédits ajoutés
+        list: Éléments XML du corps du document, à copier dans les rapports
     """
-    try:
-        from docx.shared import Pt, RGBColor
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-    except ImportError:
-        st.warning("python-docx non disponible. Les crédits ne seront pas ajoutés au rapport Word.")
-        return doc
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.ns import qn
     
     t = get_translations(language)
+    doc = Document()
     
     # Ajouter un saut de page
     doc.add_page_break()
@@ -307,6 +308,41 @@ def add_credits_to_word_report(doc, language="en"):
     note_format.space_before = Pt(12)
     note_format.space_after = Pt(12)
     
+    return [element for element in doc.element.body if element.tag != qn('w:sectPr')]
+
+
+def add_credits_to_word_report(doc, language="en"):
+    """
+    Ajoute les crédits à un document Word.
+    
+    Le bloc de crédits est construit une fois par langue puis copié dans
+    chaque rapport ; seule la ligne horodatée est ajoutée à chaque appel.
+    
+    Args:
+        doc: Document python-docx
+        language (str): Code langue (en/fr/ar)
+    
+    Returns:
+        doc: Document avec crédits ajoutés
+    """
+    try:
+        from docx.shared import Pt, RGBColor
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+    except ImportError:
+        st.warning("python-docx non disponible. Les crédits ne seront pas ajoutés au rapport Word.")
+        return doc
+    
+    block = _CREDITS_CACHE.get_or_compute(language, lambda: _build_credits_block(language))
+    
+    # Copier le bloc avant les propriétés de section du document
+    body = doc.element.body
+    sect_pr = body.sectPr
+    for element in block:
+        if sect_pr is not None:
+            sect_pr.addprevious(deepcopy(element))
+        else:
+            body.append(deepcopy(element))
+    
     # Footer discret
     footer = doc.add_paragraph()
     footer_run = footer.add_run(f"\nApp ID: {APP_HASH} | {datetime.now().strftime('%Y-%m-%d %H:%M')}")
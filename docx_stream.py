@@ -0,0 +1,326 @@
+# docx_stream.py
+# Streaming Word report writer: the report body is serialised section by
+# section to a temporary file and images are written to the .docx archive as
+# soon as they are inserted, so very large reports never exist as one DOM
+
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+from docx.oxml.ns import qn
+from docx.shared import Inches
+from lxml import etree
+
+from figure_export import RENDER_TIMEOUT_SECONDS
+from word_report import WordReportGenerator
+
+logger = logging.getLogger(__name__)
+
+# Deferred pictures waiting for their render before the oldest one is awaited
+# (bounds the rendered images held in memory)
+STREAM_MAX_PENDING_PICTURES = 16
+# Buffer size used when copying the serialised body into the archive
+STREAM_COPY_BUFFER = 1024 * 1024
+
+_BODY_START = b"<w:body>"
+_BODY_END = b"</w:body>"
+
+
+class StreamingWordReportGenerator(WordReportGenerator):
+    """
+    Word report generator writing the document incrementally.
+
+    The python-docx document only holds the content added since the last
+    flush: body elements are serialised to a temporary file at each section,
+    page break, table and picture, and image data is written to the archive
+    and released from the package. Styles, headers, footers and the other
+    package parts are written when the report is closed. The document XML,
+    relationships and images are the same as those of WordReportGenerator,
+    except that an image identical to one already written is stored again.
+    """
+
+    def __init__(self, language="en", fileobj=None):
+        """
+        Initialize the streaming report generator.
+
+        Args:
+            language (str): The language for the report ("en" or "fr")
+            fileobj (file-like, optional): Seekable binary file receiving the
+                .docx archive (a temporary file by default)
+        """
+        super().__init__(language)
+        self.fileobj = fileobj
+        self._output = None
+        self._archive = None
+        self._body_file = None
+        self._written_parts = set()
+        self._shape_count = 0
+
+    def create_new_report(self, title=None, include_toc=True, confidential=False):
+        """
+        Create a new Word document and open its archive.
+
+        Args:
+            title (str, optional): Report title
+            include_toc (bool): Whether to include a table of contents
+            confidential (bool): Whether to mark the document as confidential
+
+        Returns:
+            Document: The document holding the content not yet flushed
+        """
+        self._close_files()
+        doc = super().create_new_report(title, include_toc, confidential)
+
+        self._output = self.fileobj if self.fileobj is not None else tempfile.TemporaryFile()
+        self._archive = zipfile.ZipFile(self._output, "w", compression=zipfile.ZIP_DEFLATED)
+        self._body_file = tempfile.TemporaryFile()
+        self._written_parts = set()
+        self._shape_count = 0
+        return doc
+
+    def add_section(self, title, level=1):
+        """Add a new section to the report, writing out the previous content."""
+        self.flush()
+        super().add_section(title, level)
+
+    def add_page_break(self):
+        """Add a page break to the report."""
+        super().add_page_break()
+        self.flush()
+
+    def add_table(self, data, headers=None, title=None, autofit=True, style='Table Grid'):
+        """Add a table to the report and write it out (see WordReportGenerator.add_table)."""
+        table = super().add_table(data, headers=headers, title=title, autofit=autofit, style=style)
+        self.flush()
+        return table
+
+    def add_markdown(self, text, heading_level=1):
+        """Add Markdown text to the report and write it out (see WordReportGenerator.add_markdown)."""
+        super().add_markdown(text, heading_level)
+        self.flush()
+
+    def add_figure(self, figure, title=None, width=6, height=None, dpi=300):
+        """Add a matplotlib figure to the report and write it out (see WordReportGenerator.add_figure)."""
+        image = super().add_figure(figure, title=title, width=width, height=height, dpi=dpi)
+        self.flush()
+        return image
+
+    def add_plotly_figure(self, fig, title=None, width=6, height=4, scale=1):
+        """Add a plotly figure to the report and write it out (see WordReportGenerator.add_plotly_figure)."""
+        image = super().add_plotly_figure(fig, title=title, width=width, height=height, scale=scale)
+        self.flush()
+        return image
+
+    def add_picture(self, image, title=None, width=6):
+        """Add an image to the report and write it out once rendered (see WordReportGenerator.add_picture)."""
+        super().add_picture(image, title=title, width=width)
+        self.flush()
+
+    def flush(self):
+        """
+        Write the content added so far to the archive and release it.
+
+        Pictures whose rendering is done are inserted first; the body is
+        written up to the first picture still rendering, which keeps its place.
+        """
+        if self._archive is None:
+            return
+
+        self._resolve_ready_pictures()
+
+        body = self.doc.element.body
+        sect_pr = body.sectPr
+        pending = {run._parent._p for run, _, _, _ in self._pending_pictures}
+        chunk = []
+        for element in body:
+            if element is sect_pr or element in pending:
+                break
+            chunk.append(element)
+
+        if chunk:
+            # python-docx numbers new pictures from the ids left in the document,
+            # so written pictures are renumbered to keep the ids unique
+            for element in chunk:
+                for doc_pr in element.iter(qn("wp:docPr")):
+                    self._shape_count += 1
+                    doc_pr.set("id", str(self._shape_count))
+                    doc_pr.set("name", f"Picture {self._shape_count}")
+
+            # Serialise the chunk inside the document element, so that it uses
+            # the namespace declarations of the root like a full save does
+            remaining = list(body)[len(chunk):]
+            for element in remaining:
+                body.remove(element)
+            xml = etree.tostring(self.doc.element, encoding="UTF-8")
+            for element in chunk:
+                body.remove(element)
+            for element in remaining:
+                body.append(element)
+
+            start = xml.index(_BODY_START) + len(_BODY_START)
+            self._body_file.write(xml[start:xml.rindex(_BODY_END)])
+
+        self._write_images()
+
+    def _resolve_ready_pictures(self):
+        """Insert the pictures whose render is done, waiting for the oldest ones beyond the limit."""
+        still_pending = []
+        excess = len(self._pending_pictures) - STREAM_MAX_PENDING_PICTURES
+        for index, (run, future, width, caption) in enumerate(self._pending_pictures):
+            if index >= excess and not future.done():
+                still_pending.append((run, future, width, caption))
+                continue
+            try:
+                run.add_picture(BytesIO(future.result(timeout=RENDER_TIMEOUT_SECONDS)), width=Inches(width))
+            except Exception as e:
+                logger.error(f"Error adding picture to report: {str(e)}")
+                paragraph = run._parent
+                paragraph._p.getparent().remove(paragraph._p)
+                if caption is not None:
+                    caption._p.getparent().remove(caption._p)
+        self._pending_pictures = still_pending
+
+    def _write_images(self):
+        """Write the new image parts to the archive and drop their data from memory."""
+        for rel in self.doc.part.rels.values():
+            if rel.is_external or rel.reltype != RT.IMAGE:
+                continue
+            part = rel.target_part
+            if part.partname in self._written_parts:
+                continue
+            self._archive.writestr(part.partname.membername, part.blob)
+            self._written_parts.add(part.partname)
+            part._blob = b""
+            part._image = None
+
+    def _finish(self):
+        """
+        Write the remaining content and the package parts, and close the archive.
+
+        Returns:
+            file-like: The output the archive was written to
+        """
+        self.resolve_pictures()
+        self.flush()
+
+        package = self.doc.part.package
+        parts = list(package.iter_parts())
+        for part in parts:
+            part.before_marshal()
+
+        archive = self._archive
+        archive.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        archive.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+
+        for part in parts:
+            if part.partname in self._written_parts:
+                continue
+            if len(part.rels):
+                archive.writestr(part.partname.rels_uri.membername, part.rels.xml)
+            if part is self.doc.part:
+                self._write_document_xml(part)
+            else:
+                archive.writestr(part.partname.membername, part.blob)
+
+        archive.close()
+        self._archive = None
+        self._body_file.close()
+        self._body_file = None
+
+        output, self._output = self._output, None
+        return output
+
+    def _write_document_xml(self, part):
+        """Write the main document part: its start, the streamed body, then the section properties."""
+        # The body now only holds the final section properties
+        xml = part.blob
+        start = xml.index(_BODY_START) + len(_BODY_START)
+
+        self._body_file.seek(0)
+        with self._archive.open(part.partname.membername, "w", force_zip64=True) as stream:
+            stream.write(xml[:start])
+            shutil.copyfileobj(self._body_file, stream, STREAM_COPY_BUFFER)
+            stream.write(xml[start:])
+
+    def _close_files(self):
+        """Discard a report that was not finished."""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        if self._body_file is not None:
+            self._body_file.close()
+            self._body_file = None
+        if self._output is not None and self._output is not self.fileobj:
+            self._output.close()
+        self._output = None
+
+    def save(self, filename):
+        """
+        Finish the report and save it to a file.
+
+        Args:
+            filename (str): Output filename
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        output = self._finish()
+        output.seek(0)
+        with open(filename, "wb") as f:
+            shutil.copyfileobj(output, f, STREAM_COPY_BUFFER)
+        if output is not self.fileobj:
+            output.close()
+        self.cleanup()
+
+    def to_file(self):
+        """
+        Finish the report and return the file holding it.
+
+        The archive is not read into memory: the caller reads (or copies) the
+        file and closes it.
+
+        Returns:
+            file-like: The .docx archive, positioned at its start (fileobj
+                when one was given, else a temporary file)
+        """
+        output = self._finish()
+        output.seek(0)
+        self.cleanup()
+        return output
+
+    def to_bytes(self):
+        """
+        Finish the report and return it as bytes.
+
+        This reads the whole archive into memory; prefer to_file for large
+        reports.
+
+        Returns:
+            bytes: The .docx file content
+        """
+        output = self.to_file()
+        docx_bytes = output.read()
+        if output is not self.fileobj:
+            output.close()
+        return docx_bytes
+
+    def cleanup(self):
+        """Close the files of an unfinished report and clean up temporary files."""
+        self._close_files()
+        super().cleanup()
+
+    def get_document(self):
+        """
+        Get the document object.
+
+        Returns:
+            Document: The document, holding only the content not yet written
+        """
+        return self.doc
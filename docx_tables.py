@@ -0,0 +1,124 @@
+# docx_tables.py
+# Bulk Word table writer: builds the table rows (w:tr/w:tc) as one XML string
+# and parses them once, instead of filling python-docx cells one by one
+
+import re
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+# Splits cell text on the characters python-docx turns into <w:tab/> and <w:br/>
+_SPECIAL_CHARS = re.compile(r"(\t|\r\n|\n|\r)")
+
+_BOLD_RUN = "<w:r><w:rPr><w:b/></w:rPr>"
+_PLAIN_RUN = "<w:r>"
+
+
+def run_content(text):
+    """
+    Convert text to run content the way python-docx does when setting cell or run text.
+
+    Args:
+        text (str): Text of the run
+
+    Returns:
+        str: w:t, w:tab and w:br elements
+    """
+    parts = []
+    for piece in _SPECIAL_CHARS.split(text):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece == "\r\n":
+            parts.append("<w:br/><w:br/>")
+        elif piece in ("\n", "\r"):
+            parts.append("<w:br/>")
+        elif piece[0].isspace() or piece[-1].isspace():
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(piece)}</w:t>")
+    return "".join(parts)
+
+
+def add_bulk_table(doc, rows, headers=None, style="Table Grid", bold_header=True, formatters=None,
+                   bold_columns=()):
+    """
+    Add a table to a document in one pass.
+
+    The table is created empty by python-docx (so its properties and grid are
+    unchanged), then all rows are generated as XML and appended at once, with
+    the cell markup prepared once per column. The result is the same XML as
+    setting cell.text on every cell and bolding the header runs.
+
+    Args:
+        doc (Document): python-docx document (or any object with add_table)
+        rows (iterable): Row values (lists or tuples), or a pandas DataFrame
+            whose values are written without its index
+        headers (list, optional): Header row
+        style (str, optional): Table style name
+        bold_header (bool): Whether the header text is bold
+        formatters (list or dict, optional): Per column function converting a
+            value to text (str is used for other columns)
+        bold_columns (iterable): Indexes of columns whose body text is bold
+
+    Returns:
+        Table: The created table
+    """
+    if hasattr(rows, "itertuples"):
+        if headers is None:
+            headers = [str(col) for col in rows.columns]
+        rows = rows.itertuples(index=False, name=None)
+
+    rows = iter(rows)
+    first = None
+    if headers is not None:
+        n_cols = len(headers)
+    else:
+        first = next(rows, None)
+        n_cols = len(first) if first is not None else 0
+
+    table = doc.add_table(rows=0, cols=n_cols)
+    if style is not None:
+        table.style = style
+
+    # Per column: cell opening markup (with the grid width) and run properties
+    widths = [grid_col.get(qn("w:w")) for grid_col in table._tbl.tblGrid.iterchildren(qn("w:gridCol"))]
+    cell_starts = [
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr><w:p>' if width is not None
+        else "<w:tc><w:tcPr/><w:p>"
+        for width in widths
+    ]
+    bold_columns = set(bold_columns)
+    body_runs = [_BOLD_RUN if j in bold_columns else _PLAIN_RUN for j in range(n_cols)]
+    header_runs = [_BOLD_RUN if bold_header else _PLAIN_RUN] * n_cols
+
+    if formatters is None:
+        formatters = {}
+    elif not isinstance(formatters, dict):
+        formatters = dict(enumerate(formatters))
+    body_formatters = [formatters.get(j) or str for j in range(n_cols)]
+
+    def _row_xml(values, runs, to_text):
+        cells = [
+            f"{cell_starts[j]}{runs[j]}{run_content(to_text[j](value))}</w:r></w:p></w:tc>"
+            for j, value in enumerate(values)
+        ]
+        return f"<w:tr>{''.join(cells)}</w:tr>"
+
+    xml_rows = []
+    if headers is not None:
+        xml_rows.append(_row_xml(headers, header_runs, [str] * n_cols))
+    if first is not None:
+        xml_rows.append(_row_xml(first, body_runs, body_formatters))
+    for values in rows:
+        xml_rows.append(_row_xml(values, body_runs, body_formatters))
+
+    if xml_rows:
+        fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(xml_rows)}</w:tbl>")
+        tbl = table._tbl
+        for tr in list(fragment):
+            tbl.append(tr)
+
+    return table
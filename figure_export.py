@@ -0,0 +1,601 @@
+# figure_export.py
+# Long-lived rendering service turning Plotly figures into images
+
+import atexit
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import numpy as np
+import plotly.io as pio
+
+from cache_utils import LRUCache, DiskLRUCache
+
+logger = logging.getLogger("datavizir_figures")
+
+# Number of warm renderer processes (kaleido holds a browser per process)
+RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Time allowed for a worker's renderer start-up (test render and kaleido's
+# persistent browser), in seconds; a worker that does not start fails its renders
+RENDER_WARMUP_TIMEOUT = 30
+# Time after which a render is failed and the pool restarted, in seconds (a
+# worker can hang, e.g. when kaleido cannot reach a browser)
+RENDER_TIMEOUT_SECONDS = 120
+# Interval at which running renders are checked against the timeout, in seconds
+RENDER_WATCH_INTERVAL = 1.0
+
+# Rendered images are kept in memory and spilled to disk when evicted
+IMAGE_CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+IMAGE_CACHE_DISK_BYTES = 512 * 1024 * 1024
+# Directory of the spilled images (None: a private directory created for the
+# process and removed at exit)
+IMAGE_CACHE_DIR = None
+
+
+# Why the renderer of this worker process could not start (set by _init_renderer)
+_renderer_error = None
+
+
+def _warm_up_renderer():
+    """Render a test figure, then start kaleido's persistent browser if available."""
+    def _test_render():
+        pio.to_image({"data": [], "layout": {}}, format="png", width=10, height=10, validate=False)
+
+    # A plain render fails at once when no browser is available
+    _test_render()
+    try:
+        import kaleido
+    except ImportError:
+        return
+    # kaleido >= 1.0 keeps a persistent browser through a sync server
+    if hasattr(kaleido, "start_sync_server"):
+        kaleido.start_sync_server(silence_warnings=True)
+        _test_render()
+
+
+def _init_renderer():
+    """
+    Start the renderer once in a worker process so later renders skip the start-up.
+
+    The start-up runs in a thread with a timeout, so the worker starts even if
+    it hangs (kaleido's persistent server waits forever without a browser);
+    the worker then fails its renders at once.
+    """
+    global _renderer_error
+    errors = []
+
+    def _run():
+        try:
+            _warm_up_renderer()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    thread.join(RENDER_WARMUP_TIMEOUT)
+    if thread.is_alive():
+        _renderer_error = f"renderer start-up timed out after {RENDER_WARMUP_TIMEOUT} s"
+    elif errors:
+        _renderer_error = str(errors[0])
+    if _renderer_error is not None:
+        logger.warning(f"Renderer warm-up failed: {_renderer_error}")
+
+
+def _render_in_worker(fig_json, format, width, height, scale):
+    """
+    Render a serialised figure in a worker process.
+
+    Returns:
+        tuple: (image bytes, rendering time in seconds)
+
+    Raises:
+        RuntimeError: If the renderer of the worker could not start
+    """
+    if _renderer_error is not None:
+        raise RuntimeError(f"Figure renderer unavailable: {_renderer_error}")
+    start = time.perf_counter()
+    image = pio.to_image(
+        json.loads(fig_json), format=format, width=width, height=height, scale=scale, validate=False
+    )
+    return image, time.perf_counter() - start
+
+
+class FigureImageCache:
+    """
+    Content-addressed cache of rendered figures.
+
+    Images are keyed by a hash of the serialised figure and the export options,
+    so identical figures are never rasterised twice. The most recently used
+    images stay in memory; images evicted from memory are spilled to a
+    size-bounded directory on disk.
+    """
+
+    def __init__(self, memory_bytes=IMAGE_CACHE_MEMORY_BYTES, disk_bytes=IMAGE_CACHE_DISK_BYTES,
+                 directory=IMAGE_CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            memory_bytes (int): Maximum size of the images kept in memory
+            disk_bytes (int): Maximum size of the images kept on disk
+            directory (str, optional): Directory for spilled images (default:
+                a private temporary directory removed at exit)
+        """
+        try:
+            if directory is None:
+                directory = tempfile.mkdtemp(prefix="datavizir_figure_cache_")
+                atexit.register(shutil.rmtree, directory, ignore_errors=True)
+            self._disk = DiskLRUCache(directory, max_bytes=disk_bytes, suffix=".img")
+        except OSError as e:
+            logger.warning(f"Figure disk cache unavailable: {str(e)}")
+            self._disk = None
+
+        # Guards the hit and miss counters (lookups come from several threads)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._memory = LRUCache(
+            max_entries=100000,
+            max_bytes=memory_bytes,
+            size_of=len,
+            on_evict=self._spill
+        )
+
+    @staticmethod
+    def make_key(fig_json, format, width, height, scale):
+        """
+        Build the cache key of a figure export.
+
+        Args:
+            fig_json (str): Serialised Plotly figure
+            format, width, height, scale: Export options
+
+        Returns:
+            str: Hex digest
+        """
+        hasher = hashlib.sha256(fig_json.encode("utf-8"))
+        hasher.update(json.dumps([format, width, height, scale]).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """Return the cached image for key or None (disk hits move back to memory)."""
+        image = self._memory.get(key)
+        if image is None and self._disk is not None:
+            image = self._disk.get(key)
+            if image is not None:
+                self._memory.set(key, image)
+        with self._lock:
+            if image is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return image
+
+    def set(self, key, image):
+        """Store a rendered image."""
+        self._memory.set(key, image)
+
+    def _spill(self, key, image):
+        if self._disk is not None:
+            self._disk.set(key, image)
+
+    def clear(self):
+        """Remove all cached images from memory and disk."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: overall hits, misses and hit_rate, plus memory and disk
+                statistics (see LRUCache.stats)
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory": self._memory.stats(),
+            "disk": self._disk.stats() if self._disk is not None else None
+        }
+
+
+class FigureRenderService:
+    """
+    Pool of warm renderer processes with a shared queue.
+
+    Figures are sent to the workers as JSON and rendered in parallel; the
+    service records per-figure latency and pool utilisation. Rendered images are
+    cached by content, and identical figures queued at the same time are
+    rendered once. If the pool cannot be used, figures are rendered in the
+    calling process instead. A render still running after the timeout fails
+    with TimeoutError and the pool is restarted.
+    """
+
+    def __init__(self, max_workers=RENDER_WORKERS, cache=None, timeout=RENDER_TIMEOUT_SECONDS):
+        """
+        Initialize the service (the pool itself starts on first use).
+
+        Args:
+            max_workers (int): Number of renderer processes
+            cache (FigureImageCache, optional): Image cache (a default one is created)
+            timeout (float): Seconds after which a render fails
+        """
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else FigureImageCache()
+        self.timeout = timeout
+        self._inflight = {}
+        self._deadlines = {}
+        self._watcher = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._started_at = None
+        self._pending = 0
+        self._busy_seconds = 0.0
+        self._latencies = deque(maxlen=500)
+        self.renders = 0
+        self.failures = 0
+
+    def _get_executor(self):
+        """Return the process pool, starting it if needed."""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking the multi-threaded Streamlit server is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_renderer
+                )
+                self._started_at = time.perf_counter()
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name="render-watch", daemon=True)
+                self._watcher.start()
+            return self._executor
+
+    def _watch(self):
+        """Fail the renders running past the timeout and restart the pool they hang in."""
+        while True:
+            time.sleep(RENDER_WATCH_INTERVAL)
+            now = time.perf_counter()
+            with self._lock:
+                expired = [
+                    (key, self._inflight[key]) for key, deadline in self._deadlines.items()
+                    if deadline < now and key in self._inflight
+                ]
+            if not expired:
+                continue
+            logger.error(f"{len(expired)} figure render(s) timed out after {self.timeout} s; restarting the pool")
+            self._reset(terminate=True)
+            for key, result in expired:
+                self._fail(result, TimeoutError(f"Figure rendering timed out after {self.timeout} s"), key)
+
+    def _claim(self, key, result):
+        """
+        Take the completion of a render (it completes once: by its worker or by the timeout).
+
+        Returns:
+            bool: Whether the caller completes result
+        """
+        with self._lock:
+            if self._inflight.get(key) is not result:
+                return False
+            del self._inflight[key]
+            self._deadlines.pop(key, None)
+            return True
+
+    def _record(self, worker_seconds, total_seconds):
+        """Record the timing of one finished render."""
+        with self._lock:
+            self._pending -= 1
+            self._busy_seconds += worker_seconds
+            self._latencies.append(total_seconds)
+            self.renders += 1
+        logger.info(f"Rendered figure in {total_seconds * 1000:.0f} ms (worker {worker_seconds * 1000:.0f} ms)")
+
+    def submit(self, fig, format="png", width=None, height=None, scale=1):
+        """
+        Queue a figure for rendering.
+
+        Args:
+            fig (plotly.graph_objects.Figure): Figure to render
+            format (str): Image format ('png', 'jpeg', 'svg', 'pdf')
+            width (int, optional): Image width in pixels
+            height (int, optional): Image height in pixels
+            scale (float): Scale factor
+
+        Returns:
+            concurrent.futures.Future: Future resolving to the image bytes
+        """
+        fig_json = fig.to_json() if hasattr(fig, "to_json") else json.dumps(fig)
+        args = (fig_json, format, width, height, scale)
+        key = self.cache.make_key(*args)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            result = Future()
+            result.set_result(cached)
+            return result
+
+        with self._lock:
+            # The same figure is already being rendered
+            if key in self._inflight:
+                return self._inflight[key]
+            result = Future()
+            self._inflight[key] = result
+            self._pending += 1
+            submitted_at = time.perf_counter()
+            self._deadlines[key] = submitted_at + self.timeout
+
+        def _on_done(inner):
+            # Already failed by the timeout
+            with self._lock:
+                if self._inflight.get(key) is not result:
+                    return
+            try:
+                image, worker_seconds = inner.result()
+            except BrokenProcessPool:
+                self._reset()
+                try:
+                    image, worker_seconds = _render_in_worker(*args)
+                except Exception as e:
+                    self._fail(result, e, key)
+                    return
+            except Exception as e:
+                self._fail(result, e, key)
+                return
+            if not self._claim(key, result):
+                return
+            self.cache.set(key, image)
+            self._record(worker_seconds, time.perf_counter() - submitted_at)
+            result.set_result(image)
+
+        try:
+            self._get_executor().submit(_render_in_worker, *args).add_done_callback(_on_done)
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            logger.warning(f"Render pool unavailable, rendering in-process: {str(e)}")
+            self._reset()
+            inner = Future()
+            try:
+                inner.set_result(_render_in_worker(*args))
+            except Exception as render_error:
+                inner.set_exception(render_error)
+            _on_done(inner)
+
+        return result
+
+    def _fail(self, result, error, key):
+        """Record a failed render and propagate the error to the caller."""
+        if not self._claim(key, result):
+            return
+        with self._lock:
+            self._pending -= 1
+            self.failures += 1
+        logger.error(f"Figure rendering failed: {str(error)}")
+        result.set_exception(error)
+
+    def render(self, fig, format="png", width=None, height=None, scale=1, timeout=None):
+        """
+        Render one figure and wait for the image.
+
+        Args:
+            timeout (float, optional): Seconds to wait (default: the service timeout)
+
+        Returns:
+            bytes: Image data
+
+        Raises:
+            TimeoutError: If the image is not ready in time
+        """
+        future = self.submit(fig, format=format, width=width, height=height, scale=scale)
+        return future.result(timeout=self.timeout if timeout is None else timeout)
+
+    def render_many(self, figs, format="png", width=None, height=None, scale=1, timeout=None):
+        """
+        Render several figures in parallel.
+
+        Args:
+            figs (list): Figures to render
+            format, width, height, scale: As for submit
+            timeout (float, optional): Seconds to wait for each image (default:
+                the service timeout)
+
+        Returns:
+            list: Image bytes in the order of figs
+
+        Raises:
+            TimeoutError: If an image is not ready in time
+        """
+        futures = [
+            self.submit(fig, format=format, width=width, height=height, scale=scale) for fig in figs
+        ]
+        timeout = self.timeout if timeout is None else timeout
+        return [future.result(timeout=timeout) for future in futures]
+
+    def stats(self):
+        """
+        Get rendering statistics.
+
+        Returns:
+            dict: workers, renders, failures, queued, mean/p95/last latency in
+                seconds, utilisation (share of worker time spent rendering) and
+                cache statistics
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) if self._latencies else np.array([np.nan])
+            uptime = time.perf_counter() - self._started_at if self._started_at else 0.0
+            capacity = uptime * self.max_workers
+            return {
+                "workers": self.max_workers,
+                "renders": self.renders,
+                "failures": self.failures,
+                "queued": self._pending,
+                "mean_latency": float(np.nanmean(latencies)) if self._latencies else None,
+                "p95_latency": float(np.nanpercentile(latencies, 95)) if self._latencies else None,
+                "last_latency": float(latencies[-1]) if self._latencies else None,
+                "utilisation": min(self._busy_seconds / capacity, 1.0) if capacity > 0 else 0.0,
+                "cache": self.cache.stats()
+            }
+
+    def _reset(self, terminate=False):
+        """
+        Discard a broken pool; a new one starts on the next submit.
+
+        Args:
+            terminate (bool): Kill its processes (for workers that hang)
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        processes = list((getattr(executor, "_processes", None) or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self):
+        """Stop the renderer processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_render_service():
+    """
+    Get the process-wide rendering service (shared by all sessions).
+
+    Returns:
+        FigureRenderService: The service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FigureRenderService()
+            atexit.register(_service.shutdown)
+        return _service
+
+
+def render_figure(fig, format="png", width=None, height=None, scale=1):
+    """
+    Render a figure to image bytes through the rendering service.
+
+    Returns:
+        bytes: Image data
+    """
+    return get_render_service().render(fig, format=format, width=width, height=height, scale=scale)
+
+
+def render_figures(figs, format="png", width=None, height=None, scale=1):
+    """
+    Render several figures in parallel through the rendering service.
+
+    Returns:
+        list: Image bytes in the order of figs
+    """
+    return get_render_service().render_many(figs, format=format, width=width, height=height, scale=scale)
+
+
+def figure_to_stream(fig, format="png", width=None, height=None, scale=1):
+    """
+    Render a figure into an in-memory stream, e.g. for doc.add_picture.
+
+    Returns:
+        io.BytesIO: Image data positioned at the start
+    """
+    return BytesIO(render_figure(fig, format=format, width=width, height=height, scale=scale))
+
+
+def write_figure(fig, path, format="png", width=None, height=None, scale=1):
+    """
+    Render a figure through the rendering service and write it to a file
+    (drop-in replacement for fig.write_image).
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to render
+        path (str): Output file path
+        format, width, height, scale: As for render_figure
+    """
+    image = render_figure(fig, format=format, width=width, height=height, scale=scale)
+    with open(path, "wb") as f:
+        f.write(image)
+
+
+def check_rendering(timeout=RENDER_WARMUP_TIMEOUT + RENDER_TIMEOUT_SECONDS):
+    """
+    Render a test figure through a renderer pool of its own.
+
+    Checks the whole export path (worker start-up, rendering, timeout), e.g.
+    on a server without a browser, where it must fail instead of hanging.
+
+    Args:
+        timeout (float): Seconds to wait for the image
+
+    Returns:
+        tuple: (bool: whether the figure was rendered, str: error message or None)
+    """
+    service = FigureRenderService(max_workers=1, cache=FigureImageCache(), timeout=timeout)
+    try:
+        service.render({"data": [{"type": "bar", "y": [1, 2]}], "layout": {}}, width=100, height=100)
+        return True, None
+    except Exception as e:
+        return False, str(e) or type(e).__name__
+    finally:
+        service._reset(terminate=True)
+
+
+def show_render_stats(t):
+    """
+    Display rendering statistics in the sidebar once figures have been exported.
+
+    Args:
+        t (dict): Translation dictionary
+    """
+    import streamlit as st
+
+    if _service is None:
+        return
+
+    stats = _service.stats()
+    cache_stats = stats["cache"]
+    if stats["renders"] == 0 and cache_stats["hits"] == 0:
+        return
+
+    with st.sidebar.expander(t.get("render_stats_title", "🖼️ Figure export")):
+        st.write(f"{t.get('render_stats_renders', 'Figures rendered')}: {stats['renders']}")
+        if stats["renders"]:
+            st.write(f"{t.get('render_stats_latency', 'Mean latency')}: {stats['mean_latency'] * 1000:.0f} ms "
+                     f"(p95 {stats['p95_latency'] * 1000:.0f} ms)")
+            st.write(f"{t.get('render_stats_utilisation', 'Pool utilisation')}: {stats['utilisation']:.0%} "
+                     f"({stats['workers']} {t.get('render_stats_workers', 'workers')})")
+        st.write(f"{t.get('render_stats_cache', 'Image cache hit rate')}: {cache_stats['hit_rate']:.0%} "
+                 f"({cache_stats['memory']['entries']} {t.get('render_stats_cached', 'in memory')})")
+
+
+if __name__ == "__main__":
+    # python figure_export.py: check that figures can be exported on this machine
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    ok, error = check_rendering()
+    print("Figure rendering: OK" if ok else f"Figure rendering failed: {error}")
+    sys.exit(0 if ok else 1)
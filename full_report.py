@@ -0,0 +1,111 @@
+import streamlit as st
+from config import translations, egra_columns, egma_columns
+from analyse12 import international_benchmarks
+from docx_stream import StreamingWordReportGenerator
+from report.report_full import FULL_REPORT_SECTIONS
+from report.report_workbook import analysis_workbook_bytes, XLSX_MIME
+from report.report_wrapper import StandardReportGenerator
+from report_jobs import report_export_button
+
+def build_full_report(df, selected_columns, sections, language):
+    """
+    Build the full report with a generator of its own (runs as a report job).
+    
+    The document is written as it is built (see docx_stream), so memory use
+    does not grow with the number of figures and tables; the finished
+    document stays in its temporary file until it is downloaded.
+
+    Args:
+        df (pandas.DataFrame): The data to report on
+        selected_columns (list): Selected columns for analysis
+        sections (list): Section names to include
+        language (str): Report language
+
+    Returns:
+        tuple: (doc, docx_file, filename)
+    """
+    generator = StandardReportGenerator(word_generator_class=StreamingWordReportGenerator)
+    generator.update_language(language)
+    try:
+        return generator.create_full_report(df, selected_columns, international_benchmarks, sections)
+    finally:
+        generator.cleanup()
+
+def show_full_report(df, language):
+    """
+    Displays the export of one Word report combining all analyses.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        language (str): Selected language for UI elements (en/fr)
+    """
+    t = translations[language]
+
+    available_egra = [col for col in egra_columns if col in df.columns]
+    available_egma = [col for col in egma_columns if col in df.columns]
+
+    if not available_egra and not available_egma:
+        st.error(t.get("no_assessment_columns", "No assessment columns found in the data."))
+        return
+
+    st.write(t.get(
+        "full_report_intro",
+        "Generate one Word report with every analysis. Statistics are computed once for all "
+        "sections and the figures are rendered in parallel."
+    ))
+
+    st.subheader(t.get("select_variables", "📊 Select Variables"))
+    col1, col2 = st.columns(2)
+
+    with col1:
+        selected_egra = st.multiselect(
+            t.get("egra_variables", "EGRA Variables:"),
+            options=available_egra,
+            default=available_egra,
+            format_func=lambda x: t["columns_of_interest"].get(x, x),
+            key="full_report_egra"
+        )
+
+    with col2:
+        selected_egma = st.multiselect(
+            t.get("egma_variables", "EGMA Variables:"),
+            options=available_egma,
+            default=available_egma,
+            format_func=lambda x: t["columns_of_interest"].get(x, x),
+            key="full_report_egma"
+        )
+
+    selected_columns = selected_egra + selected_egma
+    if not selected_columns:
+        st.warning(t.get("warning_select_variable", "Please select at least one variable to analyze."))
+        return
+
+    sections = st.multiselect(
+        t.get("full_report_sections", "Sections:"),
+        options=list(FULL_REPORT_SECTIONS),
+        default=list(FULL_REPORT_SECTIONS),
+        format_func=lambda name: t.get(*FULL_REPORT_SECTIONS[name]),
+        key="full_report_sections"
+    )
+    if not sections:
+        return
+
+    report_export_button(
+        t.get("export_full_report", "📑 Generate full report"),
+        "full_report",
+        build_full_report,
+        "full_report.docx",
+        t,
+        args=(df, selected_columns, sections, language)
+    )
+
+    # The analysis tables alone, as one Excel sheet per analysis
+    report_export_button(
+        t.get("export_workbook", "📊 Export tables (Excel)"),
+        "analysis_workbook",
+        analysis_workbook_bytes,
+        "analysis_tables.xlsx",
+        t,
+        args=(df, selected_columns, t, international_benchmarks),
+        mime=XLSX_MIME
+    )
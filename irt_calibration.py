@@ -0,0 +1,343 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+from config import translations
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint
+from chart_bundle import register_chart
+
+# Fitted calibrations keyed by data fingerprint, item set and model settings
+_IRT_CACHE = LRUCache(max_entries=16)
+
+IRT_MODELS = ("rasch", "2pl")
+
+def find_binary_items(df, min_responses=10):
+    """
+    Finds the item-level columns scored 0/1 (correct/incorrect).
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        min_responses (int): Minimum number of non-missing responses per item
+
+    Returns:
+        list: Names of the dichotomous item columns
+    """
+    binary_items = []
+    for col in df.select_dtypes(include=[np.number, "bool"]).columns:
+        values = df[col].dropna()
+        if len(values) >= min_responses and values.isin([0, 1]).all() and values.nunique() == 2:
+            binary_items.append(col)
+    return binary_items
+
+# Pupils per block in the E-step (bounds memory and spreads work over threads)
+E_STEP_BLOCK_SIZE = 20000
+
+def _posterior(scored, unanswered, log_p, log_q, log_prior):
+    """
+    Posterior weights of the quadrature nodes for a block of pupils.
+
+    Returns:
+        tuple: (posterior (n x Q), marginal log-likelihood of each pupil)
+    """
+    log_post = scored @ log_p + unanswered @ log_q + log_prior
+    peak = log_post.max(axis=1)
+    np.exp(log_post - peak[:, None], out=log_post)
+    totals = log_post.sum(axis=1)
+    log_post /= totals[:, None]
+    return log_post, peak + np.log(totals)
+
+def _e_step(blocks, log_p, log_q, log_prior, executor):
+    """
+    Expected numbers of correct and total responses per item and node, summed
+    over all blocks of pupils, with the marginal log-likelihood.
+    """
+    def _block_counts(block):
+        scored, unanswered = block
+        posterior, log_marginal = _posterior(scored, unanswered, log_p, log_q, log_prior)
+        correct = scored.T @ posterior
+        return correct, correct + unanswered.T @ posterior, log_marginal.sum()
+
+    results = list(executor.map(_block_counts, blocks))
+    correct = sum(r[0] for r in results)
+    total = sum(r[1] for r in results)
+    return correct, total, sum(r[2] for r in results)
+
+def _m_step(correct, total, nodes, slopes, intercepts, model, n_newton=5):
+    """
+    Maximizes the expected complete-data log-likelihood for all items at once.
+
+    The item response function is P = 1 / (1 + exp(-(a * theta + c))), with the
+    intercept c = -a * b. For the 2PL model, a 2x2 Newton step is solved per item
+    in closed form; for the Rasch model the slope is shared by all items.
+
+    Args:
+        correct (numpy.ndarray): Expected correct responses per item and node (J x Q)
+        total (numpy.ndarray): Expected responses per item and node (J x Q)
+        nodes (numpy.ndarray): Quadrature nodes (Q)
+        slopes (numpy.ndarray): Current slopes (J)
+        intercepts (numpy.ndarray): Current intercepts (J)
+        model (str): "rasch" or "2pl"
+        n_newton (int): Number of Newton iterations
+
+    Returns:
+        tuple: (slopes, intercepts)
+    """
+    for _ in range(n_newton):
+        logits = slopes[:, None] * nodes[None, :] + intercepts[:, None]
+        prob = 1 / (1 + np.exp(-logits))
+        residual = correct - total * prob
+        weight = total * prob * (1 - prob) + 1e-10
+
+        grad_c = residual.sum(axis=1)
+        grad_a = (residual * nodes).sum(axis=1)
+        h_cc = weight.sum(axis=1)
+        h_ac = (weight * nodes).sum(axis=1)
+        h_aa = (weight * nodes ** 2).sum(axis=1)
+
+        if model == "2pl":
+            det = h_aa * h_cc - h_ac ** 2
+            det = np.where(det > 1e-10, det, 1e-10)
+            step_a = (h_cc * grad_a - h_ac * grad_c) / det
+            step_c = (h_aa * grad_c - h_ac * grad_a) / det
+            slopes = np.clip(slopes + np.clip(step_a, -1, 1), 0.05, 6)
+            intercepts = intercepts + np.clip(step_c, -2, 2)
+        else:
+            intercepts = intercepts + np.clip(grad_c / h_cc, -2, 2)
+            # Shared slope: Schur complement of the block Hessian
+            h_shared = h_aa.sum() - (h_ac ** 2 / h_cc).sum()
+            grad_shared = grad_a.sum()
+            step_a = grad_shared / h_shared if h_shared > 1e-10 else 0.0
+            slopes = np.full_like(slopes, np.clip(slopes[0] + np.clip(step_a, -1, 1), 0.05, 6))
+
+    return slopes, intercepts
+
+def fit_irt(responses, model="2pl", n_quadrature=31, max_iter=500, tol=1e-5, n_workers=None):
+    """
+    Calibrates a Rasch or 2PL model by marginal maximum likelihood (EM algorithm
+    with Gauss-Hermite quadrature, abilities assumed standard normal).
+
+    Every EM step is expressed as matrix products over blocks of pupils that are
+    processed concurrently on a thread pool, so the calibration scales to
+    hundreds of thousands of pupils. Missing responses are ignored (not scored
+    as wrong).
+
+    For the Rasch model the slope is shared by all items; difficulties and
+    abilities are then reported on the logit scale (discrimination fixed at 1 and
+    the ability standard deviation estimated).
+
+    Args:
+        responses (numpy.ndarray): Pupils x items matrix of 0/1 values, NaN if missing
+        model (str): "rasch" or "2pl"
+        n_quadrature (int): Number of quadrature nodes
+        max_iter (int): Maximum number of EM iterations
+        tol (float): Convergence tolerance on the parameters
+        n_workers (int, optional): Number of worker threads (default: CPU count)
+
+    Returns:
+        dict: difficulty, discrimination, ability and ability_se arrays, plus
+            log_likelihood, n_iter, converged, ability_sd and model
+    """
+    if model not in IRT_MODELS:
+        raise ValueError(f"Unknown IRT model '{model}', expected one of {IRT_MODELS}")
+
+    responses = np.asarray(responses, dtype=float)
+    observed = ~np.isnan(responses)
+    scored = np.where(observed, responses, 0.0)
+    unanswered = observed - scored
+    blocks = [
+        (scored[start:start + E_STEP_BLOCK_SIZE], unanswered[start:start + E_STEP_BLOCK_SIZE])
+        for start in range(0, len(scored), E_STEP_BLOCK_SIZE)
+    ]
+
+    # Quadrature on the standard normal distribution
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n_quadrature)
+    log_prior = np.log(weights / weights.sum())
+
+    # Starting values from the proportion correct
+    p_correct = np.clip(scored.sum(axis=0) / np.maximum(observed.sum(axis=0), 1), 0.01, 0.99)
+    slopes = np.ones(responses.shape[1])
+    intercepts = np.log(p_correct / (1 - p_correct))
+
+    converged = False
+    log_likelihood = -np.inf
+
+    with ThreadPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+        for n_iter in range(1, max_iter + 1):
+            # E-step: expected counts per item and node (J x Q)
+            logits = slopes[:, None] * nodes[None, :] + intercepts[:, None]
+            correct, total, log_likelihood = _e_step(
+                blocks, -np.logaddexp(0, -logits), -np.logaddexp(0, logits), log_prior, executor
+            )
+
+            # M-step
+            new_slopes, new_intercepts = _m_step(correct, total, nodes, slopes, intercepts, model)
+            change = max(np.abs(new_slopes - slopes).max(), np.abs(new_intercepts - intercepts).max())
+            slopes, intercepts = new_slopes, new_intercepts
+
+            if change < tol:
+                converged = True
+                break
+
+    # Expected a posteriori abilities with the final parameters
+    logits = slopes[:, None] * nodes[None, :] + intercepts[:, None]
+    posterior, _ = _posterior(scored, unanswered, -np.logaddexp(0, -logits), -np.logaddexp(0, logits), log_prior)
+    ability = posterior @ nodes
+    ability_se = np.sqrt(np.maximum(posterior @ nodes ** 2 - ability ** 2, 0))
+
+    difficulty = -intercepts / slopes
+    discrimination = slopes.copy()
+    ability_sd = 1.0
+
+    if model == "rasch":
+        # Move to the logit scale: discrimination 1, ability SD = shared slope
+        ability_sd = float(slopes[0])
+        difficulty = difficulty * ability_sd
+        ability = ability * ability_sd
+        ability_se = ability_se * ability_sd
+        discrimination = np.ones_like(slopes)
+
+    return {
+        "model": model,
+        "difficulty": difficulty,
+        "discrimination": discrimination,
+        "ability": ability,
+        "ability_se": ability_se,
+        "ability_sd": ability_sd,
+        "log_likelihood": float(log_likelihood),
+        "n_iter": n_iter,
+        "converged": converged
+    }
+
+def calibrate_items(df, items, model="2pl", n_quadrature=31, max_iter=500, tol=1e-5):
+    """
+    Calibrates item-level data and returns item and person parameters as DataFrames.
+
+    Fitted parameters are cached per dataset content, item set and model settings,
+    so re-running the page does not refit the model.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        items (list): Dichotomous item columns
+        model (str): "rasch" or "2pl"
+        n_quadrature (int): Number of quadrature nodes
+        max_iter (int): Maximum number of EM iterations
+        tol (float): Convergence tolerance
+
+    Returns:
+        dict: "items" (DataFrame: item, n_responses, p_correct, difficulty,
+            discrimination), "persons" (DataFrame indexed like df: ability,
+            ability_se, n_answered) and the fit summary
+    """
+    items = list(items)
+    key = make_cache_key(
+        "irt", dataframe_fingerprint(df, items), items, model, n_quadrature, max_iter, tol
+    )
+
+    def _compute():
+        responses = df[items].to_numpy(dtype=float)
+        answered = ~np.isnan(responses)
+        keep = answered.any(axis=1)
+
+        fit = fit_irt(responses[keep], model=model, n_quadrature=n_quadrature, max_iter=max_iter, tol=tol)
+
+        item_params = pd.DataFrame({
+            "item": items,
+            "n_responses": answered.sum(axis=0),
+            "p_correct": np.nanmean(responses, axis=0),
+            "difficulty": fit["difficulty"],
+            "discrimination": fit["discrimination"]
+        })
+
+        persons = pd.DataFrame(
+            {"ability": np.nan, "ability_se": np.nan, "n_answered": answered.sum(axis=1)},
+            index=df.index
+        )
+        persons.loc[keep, "ability"] = fit["ability"]
+        persons.loc[keep, "ability_se"] = fit["ability_se"]
+
+        summary = {k: fit[k] for k in ("model", "log_likelihood", "n_iter", "converged", "ability_sd")}
+        return {"items": item_params, "persons": persons, **summary}
+
+    return _IRT_CACHE.get_or_compute(key, _compute)
+
+def show_irt_calibration(df, language):
+    """
+    Displays an IRT calibration (Rasch or 2PL) of the item-level columns.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        language (str): Selected language for UI elements
+    """
+    t = translations[language]  # Get translations for selected language
+
+    st.subheader(t.get("irt_title", "🧮 Item Calibration (IRT)"))
+
+    binary_items = find_binary_items(df)
+
+    if len(binary_items) < 3:
+        st.info(t.get(
+            "irt_no_items",
+            "IRT calibration needs at least three item-level columns scored 0/1 (incorrect/correct)."
+        ))
+        return
+
+    selected_items = st.multiselect(
+        t.get("irt_select_items", "Select the items to calibrate:"),
+        options=binary_items,
+        default=binary_items,
+        key="irt_items"
+    )
+
+    model = st.radio(
+        t.get("irt_model", "Model:"),
+        options=list(IRT_MODELS),
+        format_func=lambda x: "Rasch (1PL)" if x == "rasch" else "2PL",
+        horizontal=True,
+        key="irt_model"
+    )
+
+    if len(selected_items) < 3:
+        st.warning(t.get("irt_min_items", "Select at least three items."))
+        return
+
+    with st.spinner(t.get("irt_fitting", "Calibrating items...")):
+        result = calibrate_items(df, selected_items, model=model)
+
+    if not result["converged"]:
+        st.warning(t.get("irt_not_converged", "The calibration did not fully converge; interpret the estimates with caution."))
+
+    item_params = result["items"].sort_values("difficulty").copy()
+    item_params[["p_correct", "difficulty", "discrimination"]] = item_params[
+        ["p_correct", "difficulty", "discrimination"]
+    ].round(3)
+    item_params.columns = [
+        t.get("item", "Item"),
+        t.get("n_responses", "Responses"),
+        t.get("p_correct", "Proportion Correct"),
+        t.get("difficulty", "Difficulty"),
+        t.get("discrimination", "Discrimination")
+    ]
+    st.dataframe(item_params, use_container_width=True, hide_index=True)
+
+    abilities = result["persons"]["ability"].dropna()
+    fig = px.histogram(
+        abilities,
+        x="ability",
+        nbins=40,
+        labels={"ability": t.get("ability", "Ability (logits)")},
+        title=t.get("irt_ability_distribution", "Distribution of Pupil Ability Estimates")
+    )
+    fig.update_layout(yaxis_title=t.get("number_of_students", "Number of students"), height=400)
+    register_chart("analyse6", "irt_ability_distribution", fig)
+    st.plotly_chart(fig, use_container_width=True)
+
+    csv = result["persons"].to_csv().encode('utf-8-sig')
+    st.download_button(
+        t.get("irt_export_abilities", "📥 Download ability estimates (CSV)"),
+        csv,
+        "irt_abilities.csv",
+        "text/csv",
+        key='download-irt-abilities'
+    )
@@ -1,7 +1,28 @@
 # language_utils.py
+import threading
+from contextlib import contextmanager
 import streamlit as st
 from config import language_manager, AVAILABLE_LANGUAGES, translations
 
+# Language of the report being generated in this thread (report threads have
+# no access to the session state)
+_thread_language = threading.local()
+
+@contextmanager
+def report_language(language):
+    """
+    Use a language for the translations made in this thread.
+    
+    Args:
+        language (str): Language code
+    """
+    previous = getattr(_thread_language, "language", None)
+    _thread_language.language = language
+    try:
+        yield
+    finally:
+        _thread_language.language = previous
+
 def setup_language_selector():
     """
     Set up a language selector in the Streamlit sidebar.
@@ -54,8 +75,7 @@ def get_text(key, default=""):
     Returns:
         str: Translated text
     """
-    # Get language from session state or use default
-    language = st.session_state.get('language', language_manager.current_language)
+    language = get_current_language()
     
     # Try to get translation from translations dictionary directly
     if isinstance(key, dict):
@@ -117,6 +137,9 @@ def get_current_language():
     Returns:
         str: Current language code
     """
+    language = getattr(_thread_language, "language", None)
+    if language is not None:
+        return language
     return st.session_state.get('language', language_manager.current_language)
 
 def translate_column_names(columns, language=None):
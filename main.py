@@ -27,6 +27,12 @@ from analyse7 import show_performance_school
 from analyse10 import show_gender_effect
 from analyse12 import show_international_comparison
 from analyse13 import show_language_comparison
+from full_report import show_full_report
+from figure_export import show_render_stats
+from viz_wrapper import show_figure_cache_stats
+from report_jobs import show_report_cache_stats
+from cache_utils import dataframe_fingerprint
+from chart_bundle import reset_charts, track_dataset, show_chart_bundle_export
 
 # Set page configuration
 st.set_page_config(
@@ -220,6 +226,25 @@ def show_template_section():
     st.divider()
 
 
+def _dataset_fingerprint(df, load_options):
+    """
+    Get the content fingerprint of the loaded data, computed once per upload
+    and loading options.
+
+    Args:
+        df (pandas.DataFrame): The loaded data
+        load_options (list): Uploaded file id and options used to load it
+
+    Returns:
+        str: Fingerprint of df
+    """
+    cached = st.session_state.get("dataset_fingerprint_cache")
+    if cached is None or cached[0] != load_options:
+        cached = (load_options, dataframe_fingerprint(df))
+        st.session_state["dataset_fingerprint_cache"] = cached
+    return cached[1]
+
+
 def load_data():
     """
     Loads data from various file formats (Excel, JSON, CSV, Stata DTA).
@@ -262,6 +287,8 @@ def load_data():
         with exp:
             # Determine file extension
             ext = uploaded_file.name.split('.')[-1].lower()
+            # Everything that determines the loaded data (identifies the dataset)
+            load_options = [uploaded_file.file_id]
 
             # Loading spinner
             with st.spinner(t["loading_data"]):
@@ -273,6 +300,7 @@ def load_data():
                         else st.selectbox(t["select_sheet"], xls.sheet_names)
                     )
                     df = pd.read_excel(uploaded_file, sheet_name=sheet)
+                    load_options.append(sheet)
 
                 elif ext == "json":
                     try:
@@ -289,6 +317,7 @@ def load_data():
                     with col2:
                         separator = st.selectbox(t["select_separator"], separators)
                     df = pd.read_csv(uploaded_file, encoding=encoding, sep=separator, engine="python")
+                    load_options.extend([encoding, separator])
 
                 else:  # dta
                     df = pd.read_stata(uploaded_file)
@@ -318,8 +347,15 @@ def load_data():
                 st.dataframe(missing_report)
 
                 if st.checkbox(t.get("visualize_missing", "Visualiser les valeurs manquantes")):
-                    missing_fig = validator.plot_missing_values(df)
-                    st.pyplot(missing_fig)
+                    group_col = None
+                    if "school" in df.columns:
+                        by_school = st.checkbox(t.get("missing_by_school", "Par école"))
+                        group_col = "school" if by_school else None
+                    missing_fig = validator.plot_missing_values(df, group_col=group_col)
+                    st.plotly_chart(missing_fig, use_container_width=True)
+                    patterns_fig = validator.plot_missing_patterns(df)
+                    if patterns_fig is not None:
+                        st.plotly_chart(patterns_fig, use_container_width=True)
 
                 if st.checkbox(t.get("handle_missing", "Gérer les valeurs manquantes")):
                     method = st.selectbox(
@@ -327,8 +363,11 @@ def load_data():
                         ["drop_rows", "fill_mean", "fill_median", "fill_mode"]
                     )
                     df = validator.handle_missing_values(df, method=method)
+                    load_options.append(method)
                     st.success(t.get("missing_handled", "Valeurs manquantes traitées avec succès"))
 
+        st.session_state["dataset_fingerprint"] = _dataset_fingerprint(df, load_options)
+
         return df
 
     except Exception as e:
@@ -362,7 +401,8 @@ def main():
         t["analysis7_title"]: show_performance_school,
         t["analysis10_title"]: show_gender_effect,
         t["analysis12_title"]: show_international_comparison,
-        t["analysis13_title"]: show_language_comparison
+        t["analysis13_title"]: show_language_comparison,
+        t.get("full_report_title", "📑 Full report"): show_full_report
     }
     
     # Analysis selection
@@ -388,9 +428,22 @@ def main():
         # Get the selected analysis function
         selected_function = ANALYSES[analysis]
         
+        # Charts registered with another dataset are dropped, and charts of the
+        # previous run of this analysis are replaced by the current ones
+        track_dataset(st.session_state["dataset_fingerprint"])
+        reset_charts(selected_function.__module__)
+        
         # Wrap the analysis function with error handling
         error_handler = ErrorHandler(language=selected_language)
         error_handler.wrap_analysis_function(selected_function, df, selected_language)
+        
+        # Download all charts registered by the analyses visited with this dataset
+        show_chart_bundle_export(t)
+        
+        # Figure export timings (shown once figures have been rendered)
+        show_render_stats(t)
+        show_figure_cache_stats(t)
+        show_report_cache_stats(t)
 
         # ========== FOOTER FIXE (AJOUTER ICI) ==========
     from credits import show_credits_fixed_footer
@@ -0,0 +1,294 @@
+# markdown_docx.py
+# Markdown to Word converter for generated text (AI interpretations): the text
+# is parsed in one pass into paragraph XML with formatted runs, which is
+# parsed once and inserted into the document, instead of one python-docx call
+# per line or run
+
+import re
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from docx_tables import add_bulk_table, run_content
+
+# Block syntax
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_SETEXT_H1 = re.compile(r"^=+\s*$")
+_SETEXT_H2 = re.compile(r"^-+\s*$")
+_RULE = re.compile(r"^([-*_])(?:\s*\1){2,}\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_QUOTE = re.compile(r"^\s*>\s?(.*)$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+# Inline syntax, nested spans are converted recursively
+_INLINE = re.compile(
+    r"(?P<code_mark>`+)(?P<code>.+?)(?P=code_mark)"
+    r"|(?P<strong_em_mark>\*\*\*|___)(?P<strong_em>.+?)(?P=strong_em_mark)"
+    r"|(?P<strong_mark>\*\*|__)(?P<strong>.+?)(?P=strong_mark)"
+    r"|(?<![\w\\])(?P<em_mark>[*_])(?![\s*_])(?P<em>.+?)(?<![\s\\])(?P=em_mark)(?!\w)"
+    r"|~~(?P<strike>.+?)~~"
+    r"|\[(?P<link>[^\]]+)\]\([^)]*\)"
+    r"|\\(?P<escaped>[\\`*_{}\[\]()#+\-.!~|>])"
+)
+
+# Nesting levels of the list styles of the default template
+_LIST_LEVELS = 3
+# Indentation (in spaces) of one list nesting level
+_LIST_INDENT = 2
+
+_CODE_FONT = '<w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New"/>'
+_RULE_PARAGRAPH = (
+    '<w:p><w:pPr><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/>'
+    '</w:pBdr></w:pPr></w:p>'
+)
+
+
+def _inline_runs(text, bold=False, italic=False, strike=False, code=False):
+    """
+    Split Markdown inline text into formatted runs.
+
+    Args:
+        text (str): Inline Markdown
+        bold, italic, strike, code (bool): Formatting inherited from enclosing spans
+
+    Returns:
+        list: (text, bold, italic, strike, code) tuples
+    """
+    runs = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            runs.append((text[position:match.start()], bold, italic, strike, code))
+        position = match.end()
+
+        if match.group("code") is not None:
+            runs.append((match.group("code"), bold, italic, strike, True))
+        elif match.group("strong_em") is not None:
+            runs.extend(_inline_runs(match.group("strong_em"), True, True, strike, code))
+        elif match.group("strong") is not None:
+            runs.extend(_inline_runs(match.group("strong"), True, italic, strike, code))
+        elif match.group("em") is not None:
+            runs.extend(_inline_runs(match.group("em"), bold, True, strike, code))
+        elif match.group("strike") is not None:
+            runs.extend(_inline_runs(match.group("strike"), bold, italic, True, code))
+        elif match.group("link") is not None:
+            runs.extend(_inline_runs(match.group("link"), bold, italic, strike, code))
+        else:
+            runs.append((match.group("escaped"), bold, italic, strike, code))
+
+    if position < len(text):
+        runs.append((text[position:], bold, italic, strike, code))
+    return runs
+
+
+def _plain_text(text):
+    """Text of inline Markdown without its formatting markers."""
+    return "".join(run[0] for run in _inline_runs(text))
+
+
+def _runs_xml(text, code=False):
+    """
+    Convert inline Markdown to w:r elements.
+
+    Args:
+        text (str): Inline Markdown ("\\n" for line breaks)
+        code (bool): Whether the whole text is code (written verbatim)
+
+    Returns:
+        str: Runs XML
+    """
+    runs = [(text, False, False, False, True)] if code else _inline_runs(text)
+    parts = []
+    for run_text, bold, italic, strike, is_code in runs:
+        if not run_text:
+            continue
+        properties = (
+            (_CODE_FONT if is_code else "")
+            + ("<w:b/>" if bold else "")
+            + ("<w:i/>" if italic else "")
+            + ("<w:strike/>" if strike else "")
+        )
+        run_properties = f"<w:rPr>{properties}</w:rPr>" if properties else ""
+        parts.append(f"<w:r>{run_properties}{run_content(run_text)}</w:r>")
+    return "".join(parts)
+
+
+def _paragraph_xml(text, style_id=None, code=False):
+    """Build a w:p element with an optional paragraph style."""
+    properties = f'<w:pPr><w:pStyle w:val="{escape(style_id)}"/></w:pPr>' if style_id else ""
+    return f"<w:p>{properties}{_runs_xml(text, code)}</w:p>"
+
+
+def _split_row(line):
+    """Split a Markdown table row into its cell texts."""
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip() for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def _join_lines(lines):
+    """Join the lines of a paragraph, keeping Markdown hard line breaks."""
+    text = ""
+    for index, line in enumerate(lines):
+        hard_break = line.endswith("  ") or line.endswith("\\")
+        line = line.strip()
+        if line.endswith("\\"):
+            line = line[:-1]
+        text += line
+        if index < len(lines) - 1:
+            text += "\n" if hard_break else " "
+    return text
+
+
+def add_markdown(doc, text, heading_offset=0, table_style="Table Grid"):
+    """
+    Add Markdown text to a document.
+
+    Handles ATX and setext headings, paragraphs (with hard line breaks),
+    bullet and numbered lists (nested up to three levels), block quotes,
+    fenced code, horizontal rules and pipe tables, and inline bold, italic,
+    strikethrough, code and links (written as their text). Paragraphs are
+    generated as one XML fragment, parsed once and inserted at the end of the
+    document; tables are written with docx_tables.add_bulk_table.
+
+    Args:
+        doc (Document): python-docx document
+        text (str): Markdown text
+        heading_offset (int): Added to the heading levels (1 puts "#" headings
+            at level 2)
+        table_style (str, optional): Style of the tables
+
+    Returns:
+        None
+    """
+    style_ids = {}
+
+    def _style(name):
+        if name not in style_ids:
+            try:
+                style_ids[name] = doc.styles[name].style_id
+            except KeyError:
+                style_ids[name] = None
+        return style_ids[name]
+
+    body = doc.element.body
+    blocks = []
+
+    def _flush_blocks():
+        # Insert the paragraphs generated so far, before the section properties
+        if not blocks:
+            return
+        fragment = parse_xml(f"<w:body {nsdecls('w')}>{''.join(blocks)}</w:body>")
+        sect_pr = body.sectPr
+        for element in list(fragment):
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                body.append(element)
+        blocks.clear()
+
+    # Paragraph being collected: (style name, lines)
+    current = None
+
+    def _end_paragraph():
+        nonlocal current
+        if current is not None:
+            style_name, lines = current
+            blocks.append(_paragraph_xml(_join_lines(lines), _style(style_name) if style_name else None))
+            current = None
+
+    def _heading(title, level):
+        level = min(max(level + heading_offset, 1), 9)
+        blocks.append(_paragraph_xml(title, _style(f"Heading {level}")))
+
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        index += 1
+
+        # Fenced code block, written verbatim in a monospace font
+        fence = _FENCE.match(line)
+        if fence:
+            _end_paragraph()
+            code_lines = []
+            while index < len(lines) and not lines[index].strip().startswith(fence.group(1)):
+                code_lines.append(lines[index])
+                index += 1
+            index += 1
+            blocks.append(_paragraph_xml("\n".join(code_lines), code=True))
+            continue
+
+        if not stripped:
+            _end_paragraph()
+            continue
+
+        # Pipe table: a row followed by a separator row
+        if "|" in stripped and index < len(lines) and _TABLE_SEPARATOR.match(lines[index]) \
+                and "-" in lines[index]:
+            _end_paragraph()
+            headers = [_plain_text(cell) for cell in _split_row(line)]
+            index += 1
+            rows = []
+            while index < len(lines) and "|" in lines[index] and lines[index].strip():
+                cells = [_plain_text(cell) for cell in _split_row(lines[index])]
+                cells = (cells + [""] * len(headers))[:len(headers)]
+                rows.append(cells)
+                index += 1
+            _flush_blocks()
+            add_bulk_table(doc, rows, headers=headers, style=table_style if _style(table_style) else None)
+            continue
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            _end_paragraph()
+            _heading(heading.group(2), len(heading.group(1)))
+            continue
+
+        # Setext heading: underlined paragraph
+        if current is not None and current[0] is None:
+            if _SETEXT_H1.match(stripped):
+                _heading(_join_lines(current[1]), 1)
+                current = None
+                continue
+            if _SETEXT_H2.match(stripped):
+                _heading(_join_lines(current[1]), 2)
+                current = None
+                continue
+
+        if _RULE.match(stripped):
+            _end_paragraph()
+            blocks.append(_RULE_PARAGRAPH)
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item:
+            _end_paragraph()
+            level = min(len(item.group(1).expandtabs(4)) // _LIST_INDENT, _LIST_LEVELS - 1)
+            style_name = "List Bullet" if item.group(2)[0] in "-*+" else "List Number"
+            if level > 0:
+                style_name = f"{style_name} {level + 1}"
+            current = (style_name, [item.group(3)])
+            continue
+
+        quote = _QUOTE.match(line)
+        if quote:
+            if current is None or current[0] != "Quote":
+                _end_paragraph()
+                current = ("Quote", [])
+            current[1].append(quote.group(1))
+            continue
+
+        # Text line: continues the current paragraph, list item or quote
+        if current is None:
+            current = (None, [])
+        current[1].append(line)
+
+    _end_paragraph()
+    _flush_blocks()
@@ -0,0 +1,172 @@
+# report_aggregates.py
+# Aggregates shared by the report generators, computed once per dataset and
+# reused by every section (and every later export) of the same data
+
+import pandas as pd
+
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint
+
+# Aggregates keyed by data fingerprint, aggregate name and parameters
+_AGGREGATES_CACHE = LRUCache(max_entries=256)
+
+class ReportAggregates:
+    """
+    Cached aggregates of one dataset.
+
+    The dataset is fingerprinted once; each aggregate is computed on first use
+    and then served from a process-wide cache. Returned objects are shared and
+    must not be modified in place.
+    """
+
+    def __init__(self, df):
+        """
+        Initialize the aggregates of a dataset.
+
+        Args:
+            df (pandas.DataFrame): The data to report on
+        """
+        self.df = df
+        self.fingerprint = dataframe_fingerprint(df)
+
+    def _get(self, name, compute, *params):
+        key = make_cache_key("report_aggregates", self.fingerprint, name, *params)
+        return _AGGREGATES_CACHE.get_or_compute(key, compute)
+
+    def describe(self, columns):
+        """
+        Descriptive statistics of the columns (count, mean, sd, quartiles, P90).
+
+        Args:
+            columns (list): Columns to describe
+
+        Returns:
+            pandas.DataFrame: Statistics (rows) by column, rounded to 2 decimals
+        """
+        columns = list(columns)
+        return self._get(
+            "describe",
+            lambda: self.df[columns].describe(percentiles=[.25, .5, .75, .9]).round(2),
+            columns
+        )
+
+    def means(self, columns):
+        """
+        Means of the columns.
+
+        Args:
+            columns (list): Columns to average
+
+        Returns:
+            pandas.Series: Mean by column
+        """
+        columns = list(columns)
+        return self._get("means", lambda: self.df[columns].mean(), columns)
+
+    def zero_counts(self, columns):
+        """
+        Number of zero scores of the columns.
+
+        Args:
+            columns (list): Columns to count
+
+        Returns:
+            pandas.Series: Count of zeros by column
+        """
+        columns = list(columns)
+        return self._get("zero_counts", lambda: (self.df[columns] == 0).sum(), columns)
+
+    def correlation(self, columns, method="pearson"):
+        """
+        Correlation matrix of the columns.
+
+        Args:
+            columns (list): Columns to correlate
+            method (str): Correlation method
+
+        Returns:
+            pandas.DataFrame: Correlation matrix
+        """
+        columns = list(columns)
+        return self._get("correlation", lambda: self.df[columns].corr(method=method), columns, method)
+
+    def group_means(self, group_col, columns):
+        """
+        Means of the columns by group.
+
+        Args:
+            group_col (str): Grouping column
+            columns (list): Columns to average
+
+        Returns:
+            pandas.DataFrame: One row per group
+        """
+        columns = list(columns)
+        return self._get(
+            "group_means",
+            lambda: self.df.groupby(group_col)[columns].mean(),
+            group_col, columns
+        )
+
+    def group_sizes(self, group_col):
+        """
+        Number of rows by group.
+
+        Args:
+            group_col (str): Grouping column
+
+        Returns:
+            pandas.Series: Size by group
+        """
+        return self._get("group_sizes", lambda: self.df.groupby(group_col).size(), group_col)
+
+    def mann_whitney(self, group_col, columns, first, second):
+        """
+        Mann-Whitney U test of each column between two groups.
+        
+        Args:
+            group_col (str): Grouping column
+            columns (list): Columns to test
+            first, second: Values of group_col identifying the two groups
+            
+        Returns:
+            pandas.DataFrame: One row per column (index) with first_mean,
+                second_mean, u_statistic and p_value (NaN when a group is empty)
+        """
+        columns = list(columns)
+        
+        def _compute():
+            from scipy import stats
+            
+            first_rows = self.df[self.df[group_col] == first]
+            second_rows = self.df[self.df[group_col] == second]
+            results = {}
+            for col in columns:
+                a = first_rows[col].dropna()
+                b = second_rows[col].dropna()
+                u_stat, p_value = float("nan"), float("nan")
+                if len(a) > 0 and len(b) > 0:
+                    u_stat, p_value = stats.mannwhitneyu(a, b, alternative="two-sided")
+                results[col] = {
+                    "first_mean": a.mean(),
+                    "second_mean": b.mean(),
+                    "u_statistic": u_stat,
+                    "p_value": p_value
+                }
+            return pd.DataFrame.from_dict(results, orient="index")
+        
+        return self._get("mann_whitney", _compute, group_col, columns, first, second)
+    
+    def cronbach_alpha(self, columns):
+        """
+        Cronbach's Alpha of the columns taken as items.
+        
+        Args:
+            columns (list): Item columns
+            
+        Returns:
+            float or None: Alpha, None when it cannot be computed
+        """
+        from analyse6 import cronbach_alpha
+        
+        columns = list(columns)
+        return self._get("cronbach_alpha", lambda: cronbach_alpha(self.df[columns]), columns)
@@ -2,8 +2,25 @@
 # Base class for report generators
 
 import os
-import streamlit as st
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from language_utils import get_text, get_current_language
+from report.report_aggregates import ReportAggregates
+from report_jobs import job_context, run_in_job_context
+
+# Threads computing the per-variable statistics and figures of the reports
+SECTION_WORKERS = min(4, os.cpu_count() or 1)
+
+_section_executor = None
+_section_executor_lock = threading.Lock()
+
+def _get_section_executor():
+    """Get the thread pool shared by the report generators (created on first use)."""
+    global _section_executor
+    with _section_executor_lock:
+        if _section_executor is None:
+            _section_executor = ThreadPoolExecutor(max_workers=SECTION_WORKERS, thread_name_prefix="report-section")
+        return _section_executor
 
 class BaseReportGenerator:
     """
@@ -21,6 +38,10 @@ class BaseReportGenerator:
         self.word_gen = word_generator
         self.viz = visualization
         self.language = get_current_language()
+        # Set by the full report so that all sections share one set of aggregates
+        self.aggregates = None
+        # When True, figures are queued for rendering and inserted when the report is saved
+        self.defer_figures = False
     
     def update_word_generator(self, word_generator):
         """
@@ -32,7 +53,7 @@ class BaseReportGenerator:
         self.word_gen = word_generator
         self.language = get_current_language()
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Base method for creating reports. To be implemented by subclasses.
         
@@ -40,32 +61,75 @@ class BaseReportGenerator:
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
         """
         raise NotImplementedError("Subclasses must implement create_report method")
     
-    def _save_and_get_bytes(self, doc, temp_dir, filename):
+    def _aggregates(self, df):
+        """
+        Get the cached aggregates of the data.
+        
+        Args:
+            df: DataFrame with data
+            
+        Returns:
+            ReportAggregates: Shared aggregates when they describe df, else new ones
+        """
+        if self.aggregates is not None and self.aggregates.df is df:
+            return self.aggregates
+        return ReportAggregates(df)
+    
+    def _map_columns(self, compute, columns):
+        """
+        Compute the per-variable parts of a report concurrently.
+        
+        compute runs in worker threads that report to the caller's job and
+        translate to its language; the results come back in column order, for the document to be filled
+        serially.
+        
+        Args:
+            compute: Function of one column returning its statistics and figures
+            columns: Columns to process
+            
+        Returns:
+            list: compute(column) for each column, in order
+        """
+        columns = list(columns)
+        if len(columns) < 2:
+            return [compute(column) for column in columns]
+        
+        context = job_context()
+        executor = _get_section_executor()
+        futures = [executor.submit(run_in_job_context, context, compute, column) for column in columns]
+        return [future.result() for future in futures]
+    
+    def _figure_image(self, fig, filename):
+        """
+        Render a figure for the report.
+        
+        Args:
+            fig: Plotly figure
+            filename: Image name (used in error messages)
+            
+        Returns:
+            bytes or Future: PNG image, or a pending render when figures are deferred
+        """
+        return self.viz.save_figure_for_word(fig, filename, wait=not self.defer_figures)
+    
+    def _save_and_get_bytes(self, doc, filename):
         """
-        Save document to temporary file and read it as bytes.
+        Serialise the document to bytes in memory.
         
         Args:
             doc: Document to save
-            temp_dir: Directory for temporary files
             filename: Filename to use
             
         Returns:
             tuple: (doc, docx_bytes)
         """
-        # Save document to temporary file
-        temp_file = os.path.join(temp_dir, filename)
-        self.word_gen.save(temp_file)
-        
-        # Read file as bytes
-        with open(temp_file, 'rb') as f:
-            docx_bytes = f.read()
+        docx_bytes = self.word_gen.to_bytes()
         
         return doc, docx_bytes
     
@@ -0,0 +1,357 @@
+# report_burst.py
+# Report bursting: one Word report per school (or any grouping column), built
+# across a process pool and streamed into a ZIP archive with a manifest
+
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from config import translations
+from figure_export import get_render_service, RENDER_TIMEOUT_SECONDS
+from report_jobs import report_progress
+from school_ranking import school_aggregates, create_school_means_histogram
+from viz_utils import COLOR_SCHEMES
+
+logger = logging.getLogger(__name__)
+
+# Number of processes building the per-group documents
+BURST_WORKERS = min(4, os.cpu_count() or 1)
+# Documents queued or built but not yet written to the archive (bounds memory use)
+BURST_MAX_PENDING = 2 * BURST_WORKERS
+# Variables whose national distribution of group means is charted in every report
+BURST_SHARED_CHARTS = 6
+
+MANIFEST_COLUMNS = ["group", "file", "n_students", "bytes", "render_seconds", "build_seconds", "status", "error"]
+
+# Set once per worker process by _init_worker, so the shared charts are sent
+# to each worker once rather than with every report
+_worker_state = {}
+
+
+def _init_worker(language, shared_images):
+    """
+    Keep the report language and the charts shared by all reports in the worker.
+
+    Args:
+        language (str): Report language
+        shared_images (list): (title, PNG bytes) tuples included in every report
+    """
+    _worker_state["language"] = language
+    _worker_state["shared_images"] = shared_images
+
+
+def _build_group_report(group, summary, group_image, title):
+    """
+    Build the Word report of one group (runs in a worker process).
+
+    Args:
+        group (str): Group name
+        summary (dict): n_students, n_total, n_groups and rows (list of
+            (label, group mean, overall mean, difference, rank) tuples)
+        group_image (bytes or None): PNG of the group's comparison chart
+        title (str): Report title
+
+    Returns:
+        tuple: (docx bytes, build time in seconds)
+    """
+    from word_report import WordReportGenerator
+
+    start = time.perf_counter()
+    language = _worker_state.get("language", "en")
+    t = translations.get(language, translations["en"])
+
+    word_gen = WordReportGenerator(language)
+    report_title = f"{title} — {group}"
+    word_gen.create_new_report(title=report_title, include_toc=False)
+    word_gen.setup_headers_and_footers(title=report_title)
+
+    word_gen.add_section(t.get("burst_summary", "Summary"), level=1)
+    word_gen.add_paragraph(
+        t.get(
+            "burst_summary_text",
+            "{group}: {n} students assessed out of {total} ({share:.1f}%), among {groups} groups."
+        ).format(
+            group=group,
+            n=summary["n_students"],
+            total=summary["n_total"],
+            share=100 * summary["n_students"] / max(summary["n_total"], 1),
+            groups=summary["n_groups"]
+        )
+    )
+
+    word_gen.add_table(
+        [list(row) for row in summary["rows"]],
+        headers=[
+            t.get("variable", "Variable"),
+            t.get("burst_group_mean", "Group mean"),
+            t.get("overall_mean", "Overall mean"),
+            t.get("difference", "Difference"),
+            t.get("rank", "Rank")
+        ],
+        title=t.get("burst_results_table", "Mean scores compared with the overall mean")
+    )
+    word_gen.add_picture(group_image, title=t.get("burst_group_chart", "Group and overall means"))
+
+    shared_images = _worker_state.get("shared_images") or []
+    if shared_images:
+        word_gen.add_section(t.get("burst_reference", "Reference: distribution of group means"), level=1)
+        for image_title, image in shared_images:
+            word_gen.add_picture(image, title=image_title)
+
+    return word_gen.to_bytes(), time.perf_counter() - start
+
+
+def _group_summaries(df, selected_columns, group_col, t):
+    """
+    Compute the per-group summaries of all groups from one aggregate per variable.
+
+    Returns:
+        tuple: (dict of group -> summary, dict of column -> aggregates)
+    """
+    sizes = df.groupby(group_col, observed=True).size()
+    aggregates = {col: school_aggregates(df, col, school_col=group_col) for col in selected_columns}
+    overall = {col: df[col].mean() for col in selected_columns}
+
+    summaries = {}
+    for group, n in sizes.items():
+        rows = []
+        for col in selected_columns:
+            label = t["columns_of_interest"].get(col, col)
+            agg = aggregates[col]
+            if group in agg.index:
+                mean = float(agg.at[group, "mean"])
+                rank = f"{int(agg.at[group, 'rank'])} / {len(agg)}"
+                rows.append((label, round(mean, 2), round(overall[col], 2), round(mean - overall[col], 2), rank))
+            else:
+                rows.append((label, "-", round(overall[col], 2), "-", "-"))
+        summaries[group] = {
+            "n_students": int(n),
+            "n_total": len(df),
+            "n_groups": len(sizes),
+            "rows": rows
+        }
+    return summaries, aggregates
+
+
+def _group_figure(summary, t):
+    """Bar chart of a group's means next to the overall means."""
+    numeric = [row for row in summary["rows"] if row[1] != "-"]
+    labels = [row[0] for row in numeric]
+    colors = COLOR_SCHEMES["categorical"]
+    fig = go.Figure([
+        go.Bar(name=t.get("burst_group_mean", "Group mean"), x=labels, y=[row[1] for row in numeric],
+               marker_color=colors[0]),
+        go.Bar(name=t.get("overall_mean", "Overall mean"), x=labels, y=[row[2] for row in numeric],
+               marker_color=colors[1])
+    ])
+    fig.update_layout(barmode="group", height=400, legend=dict(orientation="h", y=1.1))
+    return fig
+
+
+def _file_name(group, used):
+    """Build a unique, file-system safe archive name for a group's report."""
+    base = re.sub(r"[^\w\-]+", "_", str(group)).strip("_") or "group"
+    name = f"{base}.docx"
+    suffix = 2
+    while name in used:
+        name = f"{base}_{suffix}.docx"
+        suffix += 1
+    used.add(name)
+    return name
+
+
+def burst_reports(df, selected_columns, fileobj, t, language, group_col="school", title=None,
+                  max_workers=BURST_WORKERS, max_pending=BURST_MAX_PENDING, progress=None):
+    """
+    Generate one Word report per group and write them to a ZIP archive as they
+    are finished.
+
+    Summaries of every group come from one grouped aggregate per variable. The
+    charts shared by all reports are rendered once and sent once to each
+    worker; the per-group charts are rendered on the figure rendering pool.
+    The archive ends with manifest.csv, listing each report with its size,
+    timings and status.
+
+    Args:
+        df (pandas.DataFrame): The data to report on
+        selected_columns (list): Variables included in the reports
+        fileobj: Writable binary file receiving the archive
+        t (dict): Translation dictionary
+        language (str): Report language
+        group_col (str): Grouping column (one report per value)
+        title (str, optional): Report title
+        max_workers (int): Number of document building processes
+        max_pending (int): Maximum number of documents in flight
+        progress (callable, optional): Called with (done, total) after each report
+
+    Returns:
+        pandas.DataFrame: The manifest
+    """
+    if group_col not in df.columns:
+        raise ValueError(f"Column '{group_col}' not found in data")
+
+    title = title or t.get("title_school_performance", "School Performance Analysis")
+    summaries, aggregates = _group_summaries(df, selected_columns, group_col, t)
+    service = get_render_service()
+
+    # Charts identical in every report are rendered once; a chart that fails
+    # is left out of the reports rather than stopping the burst
+    shared_renders = []
+    for col in selected_columns[:BURST_SHARED_CHARTS]:
+        chart_title = t["columns_of_interest"].get(col, col)
+        try:
+            fig = create_school_means_histogram(
+                aggregates[col], t,
+                title=chart_title,
+                xaxis_title=t.get("mean", "Mean")
+            )
+            shared_renders.append((chart_title, service.submit(fig, format="png", width=900, height=400)))
+        except Exception as e:
+            logger.warning(f"Shared chart '{chart_title}' skipped: {str(e)}")
+
+    shared_images = []
+    for chart_title, future in shared_renders:
+        try:
+            shared_images.append((chart_title, future.result(timeout=RENDER_TIMEOUT_SECONDS)))
+        except Exception as e:
+            logger.warning(f"Shared chart '{chart_title}' skipped: {str(e)}")
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(language, shared_images)
+    )
+    in_process = False
+
+    manifest = []
+    used_names = set()
+    pending = {}
+    total = len(summaries)
+
+    def _record(group, name, summary, render_seconds, outcome):
+        data, build_seconds, error = outcome
+        if data is not None:
+            archive.writestr(name, data)
+        manifest.append({
+            "group": group,
+            "file": name if data is not None else "",
+            "n_students": summary["n_students"],
+            "bytes": len(data) if data is not None else 0,
+            "render_seconds": round(render_seconds, 3),
+            "build_seconds": round(build_seconds, 3),
+            "status": "ok" if data is not None else "failed",
+            "error": error or ""
+        })
+        done = len(manifest)
+        report_progress(done / total, f"{done} / {total}")
+        if progress is not None:
+            progress(done, total)
+
+    def _build_locally(group, summary, image):
+        _init_worker(language, shared_images)
+        try:
+            data, seconds = _build_group_report(group, summary, image, title)
+            return data, seconds, None
+        except Exception as e:
+            return None, 0.0, str(e)
+
+    def _collect(done_futures):
+        for future in done_futures:
+            group, name, summary, image, render_seconds = pending.pop(future)
+            try:
+                data, seconds = future.result()
+                outcome = (data, seconds, None)
+            except BrokenProcessPool:
+                outcome = _build_locally(group, summary, image)
+            except Exception as e:
+                outcome = (None, 0.0, str(e))
+            _record(group, name, summary, render_seconds, outcome)
+
+    # Reports are already compressed
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as archive:
+        try:
+            groups = list(summaries.items())
+            for start in range(0, total, max_pending):
+                chunk = groups[start:start + max_pending]
+
+                # Per-group charts of the chunk render in parallel
+                render_start = time.perf_counter()
+                futures = [
+                    service.submit(_group_figure(summary, t), format="png", width=900, height=400)
+                    for _, summary in chunk
+                ]
+                images = []
+                for future in futures:
+                    try:
+                        images.append(future.result(timeout=RENDER_TIMEOUT_SECONDS))
+                    except Exception as e:
+                        logger.warning(f"Group chart rendering failed: {str(e)}")
+                        images.append(None)
+                render_seconds = (time.perf_counter() - render_start) / max(len(chunk), 1)
+
+                for (group, summary), image in zip(chunk, images):
+                    while len(pending) >= max_pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        _collect(done)
+
+                    name = _file_name(group, used_names)
+                    if not in_process:
+                        try:
+                            future = executor.submit(_build_group_report, group, summary, image, title)
+                            pending[future] = (group, name, summary, image, render_seconds)
+                            continue
+                        except (BrokenProcessPool, OSError, RuntimeError) as e:
+                            logger.warning(f"Report pool unavailable, building in-process: {str(e)}")
+                            in_process = True
+                    _record(group, name, summary, render_seconds, _build_locally(group, summary, image))
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        manifest_df = pd.DataFrame(manifest, columns=MANIFEST_COLUMNS)
+        archive.writestr("manifest.csv", manifest_df.to_csv(index=False).encode("utf-8-sig"),
+                         compress_type=zipfile.ZIP_DEFLATED)
+
+    built = manifest_df["status"].eq("ok").sum()
+    logger.info(
+        f"Burst {built}/{total} reports by '{group_col}' "
+        f"(build {manifest_df['build_seconds'].sum():.1f}s across {max_workers} workers)"
+    )
+    return manifest_df
+
+
+def burst_reports_zip(df, selected_columns, t, language, group_col="school", title=None):
+    """
+    Generate the per-group reports as a ZIP archive (for report jobs).
+
+    The archive is written to a temporary file; only the finished archive is
+    read into memory, as the report job service keeps results as bytes.
+
+    Args:
+        df (pandas.DataFrame): The data to report on
+        selected_columns (list): Variables included in the reports
+        t (dict): Translation dictionary
+        language (str): Report language
+        group_col (str): Grouping column
+        title (str, optional): Report title
+
+    Returns:
+        bytes: The ZIP archive
+    """
+    with tempfile.TemporaryFile() as archive_file:
+        burst_reports(df, selected_columns, archive_file, t, language, group_col=group_col, title=title)
+        archive_file.seek(0)
+        return archive_file.read()
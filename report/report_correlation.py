@@ -11,7 +11,7 @@ class CorrelationReportGenerator(BaseReportGenerator):
     Report generator for correlation analysis (analyse5.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a correlation analysis report.
         
@@ -19,7 +19,6 @@ class CorrelationReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -28,14 +27,33 @@ class CorrelationReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_correlation")
         filename = "correlation_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the correlation sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Calculate correlation matrix
-        corr_matrix = df[selected_columns].corr().round(2)
+        corr_matrix = self._aggregates(df).correlation(selected_columns).round(2)
         
         # Create visualization
-        fig, _ = self.viz.show_correlation_matrix(df, selected_columns)
+        fig, _ = self.viz.show_correlation_matrix(df, selected_columns, display=False)
         
         # Save figure for inclusion in report
-        img_path = self.viz.save_figure_for_word(fig, "correlation_matrix.png")
+        img_path = self._figure_image(fig, "correlation_matrix.png")
         
         # Find significant correlations (above 0.5 or below -0.5)
         strong_correlations = []
@@ -211,14 +229,6 @@ class CorrelationReportGenerator(BaseReportGenerator):
                                            "No significant correlations (>|0.5|) were found."))
             self.word_gen.add_paragraph(get_text("weak_correlation_note", 
                                            "This suggests that the measured skills may be developing independently or that the assessment measures distinct constructs."))
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
     
     def _get_domain(self, task):
         """
@@ -0,0 +1,140 @@
+# report_full.py
+# Full report: every analysis in one document, built from one shared set of
+# aggregates with all figures rendered concurrently
+
+from docx_stream import StreamingWordReportGenerator
+from language_utils import get_text
+from report.report_base import BaseReportGenerator
+from report.report_aggregates import ReportAggregates
+from report_jobs import report_progress
+
+# Sections of the full report, in document order, with their title keys
+FULL_REPORT_SECTIONS = {
+    "statistical": ("title_statistics", "Descriptive Statistics"),
+    "zero_scores": ("title_zero_scores", "Zero Scores Analysis"),
+    "correlation": ("title_correlation", "Correlation Analysis"),
+    "reliability": ("title_reliability", "Reliability Analysis"),
+    "school": ("title_school_performance", "School Performance Analysis"),
+    "gender": ("title_gender_effect", "Gender Effect Analysis"),
+    "international": ("title_international_comparison", "International Standards Comparison")
+}
+
+class FullReportGenerator(BaseReportGenerator):
+    """
+    Report generator combining the sections of the specialized generators in
+    one document with a single title page and table of contents.
+    """
+
+    def __init__(self, word_generator, visualization, generators):
+        """
+        Initialize the full report generator.
+
+        Args:
+            word_generator: WordReportGenerator instance shared with the generators
+            visualization: StandardVisualization instance
+            generators (dict): Specialized generator by section name
+        """
+        super().__init__(word_generator, visualization)
+        self.generators = generators
+
+    def update_word_generator(self, word_generator):
+        """
+        Update the word generator of this generator and of the sections.
+
+        Args:
+            word_generator: New WordReportGenerator instance
+        """
+        super().update_word_generator(word_generator)
+        for generator in self.generators.values():
+            generator.update_word_generator(word_generator)
+
+    def available_sections(self, df, selected_columns, benchmarks=None):
+        """
+        List the sections that can be produced from the data.
+
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+            benchmarks: Dictionary of benchmark values (international section)
+
+        Returns:
+            list: Section names, in document order
+        """
+        sections = []
+        for name in FULL_REPORT_SECTIONS:
+            if name not in self.generators:
+                continue
+            if name == "correlation" and len(selected_columns) < 2:
+                continue
+            if name == "school" and "school" not in df.columns:
+                continue
+            if name == "gender" and "stgender" not in df.columns:
+                continue
+            if name == "international" and not any(col in (benchmarks or {}) for col in selected_columns):
+                continue
+            sections.append(name)
+        return sections
+
+    def create_report(self, df, selected_columns, benchmarks=None, sections=None, title=None):
+        """
+        Create the full report.
+
+        The aggregates of the data are computed once and shared by all
+        sections; figures are queued for rendering as the sections are written
+        and inserted once all are done.
+
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+            benchmarks: Dictionary of benchmark values (international section)
+            sections: Section names to include (default: all available)
+            title: Report title
+
+        Returns:
+            tuple: (doc, docx_bytes, filename); with the streaming word
+                generator, the document is returned as the temporary file
+                holding it instead of bytes (see StreamingWordReportGenerator.to_file)
+        """
+        # Common setup (shared title page and table of contents)
+        title, doc = self._common_setup(title, "title_full_report")
+        filename = "full_report.docx"
+
+        available = self.available_sections(df, selected_columns, benchmarks)
+        sections = [name for name in (sections or available) if name in available]
+        aggregates = ReportAggregates(df)
+        steps = len(sections) + 1
+
+        for index, name in enumerate(sections):
+            section_title = get_text(*FULL_REPORT_SECTIONS[name])
+            report_progress(index / steps, section_title)
+
+            generator = self.generators[name]
+            generator.aggregates = aggregates
+            generator.defer_figures = True
+
+            # Each analysis is a chapter; its own sections are nested one level down
+            self.word_gen.add_section(section_title, level=1)
+            self.word_gen.heading_offset = 1
+            try:
+                if name == "international":
+                    generator.add_content(df, selected_columns, benchmarks)
+                else:
+                    generator.add_content(df, selected_columns)
+            finally:
+                self.word_gen.heading_offset = 0
+                generator.aggregates = None
+                generator.defer_figures = False
+
+            if index < len(sections) - 1:
+                self.word_gen.add_page_break()
+
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+
+        # Wait for the figures and save
+        report_progress((steps - 1) / steps, get_text("rendering_figures", "Rendering figures..."))
+        if isinstance(self.word_gen, StreamingWordReportGenerator):
+            return doc, self.word_gen.to_file(), filename
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+
+        return doc, docx_bytes, filename
@@ -7,12 +7,46 @@ import numpy as np
 from language_utils import get_text
 from report.report_base import BaseReportGenerator
 
+def map_gender_labels(stgender, boy, girl, unknown):
+    """
+    Map gender codes (0/1 or common words) to labels.
+    
+    Args:
+        stgender (pandas.Series): Gender column
+        boy, girl, unknown (str): Labels of boys, girls and other values
+        
+    Returns:
+        pandas.Series: Label of each row
+    """
+    # Check the unique values in stgender to determine mapping approach
+    gender_values = stgender.dropna().unique()
+    
+    # Determine if gender is coded as 0/1 or has string values
+    if pd.api.types.is_numeric_dtype(stgender) or all(isinstance(x, (int, float, np.number)) for x in gender_values):
+        # Numeric coding
+        return stgender.map({1: boy, 0: girl}).fillna(unknown)
+    
+    # Try to map using common string values (case-insensitive)
+    gender_map = {}
+    for val in gender_values:
+        if isinstance(val, str):
+            if val.lower() in ['boy', 'boys', 'male', 'm', 'homme', 'garçon']:
+                gender_map[val] = boy
+            elif val.lower() in ['girl', 'girls', 'female', 'f', 'femme', 'fille']:
+                gender_map[val] = girl
+            else:
+                gender_map[val] = unknown
+        else:
+            gender_map[val] = unknown
+    
+    return stgender.map(gender_map).fillna(unknown)
+
 class GenderReportGenerator(BaseReportGenerator):
     """
     Report generator for gender effect analysis (analyse10.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a gender effect analysis report.
         
@@ -20,7 +54,6 @@ class GenderReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -29,6 +62,25 @@ class GenderReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_gender_effect")
         filename = "gender_effect_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the gender effect sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Make sure gender column exists
         if "stgender" not in df.columns:
             # Add error handling here as appropriate
@@ -36,32 +88,12 @@ class GenderReportGenerator(BaseReportGenerator):
         
         # Prepare data - map gender codes to labels and handle missing values
         df_analysis = df.copy()
-        
-        # Check the unique values in stgender to determine mapping approach
-        gender_values = df_analysis['stgender'].dropna().unique()
-        
-        # Determine if gender is coded as 0/1 or has string values
-        if all(isinstance(x, (int, float)) for x in gender_values):
-            # Numeric coding
-            df_analysis["gender"] = df_analysis["stgender"].map({
-                1: get_text("boy", "Boy"), 
-                0: get_text("girl", "Girl")
-            }).fillna(get_text("unknown", "Unknown"))
-        else:
-            # Try to map using common string values (case-insensitive)
-            gender_map = {}
-            for val in gender_values:
-                if isinstance(val, str):
-                    if val.lower() in ['boy', 'boys', 'male', 'm', 'homme', 'garçon']:
-                        gender_map[val] = get_text("boy", "Boy")
-                    elif val.lower() in ['girl', 'girls', 'female', 'f', 'femme', 'fille']:
-                        gender_map[val] = get_text("girl", "Girl")
-                    else:
-                        gender_map[val] = get_text("unknown", "Unknown")
-                else:
-                    gender_map[val] = get_text("unknown", "Unknown")
-            
-            df_analysis["gender"] = df_analysis["stgender"].map(gender_map).fillna(get_text("unknown", "Unknown"))
+        df_analysis["gender"] = map_gender_labels(
+            df_analysis["stgender"],
+            get_text("boy", "Boy"),
+            get_text("girl", "Girl"),
+            get_text("unknown", "Unknown")
+        )
         
         # Remove unknown gender for analysis
         df_analysis = df_analysis[df_analysis["gender"] != get_text("unknown", "Unknown")]
@@ -75,25 +107,16 @@ class GenderReportGenerator(BaseReportGenerator):
         # Combine with mean scores for display
         performance_table = pd.concat([mean_scores_by_gender, sample_sizes], axis=1)
         
-        # Create visualizations for each variable
-        visualization_paths = []
+        from scipy import stats
         
-        for column in selected_columns:
+        def _variable_results(col):
+            col_name = get_text("columns_of_interest", {}).get(col, col)
+            
             # Create box plot comparing genders
-            fig = self.viz.show_gender_comparison(df_analysis, column, gender_col="gender")
+            fig = self.viz.show_gender_comparison(df_analysis, col, gender_col="gender", display=False)
             
             # Save figure for inclusion in report
-            img_path = self.viz.save_figure_for_word(fig, f"{column}_gender_comparison.png")
-            
-            # Store path for later inclusion in report
-            visualization_paths.append((column, img_path))
-        
-        # Perform statistical significance testing (Mann-Whitney U test) for each variable
-        from scipy import stats
-        
-        test_results = []
-        for col in selected_columns:
-            col_name = get_text("columns_of_interest", {}).get(col, col)
+            img_path = self._figure_image(fig, f"{col}_gender_comparison.png")
             
             # Get data for boys and girls
             boys_data = df_analysis[df_analysis["gender"] == get_text("boy", "Boy")][col].dropna()
@@ -104,38 +127,46 @@ class GenderReportGenerator(BaseReportGenerator):
             girls_mean = girls_data.mean()
             
             # Perform Mann-Whitney test if we have data for both groups
-            if len(boys_data) > 0 and len(girls_data) > 0:
-                try:
-                    u_stat, p_value = stats.mannwhitneyu(boys_data, girls_data, alternative='two-sided')
-                    
-                    # Determine which gender performed better
-                    better_gender = get_text("boy", "Boy") if boys_mean > girls_mean else get_text("girl", "Girl")
-                    
-                    test_results.append({
-                        "variable": col_name,
-                        "boys_mean": boys_mean,
-                        "girls_mean": girls_mean,
-                        "difference": abs(boys_mean - girls_mean),
-                        "percent_diff": abs(boys_mean - girls_mean) / ((boys_mean + girls_mean) / 2) * 100 if boys_mean + girls_mean > 0 else 0,
-                        "better_gender": better_gender,
-                        "u_statistic": u_stat,
-                        "p_value": p_value,
-                        "significant": p_value < 0.05
-                    })
-                except Exception as e:
-                    # Handle errors in statistical testing
-                    test_results.append({
-                        "variable": col_name,
-                        "boys_mean": boys_mean,
-                        "girls_mean": girls_mean,
-                        "difference": abs(boys_mean - girls_mean),
-                        "percent_diff": abs(boys_mean - girls_mean) / ((boys_mean + girls_mean) / 2) * 100 if boys_mean + girls_mean > 0 else 0,
-                        "better_gender": None,
-                        "u_statistic": None,
-                        "p_value": None,
-                        "significant": None,
-                        "error": str(e)
-                    })
+            if len(boys_data) == 0 or len(girls_data) == 0:
+                return img_path, None
+            
+            try:
+                u_stat, p_value = stats.mannwhitneyu(boys_data, girls_data, alternative='two-sided')
+                
+                # Determine which gender performed better
+                better_gender = get_text("boy", "Boy") if boys_mean > girls_mean else get_text("girl", "Girl")
+                
+                return img_path, {
+                    "variable": col_name,
+                    "boys_mean": boys_mean,
+                    "girls_mean": girls_mean,
+                    "difference": abs(boys_mean - girls_mean),
+                    "percent_diff": abs(boys_mean - girls_mean) / ((boys_mean + girls_mean) / 2) * 100 if boys_mean + girls_mean > 0 else 0,
+                    "better_gender": better_gender,
+                    "u_statistic": u_stat,
+                    "p_value": p_value,
+                    "significant": p_value < 0.05
+                }
+            except Exception as e:
+                # Handle errors in statistical testing
+                return img_path, {
+                    "variable": col_name,
+                    "boys_mean": boys_mean,
+                    "girls_mean": girls_mean,
+                    "difference": abs(boys_mean - girls_mean),
+                    "percent_diff": abs(boys_mean - girls_mean) / ((boys_mean + girls_mean) / 2) * 100 if boys_mean + girls_mean > 0 else 0,
+                    "better_gender": None,
+                    "u_statistic": None,
+                    "p_value": None,
+                    "significant": None,
+                    "error": str(e)
+                }
+        
+        # Create the figure and perform the significance test (Mann-Whitney U)
+        # of all variables concurrently
+        results = self._map_columns(_variable_results, selected_columns)
+        visualization_paths = [(column, img_path) for column, (img_path, _) in zip(selected_columns, results)]
+        test_results = [result for _, result in results if result is not None]
         
         # Identify significant differences
         sig_differences = [r for r in test_results if r.get("significant")]
@@ -313,12 +344,4 @@ class GenderReportGenerator(BaseReportGenerator):
             self.word_gen.add_bullet_point(get_text("monitor_equity", 
                                           "Continue monitoring gender differences to ensure equitable outcomes are maintained."))
             self.word_gen.add_bullet_point(get_text("inclusive_strategies", 
-                                          "Maintain gender-inclusive strategies that have proven effective for both boys and girls."))
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
\ No newline at end of file
+                                          "Maintain gender-inclusive strategies that have proven effective for both boys and girls."))
\ No newline at end of file
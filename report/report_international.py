@@ -11,7 +11,7 @@ class InternationalReportGenerator(BaseReportGenerator):
     Report generator for international standards comparison (analyse12.py).
     """
     
-    def create_report(self, df, selected_columns, benchmarks, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, benchmarks, title=None):
         """
         Create an international standards comparison report.
         
@@ -20,7 +20,6 @@ class InternationalReportGenerator(BaseReportGenerator):
             selected_columns: List of columns to include
             benchmarks: Dictionary of benchmark values
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -29,8 +28,28 @@ class InternationalReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_international_comparison")
         filename = "international_comparison_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns, benchmarks)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns, benchmarks):
+        """
+        Add the international comparison sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+            benchmarks: Dictionary of benchmark values
+        """
         # Calculate local mean scores
-        local_means = df[selected_columns].mean().round(2)
+        local_means = self._aggregates(df).means(selected_columns).round(2)
         
         # Get international benchmarks for selected columns
         benchmark_values = {col: benchmarks[col]["standard"] for col in selected_columns if col in benchmarks}
@@ -66,11 +85,12 @@ class InternationalReportGenerator(BaseReportGenerator):
         # Create benchmark comparison visualization
         benchmark_fig = self.viz.show_international_benchmark_comparison(
             local_means.to_dict(),
-            benchmark_values
+            benchmark_values,
+            display=False
         )
         
         # Save figure for inclusion in report
-        benchmark_img_path = self.viz.save_figure_for_word(benchmark_fig, "benchmark_comparison.png")
+        benchmark_img_path = self._figure_image(benchmark_fig, "benchmark_comparison.png")
         
         # Create percentage chart data
         percentage_df = comparison_data.copy()
@@ -83,10 +103,10 @@ class InternationalReportGenerator(BaseReportGenerator):
         )
         
         # Create percentage chart
-        percentage_fig = self.viz.show_benchmark_percentage(percentage_df)
+        percentage_fig = self.viz.show_benchmark_percentage(percentage_df, display=False)
         
         # Save figure for inclusion in report
-        percentage_img_path = self.viz.save_figure_for_word(percentage_fig, "benchmark_percentage.png")
+        percentage_img_path = self._figure_image(percentage_fig, "benchmark_percentage.png")
         
         # Categorize variables by achievement level
         critical_vars = percentage_df[percentage_df["percentage"] < 70]
@@ -284,12 +304,4 @@ class InternationalReportGenerator(BaseReportGenerator):
         The international benchmarks used in this analysis are based on research and standards from multiple sources including RTI International, USAID, World Bank, and UNESCO. These benchmarks represent achievement levels that have been associated with successful educational outcomes in various international contexts.
         
         These benchmarks should be interpreted as goals to work toward rather than absolute standards, as educational contexts can vary significantly across countries and regions. They provide valuable reference points for understanding local performance in a global context.
-        """))
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
\ No newline at end of file
+        """))
\ No newline at end of file
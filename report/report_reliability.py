@@ -11,7 +11,7 @@ class ReliabilityReportGenerator(BaseReportGenerator):
     Report generator for reliability analysis (analyse6.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a reliability analysis report.
         
@@ -19,7 +19,6 @@ class ReliabilityReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -28,6 +27,25 @@ class ReliabilityReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_reliability")
         filename = "reliability_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the reliability sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Add executive summary
         summary_text = get_text("reliability_summary", 
                               "This report analyzes the internal consistency reliability of the assessment using Cronbach's Alpha.")
@@ -68,10 +86,10 @@ class ReliabilityReportGenerator(BaseReportGenerator):
         ]
         
         # Create visualization from dummy data
-        fig = self.viz.show_reliability_visualization(pd.DataFrame(alpha_results))
+        fig = self.viz.show_reliability_visualization(pd.DataFrame(alpha_results), display=False)
         
         # Save figure for inclusion in report
-        img_path = self.viz.save_figure_for_word(fig, "reliability_chart.png")
+        img_path = self._figure_image(fig, "reliability_chart.png")
         
         # Add results section
         self.word_gen.add_section(get_text("results", "Results"), level=1)
@@ -159,12 +177,4 @@ class ReliabilityReportGenerator(BaseReportGenerator):
             ]
         
         for rec in recommendations:
-            self.word_gen.add_bullet_point(rec)
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
\ No newline at end of file
+            self.word_gen.add_bullet_point(rec)
\ No newline at end of file
@@ -12,7 +12,7 @@ class SchoolReportGenerator(BaseReportGenerator):
     Report generator for school performance analysis (analyse7.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a school performance analysis report.
         
@@ -20,7 +20,6 @@ class SchoolReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -29,24 +28,41 @@ class SchoolReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_school_performance")
         filename = "school_performance_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the school performance sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Make sure school column exists
         if "school" not in df.columns:
             # Add error handling here as appropriate
             raise ValueError("School column not found in data")
         
         # Calculate mean scores by school
-        mean_scores_by_school = df.groupby("school")[selected_columns].mean().round(2)
+        aggregates = self._aggregates(df)
+        mean_scores_by_school = aggregates.group_means("school", selected_columns).round(2)
         
         # Calculate sample sizes by school
-        sample_sizes = df.groupby("school").size().rename(get_text("sample_size", "Sample Size"))
+        sample_sizes = aggregates.group_sizes("school").rename(get_text("sample_size", "Sample Size"))
         
         # Combine with mean scores for display
         performance_table = pd.concat([mean_scores_by_school, sample_sizes], axis=1)
         
-        # Identify highest and lowest performing schools for each variable
-        highlight_data = []
-        
-        for col in selected_columns:
+        def _variable_results(col):
             # Get translated column name
             col_name = get_text("columns_of_interest", {}).get(col, col)
             
@@ -57,15 +73,26 @@ class SchoolReportGenerator(BaseReportGenerator):
             lowest_school = mean_scores_by_school[col].idxmin()
             lowest_score = mean_scores_by_school.loc[lowest_school, col]
             
-            # Store in highlight data
-            highlight_data.append({
+            # Create box plot comparing schools
+            fig = self.viz.show_school_comparison(df, col, display=False)
+            
+            highlight = {
                 "variable": col_name,
                 "highest_school": highest_school,
                 "highest_score": highest_score,
                 "lowest_school": lowest_school,
                 "lowest_score": lowest_score,
                 "range": highest_score - lowest_score
-            })
+            }
+            
+            # Save figure for inclusion in report
+            return highlight, self._figure_image(fig, f"{col}_school_comparison.png")
+        
+        # Compute the highlights and figures of all variables concurrently
+        results = self._map_columns(_variable_results, selected_columns)
+        
+        # Highest and lowest performing schools for each variable
+        highlight_data = [highlight for highlight, _ in results]
         
         # Convert to DataFrame for display
         highlight_df = pd.DataFrame(highlight_data)
@@ -78,18 +105,8 @@ class SchoolReportGenerator(BaseReportGenerator):
             get_text("score_range", "Score Range")
         ]
         
-        # Create visualizations for each variable
-        visualization_paths = []
-        
-        for column in selected_columns:
-            # Create box plot comparing schools
-            fig = self.viz.show_school_comparison(df, column)
-            
-            # Save figure for inclusion in report
-            img_path = self.viz.save_figure_for_word(fig, f"{column}_school_comparison.png")
-            
-            # Store path for later inclusion in report
-            visualization_paths.append((column, img_path))
+        # Visualizations for each variable
+        visualization_paths = [(column, img_path) for column, (_, img_path) in zip(selected_columns, results)]
         
         # Add executive summary
         summary_text = get_text("school_performance_summary", 
@@ -199,12 +216,4 @@ class SchoolReportGenerator(BaseReportGenerator):
                                        "Conduct an equity review to ensure all schools have access to necessary resources."))
         self.word_gen.add_bullet_point(get_text("professional_learning", 
                                        "Facilitate professional learning communities across schools to share best practices."))
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
             # Create box plot comparing schools
\ No newline at end of file
@@ -10,7 +10,7 @@ class StatisticalReportGenerator(BaseReportGenerator):
     Report generator for statistical analysis (analyse1.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a statistical overview report.
         
@@ -18,7 +18,6 @@ class StatisticalReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -27,8 +26,44 @@ class StatisticalReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_statistics")
         filename = "statistical_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the descriptive statistics sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Calculate statistics
-        stats_summary = df[selected_columns].describe(percentiles=[.25, .5, .75, .9]).round(2)
+        stats_summary = self._aggregates(df).describe(selected_columns)
+        
+        def _histogram(column):
+            column_name = get_text("columns_of_interest", {}).get(column, column)
+            
+            # Create histogram
+            fig = self.viz.viz_utils.create_histogram(
+                df,
+                column,
+                title=get_text("histogram_title", "Distribution of {}").format(column_name),
+                show_normal=True
+            )
+            
+            # Save figure for inclusion in report
+            return self._figure_image(fig, f"{column}_histogram.png")
+        
+        # Create the histograms of all variables concurrently
+        histograms = self._map_columns(_histogram, selected_columns)
         
         # Add executive summary
         summary_text = get_text("statistical_overview_summary", 
@@ -54,19 +89,9 @@ class StatisticalReportGenerator(BaseReportGenerator):
         # Add visualizations
         self.word_gen.add_section(get_text("visualizations", "Visualizations"), level=2)
         
-        for column in selected_columns:
+        for column, img_path in zip(selected_columns, histograms):
             column_name = get_text("columns_of_interest", {}).get(column, column)
             
-            # Create histogram
-            fig = self.viz.viz_utils.create_histogram(
-                df[column],
-                title=get_text("histogram_title", "Distribution of {}").format(column_name),
-                show_normal=True
-            )
-            
-            # Save figure for inclusion in report
-            img_path = self.viz.save_figure_for_word(fig, f"{column}_histogram.png")
-            
             # Add to report
             self.word_gen.add_picture(
                 img_path,
@@ -111,12 +136,4 @@ class StatisticalReportGenerator(BaseReportGenerator):
             # Add interpretation for this column
             self.word_gen.add_section(column_name, level=2)
             self.word_gen.add_interpretation(interp_text, column_name, mean_score)
-            self.word_gen.add_recommendation(rec_text, column_name, mean_score)
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
\ No newline at end of file
+            self.word_gen.add_recommendation(rec_text, column_name, mean_score)
\ No newline at end of file
@@ -0,0 +1,318 @@
+# report_workbook.py
+# Excel export of the analysis tables: one sheet per analysis, computed from
+# the shared report aggregates and written with openpyxl's write-only
+# (streaming) workbook, so rows go to disk as they are appended
+
+import io
+import logging
+import math
+import re
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from config import egra_columns, egma_columns
+from report.report_aggregates import ReportAggregates
+from report.report_gender import map_gender_labels
+from report_jobs import report_progress
+
+logger = logging.getLogger(__name__)
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Sheets of the workbook, in order, with their title keys
+WORKBOOK_SHEETS = {
+    "descriptives": ("title_statistics", "Descriptive Statistics"),
+    "zero_scores": ("title_zero_scores", "Zero Scores Analysis"),
+    "school_means": ("school_performance_table", "Mean Scores by School"),
+    "gender_tests": ("gender_test_results", "Statistical Test Results"),
+    "benchmarks": ("title_international_comparison", "International Standards Comparison"),
+    "reliability": ("title_reliability", "Reliability Analysis")
+}
+
+# Width of the first column (labels) and of the value columns, in characters
+LABEL_COLUMN_WIDTH = 28
+VALUE_COLUMN_WIDTH = 14
+
+# Characters Excel does not allow in sheet names (which are limited to 31 characters)
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _has_both_genders(df):
+    """Whether the data holds both boys and girls (the gender tests need both)."""
+    if "stgender" not in df.columns:
+        return False
+    labels = set(map_gender_labels(df["stgender"], "boy", "girl", "unknown").unique())
+    return {"boy", "girl"} <= labels
+
+
+def available_sheets(df, selected_columns, benchmarks=None):
+    """
+    List the sheets that can be produced from the data.
+
+    Args:
+        df (pandas.DataFrame): The data to export
+        selected_columns (list): Selected columns
+        benchmarks (dict, optional): Benchmark values (benchmarks sheet)
+
+    Returns:
+        list: Sheet names, in workbook order
+    """
+    sheets = []
+    for name in WORKBOOK_SHEETS:
+        if name == "school_means" and "school" not in df.columns:
+            continue
+        if name == "gender_tests" and not _has_both_genders(df):
+            continue
+        if name == "benchmarks" and not any(col in (benchmarks or {}) for col in selected_columns):
+            continue
+        if name == "reliability" and len(selected_columns) < 2:
+            continue
+        sheets.append(name)
+    return sheets
+
+
+def _label(t, col):
+    return t["columns_of_interest"].get(col, col)
+
+
+def _descriptives(df, aggregates, selected_columns, t):
+    """Count, mean, standard deviation, quartiles and P90 of each variable."""
+    stats = aggregates.describe(selected_columns).T
+    headers = [t.get("variable", "Variable")] + [str(stat) for stat in stats.columns]
+    rows = (
+        [_label(t, col)] + list(values)
+        for col, values in zip(stats.index, stats.itertuples(index=False, name=None))
+    )
+    return headers, rows
+
+
+def _zero_scores(df, aggregates, selected_columns, t):
+    """Number and percentage of zero scores of each variable."""
+    zeros = aggregates.zero_counts(selected_columns)
+    total = len(df)
+    headers = [
+        t.get("task_column", "Task"),
+        t.get("count_column", "Count of Zeros"),
+        t.get("percentage_column", "Percentage of Zero Scores")
+    ]
+    rows = (
+        [_label(t, col), int(zeros[col]), round(zeros[col] / total * 100, 2) if total else None]
+        for col in selected_columns
+    )
+    return headers, rows
+
+
+def _school_means(df, aggregates, selected_columns, t):
+    """Mean of each variable and number of students by school."""
+    means = aggregates.group_means("school", selected_columns).round(2)
+    sizes = aggregates.group_sizes("school")
+    headers = (
+        [t.get("school", "School")]
+        + [_label(t, col) for col in selected_columns]
+        + [t.get("sample_size", "Sample Size")]
+    )
+    rows = (
+        [school] + list(values) + [int(sizes.get(school, 0))]
+        for school, values in zip(means.index, means.itertuples(index=False, name=None))
+    )
+    return headers, rows
+
+
+def _gender_tests(df, aggregates, selected_columns, t):
+    """Mann-Whitney U test of each variable between boys and girls."""
+    boy, girl = t.get("boy", "Boy"), t.get("girl", "Girl")
+    labels = map_gender_labels(df["stgender"], boy, girl, t.get("unknown", "Unknown"))
+    gender_df = df[selected_columns].assign(gender=labels)
+    tests = ReportAggregates(gender_df).mann_whitney("gender", selected_columns, boy, girl)
+
+    headers = [
+        t.get("variable", "Variable"),
+        t.get("boys_mean", "Boys Mean"),
+        t.get("girls_mean", "Girls Mean"),
+        t.get("difference", "Difference"),
+        t.get("u_statistic", "U"),
+        t.get("p_value", "p-value"),
+        t.get("significant", "Significant")
+    ]
+
+    def _row(col):
+        test = tests.loc[col]
+        significant = None
+        if not math.isnan(test["p_value"]):
+            significant = t.get("significant_yes", "Yes") if test["p_value"] < 0.05 else t.get("significant_no", "No")
+        return [
+            _label(t, col),
+            round(test["first_mean"], 2),
+            round(test["second_mean"], 2),
+            round(test["first_mean"] - test["second_mean"], 2),
+            test["u_statistic"],
+            round(test["p_value"], 4),
+            significant
+        ]
+
+    return headers, (_row(col) for col in selected_columns)
+
+
+def _benchmarks(df, aggregates, selected_columns, t, benchmarks):
+    """Mean of each variable against its international benchmark."""
+    columns = [col for col in selected_columns if col in benchmarks]
+    means = aggregates.means(columns)
+    headers = [
+        t.get("variable", "Variable"),
+        t.get("local_mean", "Local Mean"),
+        t.get("benchmark", "Benchmark"),
+        t.get("gap", "Gap"),
+        t.get("percentage_achieved", "% of Benchmark")
+    ]
+
+    def _row(col):
+        standard = benchmarks[col]["standard"]
+        return [
+            _label(t, col),
+            round(means[col], 2),
+            standard,
+            round(means[col] - standard, 2),
+            round(means[col] / standard * 100, 1) if standard else None
+        ]
+
+    return headers, (_row(col) for col in columns)
+
+
+def _reliability(df, aggregates, selected_columns, t):
+    """Cronbach's Alpha of the EGRA, EGMA and all selected variables."""
+    from analyse6 import interpret_alpha
+
+    groups = [
+        (t.get("egra_variables", "EGRA Variables:").rstrip(": "), [col for col in selected_columns if col in egra_columns]),
+        (t.get("egma_variables", "EGMA Variables:").rstrip(": "), [col for col in selected_columns if col in egma_columns]),
+        (t.get("selected_variables", "Selected Variables"), list(selected_columns))
+    ]
+    headers = [
+        t.get("test_group", "Test Group"),
+        t.get("n_items", "Items"),
+        t.get("n_students_complete", "Students with complete scores"),
+        t.get("cronbach_alpha", "Cronbach's Alpha"),
+        t.get("interpretation", "Interpretation")
+    ]
+
+    def _row(label, columns):
+        alpha = aggregates.cronbach_alpha(columns)
+        category, description, _ = interpret_alpha(alpha)
+        return [
+            label,
+            len(columns),
+            int(df[columns].dropna().shape[0]),
+            round(alpha, 3) if alpha is not None else None,
+            t.get(category, description)
+        ]
+
+    return headers, (_row(label, columns) for label, columns in groups if len(columns) >= 2)
+
+
+def _sheet_title(title, used):
+    """Make a valid, unique Excel sheet name."""
+    base = _INVALID_SHEET_CHARS.sub(" ", title).strip()[:31] or "Sheet"
+    name = base
+    suffix = 2
+    while name.lower() in used:
+        name = f"{base[:28]} {suffix}"
+        suffix += 1
+    used.add(name.lower())
+    return name
+
+
+def _cell_value(value):
+    """Convert a value for openpyxl (numpy scalars to Python, NaN to an empty cell)."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def build_analysis_workbook(df, selected_columns, fileobj, t, benchmarks=None, sheets=None):
+    """
+    Write the analysis tables to an Excel workbook, one sheet per analysis.
+
+    The tables come from the report aggregates (computed once per dataset and
+    shared with the Word reports). The workbook is write-only: each row is
+    serialised as it is appended, so memory use does not depend on the
+    number of rows (e.g. one row per school).
+
+    Args:
+        df (pandas.DataFrame): The data to export
+        selected_columns (list): Selected columns
+        fileobj: Writable binary file (or path) receiving the workbook
+        t (dict): Translation dictionary
+        benchmarks (dict, optional): Benchmark values (benchmarks sheet)
+        sheets (list, optional): Sheet names to include (default: all available)
+
+    Returns:
+        list: Names of the sheets written
+    """
+    available = available_sheets(df, selected_columns, benchmarks)
+    sheets = [name for name in (sheets or available) if name in available]
+    aggregates = ReportAggregates(df)
+    builders = {
+        "descriptives": _descriptives,
+        "zero_scores": _zero_scores,
+        "school_means": _school_means,
+        "gender_tests": _gender_tests,
+        "benchmarks": lambda *args: _benchmarks(*args, benchmarks),
+        "reliability": _reliability
+    }
+
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    used_titles = set()
+
+    for index, name in enumerate(sheets):
+        title = t.get(*WORKBOOK_SHEETS[name])
+        report_progress(index / len(sheets), title)
+
+        headers, rows = builders[name](df, aggregates, selected_columns, t)
+
+        sheet = workbook.create_sheet(_sheet_title(title, used_titles))
+        sheet.freeze_panes = "B2"
+        sheet.column_dimensions["A"].width = LABEL_COLUMN_WIDTH
+        for column in range(2, len(headers) + 1):
+            sheet.column_dimensions[get_column_letter(column)].width = VALUE_COLUMN_WIDTH
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = header_font
+            header_cells.append(cell)
+        sheet.append(header_cells)
+
+        for row in rows:
+            sheet.append([_cell_value(value) for value in row])
+
+    if not sheets:
+        workbook.create_sheet(t.get("no_data", "No data"))
+
+    workbook.save(fileobj)
+    logger.info(f"Analysis workbook written ({len(sheets)} sheets)")
+    return sheets
+
+
+def analysis_workbook_bytes(df, selected_columns, t, benchmarks=None, sheets=None):
+    """
+    Build the analysis workbook in memory (for report jobs).
+
+    Args:
+        df (pandas.DataFrame): The data to export
+        selected_columns (list): Selected columns
+        t (dict): Translation dictionary
+        benchmarks (dict, optional): Benchmark values
+        sheets (list, optional): Sheet names to include
+
+    Returns:
+        bytes: The .xlsx file content
+    """
+    buffer = io.BytesIO()
+    build_analysis_workbook(df, selected_columns, buffer, t, benchmarks=benchmarks, sheets=sheets)
+    return buffer.getvalue()
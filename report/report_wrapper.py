@@ -3,15 +3,14 @@
 
 import streamlit as st
 import pandas as pd
-import tempfile
-import os
 import importlib
 from io import BytesIO
 from datetime import datetime
 from language_utils import get_text, get_current_language, format_date
-from report_utils import AnalysisReportGenerator
+from report.report_utils import AnalysisReportGenerator
 from word_report import WordReportGenerator
 from viz_wrapper import StandardVisualization
+from report_jobs import get_report_service, report_cache_key
 
 # Import specialized report generators
 from report.report_statistical import StatisticalReportGenerator
@@ -21,7 +20,12 @@ from report.report_reliability import ReliabilityReportGenerator
 from report.report_school import SchoolReportGenerator
 from report.report_gender import GenderReportGenerator
 from report.report_international import InternationalReportGenerator
-from report.report_language import LanguageReportGenerator
+from report.report_full import FullReportGenerator
+# The language of instruction report is optional
+try:
+    from report.report_language import LanguageReportGenerator
+except ImportError:
+    LanguageReportGenerator = None
 
 class StandardReportGenerator:
     """
@@ -29,11 +33,18 @@ class StandardReportGenerator:
     for different analysis types.
     """
     
-    def __init__(self):
-        """Initialize the report generators."""
+    def __init__(self, word_generator_class=WordReportGenerator):
+        """
+        Initialize the report generators.
+        
+        Args:
+            word_generator_class: Word generator class (e.g. the streaming
+                generator of docx_stream for very large reports)
+        """
         self.language = get_current_language()
         self.report_gen = AnalysisReportGenerator()
-        self.word_gen = WordReportGenerator(language=self.language)
+        self.word_generator_class = word_generator_class
+        self.word_gen = word_generator_class(language=self.language)
         self.viz = StandardVisualization()
         self.temp_dir = None
         
@@ -45,14 +56,27 @@ class StandardReportGenerator:
         self.school_generator = SchoolReportGenerator(self.word_gen, self.viz)
         self.gender_generator = GenderReportGenerator(self.word_gen, self.viz)
         self.international_generator = InternationalReportGenerator(self.word_gen, self.viz)
-        self.language_generator = LanguageReportGenerator(self.word_gen, self.viz)
+        self.language_generator = (
+            LanguageReportGenerator(self.word_gen, self.viz) if LanguageReportGenerator is not None else None
+        )
+        
+        # Full report over the section generators (they share the Word generator)
+        self.full_generator = FullReportGenerator(self.word_gen, self.viz, {
+            "statistical": self.statistical_generator,
+            "zero_scores": self.zero_scores_generator,
+            "correlation": self.correlation_generator,
+            "reliability": self.reliability_generator,
+            "school": self.school_generator,
+            "gender": self.gender_generator,
+            "international": self.international_generator
+        })
     
     def update_language(self, language=None):
         """Update the language setting."""
         if language is None:
             language = get_current_language()
         self.language = language
-        self.word_gen = WordReportGenerator(language=language)
+        self.word_gen = self.word_generator_class(language=language)
         self.viz.update_language(language)
         
         # Update language for all specialized generators
@@ -63,13 +87,9 @@ class StandardReportGenerator:
         self.school_generator.update_word_generator(self.word_gen)
         self.gender_generator.update_word_generator(self.word_gen)
         self.international_generator.update_word_generator(self.word_gen)
-        self.language_generator.update_word_generator(self.word_gen)
-    
-    def _ensure_temp_dir(self):
-        """Ensure a temporary directory exists."""
-        if self.temp_dir is None:
-            self.temp_dir = tempfile.mkdtemp()
-        return self.temp_dir
+        if self.language_generator is not None:
+            self.language_generator.update_word_generator(self.word_gen)
+        self.full_generator.update_word_generator(self.word_gen)
     
     def cleanup(self):
         """Clean up temporary files."""
@@ -80,8 +100,40 @@ class StandardReportGenerator:
                 self.temp_dir = None
             except:
                 pass
+        self.word_gen.cleanup()
         self.viz.cleanup()
     
+    def submit_report(self, kind, *args, **kwargs):
+        """
+        Generate a report in the background with the report job service.
+        
+        The job uses its own generator, so concurrent jobs do not share a
+        Word document. A report already generated with the same arguments
+        and language is served from the report cache.
+        
+        Args:
+            kind (str): Report kind, e.g. "statistical" for create_statistical_report
+            *args, **kwargs: Arguments of the create_<kind>_report method
+            
+        Returns:
+            str: Job id (see report_jobs.get_report_service)
+        """
+        language = self.language
+        
+        def _build():
+            generator = StandardReportGenerator()
+            generator.update_language(language)
+            try:
+                return getattr(generator, f"create_{kind}_report")(*args, **kwargs)
+            finally:
+                generator.cleanup()
+        
+        cache_key = report_cache_key(
+            f"{kind}_report", getattr(StandardReportGenerator, f"create_{kind}_report"),
+            (language,) + args, kwargs
+        )
+        return get_report_service().submit(f"{kind}_report", _build, cache_key=cache_key)
+    
     def create_statistical_report(self, df, selected_columns, title=None):
         """
         Create a statistical overview report (analyse1.py).
@@ -95,7 +147,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.statistical_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_zero_scores_report(self, df, selected_columns, title=None):
@@ -111,7 +163,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.zero_scores_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_correlation_report(self, df, selected_columns, title=None):
@@ -127,7 +179,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.correlation_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_reliability_report(self, df, selected_columns, title=None):
@@ -143,7 +195,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.reliability_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_school_report(self, df, selected_columns, title=None):
@@ -159,7 +211,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.school_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_gender_report(self, df, selected_columns, title=None):
@@ -175,7 +227,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.gender_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
         )
     
     def create_international_report(self, df, selected_columns, benchmarks, title=None):
@@ -192,7 +244,7 @@ class StandardReportGenerator:
             tuple: (doc, docx_bytes, filename)
         """
         return self.international_generator.create_report(
-            df, selected_columns, benchmarks, title, self._ensure_temp_dir()
+            df, selected_columns, benchmarks, title
         )
     
     def create_language_report(self, df, selected_columns, title=None):
@@ -207,8 +259,28 @@ class StandardReportGenerator:
         Returns:
             tuple: (doc, docx_bytes, filename)
         """
+        if self.language_generator is None:
+            raise ValueError("Language of instruction report is not available")
         return self.language_generator.create_report(
-            df, selected_columns, title, self._ensure_temp_dir()
+            df, selected_columns, title
+        )
+    
+    def create_full_report(self, df, selected_columns, benchmarks=None, sections=None, title=None):
+        """
+        Create one report combining all analyses (see report.report_full).
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing the data
+            selected_columns (list): List of columns to include in the report
+            benchmarks (dict, optional): Benchmark values for the international section
+            sections (list, optional): Section names to include (default: all available)
+            title (str, optional): Report title
+            
+        Returns:
+            tuple: (doc, docx_bytes, filename)
+        """
+        return self.full_generator.create_report(
+            df, selected_columns, benchmarks, sections, title
         )
     
     def offer_download(self, docx_bytes, filename):
@@ -11,7 +11,7 @@ class ZeroScoresReportGenerator(BaseReportGenerator):
     Report generator for zero scores analysis (analyse2.py).
     """
     
-    def create_report(self, df, selected_columns, title=None, temp_dir=None):
+    def create_report(self, df, selected_columns, title=None):
         """
         Create a zero scores analysis report.
         
@@ -19,7 +19,6 @@ class ZeroScoresReportGenerator(BaseReportGenerator):
             df: DataFrame with data
             selected_columns: List of columns to include
             title: Report title
-            temp_dir: Directory for temporary files
             
         Returns:
             tuple: (doc, docx_bytes, filename)
@@ -28,8 +27,27 @@ class ZeroScoresReportGenerator(BaseReportGenerator):
         title, doc = self._common_setup(title, "title_zero_scores")
         filename = "zero_scores_report.docx"
         
+        # Add the analysis sections
+        self.add_content(df, selected_columns)
+        
+        # Set up headers and footers
+        self.word_gen.setup_headers_and_footers(title=title)
+        
+        # Save document and return
+        doc, docx_bytes = self._save_and_get_bytes(doc, filename)
+        
+        return doc, docx_bytes, filename
+    
+    def add_content(self, df, selected_columns):
+        """
+        Add the zero scores sections to the current report.
+        
+        Args:
+            df: DataFrame with data
+            selected_columns: List of columns to include
+        """
         # Calculate zero scores
-        zero_scores = (df[selected_columns] == 0).sum()
+        zero_scores = self._aggregates(df).zero_counts(selected_columns)
         total_students = len(df)
         percentage_zero = ((zero_scores / total_students) * 100).round(2)
         
@@ -48,11 +66,12 @@ class ZeroScoresReportGenerator(BaseReportGenerator):
         fig = self.viz.show_zero_scores_chart(
             df_zero_scores,
             df_zero_scores["Task"].tolist(),
-            df_zero_scores["Percentage"].tolist()
+            df_zero_scores["Percentage"].tolist(),
+            display=False
         )
         
         # Save figure for inclusion in report
-        img_path = self.viz.save_figure_for_word(fig, "zero_scores_chart.png")
+        img_path = self._figure_image(fig, "zero_scores_chart.png")
         
         # Add executive summary
         summary_text = get_text("zero_scores_summary", 
@@ -157,14 +176,6 @@ class ZeroScoresReportGenerator(BaseReportGenerator):
         self.word_gen.add_bullet_point(get_text("general_rec1", "Conduct regular progress monitoring assessments."))
         self.word_gen.add_bullet_point(get_text("general_rec2", "Use formative assessments to adjust instruction."))
         self.word_gen.add_bullet_point(get_text("general_rec3", "Re-assess all skills after 8-10 weeks of intervention."))
-        
-        # Set up headers and footers
-        self.word_gen.setup_headers_and_footers(title=title)
-        
-        # Save document and return
-        doc, docx_bytes = self._save_and_get_bytes(doc, temp_dir, filename)
-        
-        return doc, docx_bytes, filename
     
     def _get_skill_recommendation(self, task_code, level):
         """
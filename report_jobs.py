@@ -0,0 +1,666 @@
+# report_jobs.py
+# Background Word report generation: exports are submitted as jobs to a thread
+# pool, their progress is polled and the finished documents are kept for download
+
+import atexit
+import functools
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cache_utils import LRUCache, DiskLRUCache, make_cache_key, dataframe_fingerprint
+from language_utils import get_current_language, report_language
+from word_report import document_to_bytes
+
+logger = logging.getLogger(__name__)
+
+# Number of reports generated at the same time (figure rendering has its own pool)
+REPORT_WORKERS = 2
+# Total size of the finished documents kept for download
+REPORT_RESULTS_BYTES = 256 * 1024 * 1024
+# Interval at which the page polls a running job, in seconds
+REPORT_POLL_SECONDS = 1.0
+# Time a finished job (and its document) is kept after it ends, in seconds
+REPORT_JOB_TTL_SECONDS = 60 * 60
+# Finished documents reused for identical exports: kept in memory, then on disk
+REPORT_CACHE_MEMORY_BYTES = 128 * 1024 * 1024
+REPORT_CACHE_DISK_BYTES = 1024 * 1024 * 1024
+# Directory of the spilled documents (None: a private directory created for the
+# process and removed at exit, since the documents hold student data)
+REPORT_CACHE_DIR = None
+# Problems of a report shown next to its download (the others are only logged)
+REPORT_ISSUES_SHOWN = 10
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_current = threading.local()
+
+
+def report_progress(fraction, message=None):
+    """
+    Report the progress of the report being generated in this thread.
+
+    Does nothing when called outside a report job, so report builders can call
+    it unconditionally.
+
+    Args:
+        fraction (float): Share of the work done (0-1)
+        message (str, optional): Current step
+    """
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job.progress = min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            job.message = message
+
+
+def report_issue(message, level="error"):
+    """
+    Report a problem met while building a report or figure.
+
+    In a report job the message is logged and kept with the job, whose page
+    shows it once the job has finished (report threads cannot draw on the
+    page); elsewhere it is shown with st.error or st.warning.
+
+    Args:
+        message (str): Problem
+        level (str): "error" or "warning"
+    """
+    job = getattr(_current, "job", None)
+    if job is None:
+        (st.warning if level == "warning" else st.error)(message)
+        return
+    if level == "warning":
+        logger.warning(f"Report '{job.name}': {message}")
+    else:
+        logger.error(f"Report '{job.name}': {message}")
+    job.issues.append((level, message))
+
+
+def job_context():
+    """
+    Capture what a thread helping with the current report needs (see run_in_job_context).
+
+    Returns:
+        tuple: (job or None, language code)
+    """
+    return getattr(_current, "job", None), get_current_language()
+
+
+def run_in_job_context(context, function, *args):
+    """
+    Call function(*args) in this thread as part of the report of context.
+
+    Progress and problems go to the job and translations use its language.
+
+    Args:
+        context (tuple): Result of job_context() in the report thread
+        function (callable): Function to call
+        *args: Its arguments
+
+    Returns:
+        The result of function
+    """
+    job, language = context
+    previous = getattr(_current, "job", None)
+    _current.job = job
+    try:
+        with report_language(language):
+            return function(*args)
+    finally:
+        _current.job = previous
+
+
+def _is_file(value):
+    return hasattr(value, "read") and hasattr(value, "seek")
+
+
+def _to_result(result):
+    """
+    Convert what a report builder returned (document, bytes, file or tuple) to bytes or a file.
+
+    Files (documents streamed to disk, see docx_stream) are kept as they are
+    so that the document is not read into memory.
+    """
+    if isinstance(result, (bytes, bytearray)):
+        return bytes(result)
+    if _is_file(result):
+        return result
+    if hasattr(result, "save"):
+        return document_to_bytes(result)
+    if isinstance(result, (tuple, list)):
+        for item in result:
+            if isinstance(item, (bytes, bytearray)):
+                return bytes(item)
+        for item in result:
+            if _is_file(item):
+                return item
+        for item in result:
+            if hasattr(item, "save"):
+                return document_to_bytes(item)
+    raise TypeError(f"Report builder returned {type(result).__name__}, expected a document, bytes or a file")
+
+
+def _result_size(data):
+    """Size in bytes of a document (bytes or file)."""
+    if _is_file(data):
+        return os.fstat(data.fileno()).st_size
+    return len(data)
+
+
+def _memory_size(data):
+    """Memory held by a document (files stay on disk)."""
+    return 0 if _is_file(data) else len(data)
+
+
+def _close_result(data):
+    if _is_file(data):
+        data.close()
+
+
+# Serialises the reads of document files (downloads run in their own threads)
+_file_lock = threading.Lock()
+
+
+def _read_file(fileobj):
+    """Read a document file for its download."""
+    with _file_lock:
+        fileobj.seek(0)
+        return fileobj.read()
+
+
+class _NoFingerprint(Exception):
+    """Raised for a report builder argument whose content cannot be identified."""
+
+
+def _fingerprint(value):
+    """
+    Reduce a report builder argument to a short, content-based identifier.
+
+    Raises:
+        _NoFingerprint: For values of other types (their str() may not
+            reflect their whole content)
+    """
+    if isinstance(value, pd.DataFrame):
+        return dataframe_fingerprint(value)
+    if isinstance(value, pd.Series):
+        return dataframe_fingerprint(value.to_frame())
+    if hasattr(value, "data") and isinstance(value.data, pd.DataFrame):
+        # pandas Styler: the styles follow from the data
+        return dataframe_fingerprint(value.data)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return make_cache_key([_fingerprint(item) for item in value.ravel()], value.shape)
+        digest = hashlib.sha256(np.ascontiguousarray(value).view(np.uint8)).hexdigest()
+        return make_cache_key(digest, str(value.dtype), value.shape)
+    if isinstance(value, np.generic):
+        return _fingerprint(value.item())
+    if hasattr(value, "to_json"):
+        # Plotly figure
+        return hashlib.sha256(value.to_json().encode("utf-8")).hexdigest()
+    if isinstance(value, dict):
+        return make_cache_key({str(k): _fingerprint(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return make_cache_key([_fingerprint(item) for item in value])
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (str, bytes)):
+        return hashlib.sha256(value if isinstance(value, bytes) else value.encode("utf-8")).hexdigest()
+    raise _NoFingerprint(type(value).__name__)
+
+
+def report_cache_key(name, build, args=(), kwargs=None):
+    """
+    Build the cache key of a report from everything that determines its content.
+
+    DataFrames are identified by their content fingerprint and figures by their
+    JSON, so the key changes with the dataset version, the selected columns,
+    the language (translations), the AI interpretation text and any other
+    argument. The current date is included because it is printed in the report.
+
+    Reports are not cached (no key) when the builder is a closure, whose
+    captured variables are not part of the key, or when an argument is of a
+    type whose content cannot be identified.
+
+    Args:
+        name (str): Export name
+        build (callable): Report builder
+        args (tuple): Positional arguments of build
+        kwargs (dict, optional): Keyword arguments of build
+
+    Returns:
+        str or None: Hex digest, or None if the report cannot be cached
+    """
+    if getattr(build, "__closure__", None):
+        logger.debug(f"Report '{name}' not cached: its builder is a closure")
+        return None
+    try:
+        fingerprints = (_fingerprint(list(args)), _fingerprint(kwargs or {}))
+    except _NoFingerprint as e:
+        logger.debug(f"Report '{name}' not cached: {str(e)} argument")
+        return None
+    return make_cache_key(
+        "report",
+        name,
+        f"{getattr(build, '__module__', '')}.{getattr(build, '__qualname__', build)}",
+        *fingerprints,
+        date.today().isoformat()
+    )
+
+
+class ReportArtifactCache:
+    """
+    Finished report documents by content key.
+
+    The most recently used documents stay in memory; documents evicted from
+    memory are spilled to a size-bounded directory on disk.
+    """
+
+    def __init__(self, memory_bytes=REPORT_CACHE_MEMORY_BYTES, disk_bytes=REPORT_CACHE_DISK_BYTES,
+                 directory=REPORT_CACHE_DIR):
+        """
+        Initialize the cache.
+
+        Args:
+            memory_bytes (int): Maximum size of the documents kept in memory
+            disk_bytes (int): Maximum size of the documents kept on disk
+            directory (str, optional): Directory for spilled documents (default:
+                a private temporary directory removed at exit)
+        """
+        try:
+            if directory is None:
+                directory = tempfile.mkdtemp(prefix="datavizir_report_cache_")
+                atexit.register(shutil.rmtree, directory, ignore_errors=True)
+            self._disk = DiskLRUCache(directory, max_bytes=disk_bytes, suffix=".report")
+        except OSError as e:
+            logger.warning(f"Report disk cache unavailable: {str(e)}")
+            self._disk = None
+
+        # Guards the hit and miss counters (lookups come from several threads)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._memory = LRUCache(
+            max_entries=10000,
+            max_bytes=memory_bytes,
+            size_of=len,
+            on_evict=self._spill
+        )
+
+    def get(self, key):
+        """
+        Return the cached document for key or None.
+
+        Returns:
+            tuple: (bytes or None, "memory", "disk" or None)
+        """
+        data = self._memory.get(key)
+        source = "memory" if data is not None else None
+        if data is None and self._disk is not None:
+            data = self._disk.get(key)
+            if data is not None:
+                source = "disk"
+                self._memory.set(key, data)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data, source
+
+    def set(self, key, data):
+        """Store a finished document (a file is copied straight to the disk cache)."""
+        if _is_file(data):
+            if self._disk is not None:
+                self._disk.set_file(key, data)
+            return
+        self._memory.set(key, data)
+
+    def _spill(self, key, data):
+        if self._disk is not None:
+            self._disk.set(key, data)
+
+    def clear(self):
+        """Remove all cached documents from memory and disk."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: overall hits, misses and hit_rate, plus memory and disk
+                statistics (see LRUCache.stats)
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory": self._memory.stats(),
+            "disk": self._disk.stats() if self._disk is not None else None
+        }
+
+
+class ReportJob:
+    """State of one report generation job."""
+
+    def __init__(self, name):
+        """
+        Initialize the job.
+
+        Args:
+            name (str): Report name (for logs and display)
+        """
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = "queued"  # queued, running, done, failed, expired
+        self.progress = 0.0
+        self.message = None
+        self.error = None
+        self.issues = []  # (level, message) reported by the builder, see report_issue
+        self.cache_source = None  # "memory" or "disk" when served from the report cache
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "expired")
+
+    @property
+    def elapsed(self):
+        """Seconds spent running (so far, or in total once finished)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class ReportJobService:
+    """
+    Runs report builders on a thread pool and keeps the finished documents.
+
+    Jobs outlive Streamlit reruns: the page only keeps the job id and polls it.
+    Finished jobs are forgotten job_ttl seconds after they end.
+    """
+
+    def __init__(self, max_workers=REPORT_WORKERS, max_result_bytes=REPORT_RESULTS_BYTES, cache=None,
+                 job_ttl=REPORT_JOB_TTL_SECONDS):
+        """
+        Initialize the service.
+
+        Args:
+            max_workers (int): Number of reports generated at the same time
+            max_result_bytes (int): Total size of the finished documents kept
+            cache (ReportArtifactCache, optional): Cache of documents by content
+                key (a default one is created)
+            job_ttl (float): Seconds a finished job is kept after it ends
+        """
+        self.cache = cache if cache is not None else ReportArtifactCache()
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._results = LRUCache(
+            max_entries=1024,
+            max_bytes=max_result_bytes,
+            size_of=_memory_size,
+            on_evict=self._expire
+        )
+
+    def _expire(self, job_id, data):
+        _close_result(data)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.status = "expired"
+
+    def _prune(self):
+        """Forget the jobs (and documents) finished more than job_ttl seconds ago."""
+        cutoff = time.time() - self.job_ttl
+        with self._lock:
+            old_ids = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in old_ids:
+                del self._jobs[job_id]
+        for job_id in old_ids:
+            _close_result(self._results.pop(job_id))
+
+    def submit(self, name, build, *args, cache_key=None, **kwargs):
+        """
+        Queue a report for generation.
+
+        Args:
+            name (str): Report name
+            build (callable): Function creating the report; may return a
+                docx Document, bytes, a file (kept as is, see docx_stream)
+                or a tuple containing one of them
+            *args, **kwargs: Arguments passed to build
+            cache_key (str, optional): Content key of the report (see
+                report_cache_key); a cached document is served without
+                running build
+
+        Returns:
+            str: Job id
+        """
+        self._prune()
+        job = ReportJob(name)
+        with self._lock:
+            self._jobs[job.id] = job
+
+        if cache_key is not None:
+            data, source = self.cache.get(cache_key)
+            if data is not None:
+                job.started_at = job.finished_at = time.time()
+                job.cache_source = source
+                job.progress = 1.0
+                self._results.set(job.id, data)
+                job.status = "done"
+                logger.info(f"Report '{name}' served from the {source} cache ({len(data)} bytes)")
+                return job.id
+
+        # The worker has no access to the session state: pass it the language
+        self._executor.submit(self._run, job, get_current_language(), build, args, kwargs, cache_key)
+        return job.id
+
+    def _run(self, job, language, build, args, kwargs, cache_key=None):
+        _current.job = job
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            with report_language(language):
+                data = _to_result(build(*args, **kwargs))
+            if cache_key is not None:
+                self.cache.set(cache_key, data)
+            self._results.set(job.id, data)
+            job.progress = 1.0
+            job.status = "done"
+            logger.info(f"Report '{job.name}' generated in {job.elapsed:.1f}s ({_result_size(data)} bytes)")
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            logger.error(f"Report '{job.name}' failed: {str(e)}")
+        finally:
+            job.finished_at = time.time()
+            _current.job = None
+
+    def get(self, job_id):
+        """
+        Get a job.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            ReportJob or None: The job, or None if unknown
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def result(self, job_id):
+        """
+        Get the document of a finished job.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            bytes, file or None: The document (a file when the report was
+                streamed to disk), or None if not (or no longer) available
+        """
+        return self._results.get(job_id)
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for the running ones."""
+        self._executor.shutdown(wait=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_report_service():
+    """
+    Get the process-wide report service (shared by all sessions).
+
+    Returns:
+        ReportJobService: The service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReportJobService()
+        return _service
+
+
+def _show_finished_job(job, service, file_name, t, download_label, key, mime):
+    """Display the download button or the error of a finished job."""
+    if job.status == "done":
+        data = service.result(job.id)
+        if data is not None:
+            if _is_file(data):
+                # Read only when the button is clicked
+                data = functools.partial(_read_file, data)
+            st.download_button(
+                download_label or t.get("download_word", "📥 Download Word Report"),
+                data,
+                file_name,
+                mime,
+                key=f"report_job_{key}_download"
+            )
+            if job.cache_source is not None:
+                st.caption(t.get("report_cache_hit", "⚡ Served from the report cache ({source})").format(
+                    source=t.get(f"report_cache_{job.cache_source}", job.cache_source)
+                ))
+            else:
+                st.caption(t.get("report_job_time", "Generated in {seconds:.1f} s").format(seconds=job.elapsed))
+            _show_job_issues(job, t)
+            return
+        job.status = "expired"
+
+    if job.status == "expired":
+        st.info(t.get("report_job_expired", "This report is no longer available; please export it again."))
+    else:
+        st.error(f"Error creating Word report: {job.error}")
+        _show_job_issues(job, t)
+
+
+def _show_job_issues(job, t):
+    """Display the problems reported while the job's document was built."""
+    for level, message in job.issues[:REPORT_ISSUES_SHOWN]:
+        (st.warning if level == "warning" else st.error)(message)
+    hidden = len(job.issues) - REPORT_ISSUES_SHOWN
+    if hidden > 0:
+        st.caption(t.get("report_job_more_issues", "{n} more problems were written to the log").format(n=hidden))
+
+
+@st.fragment(run_every=REPORT_POLL_SECONDS)
+def _poll_job(job_id, t):
+    """Refresh the progress of a running job; rerun the page once it finishes."""
+    job = get_report_service().get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+
+    text = job.message or t.get("report_job_running", "Generating report... ({seconds:.0f} s)").format(seconds=job.elapsed)
+    if job.status == "queued":
+        text = t.get("report_job_queued", "Waiting for a free report worker...")
+    st.progress(job.progress, text=text)
+
+
+def report_export_button(label, key, build, file_name, t, download_label=None, args=(), kwargs=None,
+                         mime=DOCX_MIME, **button_kwargs):
+    """
+    Display an export button that generates a Word report in the background.
+
+    The job id is kept in the session, so the report survives reruns; its
+    progress is polled until the download button appears. A report already
+    generated from the same inputs is served from the report cache.
+
+    Args:
+        label (str): Button label
+        key (str): Unique key of this export on the page
+        build (callable): Function creating the report (see ReportJobService.submit)
+        file_name (str): Download file name
+        t (dict): Translation dictionary
+        download_label (str, optional): Download button label
+        args (tuple): Positional arguments of build
+        kwargs (dict, optional): Keyword arguments of build
+        mime (str): MIME type of the download (a Word document by default)
+        **button_kwargs: Extra st.button arguments (e.g. use_container_width)
+    """
+    service = get_report_service()
+    state_key = f"report_job_{key}"
+
+    if st.button(label, key=f"{state_key}_button", **button_kwargs):
+        cache_key = report_cache_key(key, build, args, kwargs)
+        st.session_state[state_key] = service.submit(key, build, *args, cache_key=cache_key, **(kwargs or {}))
+
+    job_id = st.session_state.get(state_key)
+    job = service.get(job_id) if job_id is not None else None
+    if job is None:
+        return
+
+    if job.finished:
+        _show_finished_job(job, service, file_name, t, download_label, key, mime)
+    else:
+        _poll_job(job_id, t)
+
+
+def show_report_cache_stats(t):
+    """
+    Display report cache statistics in the sidebar once reports have been exported.
+
+    Args:
+        t (dict): Translation dictionary
+    """
+    stats = get_report_service().cache.stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+
+    with st.sidebar.expander(t.get("report_cache_title", "📄 Report cache")):
+        st.write(f"{t.get('report_cache_hit_rate', 'Hit rate')}: {stats['hit_rate']:.0%} "
+                 f"({stats['hits']} / {stats['hits'] + stats['misses']})")
+        st.write(f"{t.get('report_cache_memory', 'In memory')}: {stats['memory']['entries']} "
+                 f"({stats['memory']['bytes'] / 1024 / 1024:.1f} MB)")
+        if stats["disk"] is not None:
+            st.write(f"{t.get('report_cache_disk', 'On disk')}: {stats['disk']['entries']} "
+                     f"({stats['disk']['bytes'] / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,215 @@
+# school_ranking.py
+# School ranking charts built from per-school aggregates, so that their cost
+# depends on the number of schools and not on the number of pupils
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from scipy import stats
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint
+from viz_utils import COLOR_SCHEMES, aggregated_box_trace
+
+# Per-school aggregates keyed by data fingerprint, variable and grouping
+_AGGREGATES_CACHE = LRUCache(max_entries=128)
+
+# Colors of schools above, below and not different from the overall mean
+RANKING_COLORS = {"above": "#59A14F", "below": "#E15759", "average": "#4E79A7"}
+
+def school_aggregates(df, column, school_col="school", confidence=0.95):
+    """
+    Compute per-school statistics of a variable in one grouped pass.
+
+    Args:
+        df (pandas.DataFrame): The data to analyze
+        column (str): Variable to summarise
+        school_col (str): School identifier column
+        confidence (float): Confidence level of the mean intervals
+
+    Returns:
+        pandas.DataFrame: One row per school (index), sorted by mean, with n, mean,
+            sd, se, ci_lower, ci_upper, q1, median, q3, lowerfence, upperfence and
+            rank (1 = highest mean)
+    """
+    key = make_cache_key(
+        "school_aggregates", dataframe_fingerprint(df, [school_col, column]), column, school_col, confidence
+    )
+
+    def _compute():
+        valid = df[[school_col, column]].dropna()
+        grouped = valid.groupby(school_col, observed=True)[column]
+
+        aggregates = grouped.agg(n="count", mean="mean", sd="std")
+        quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+        aggregates["q1"] = quartiles[0.25]
+        aggregates["median"] = quartiles[0.5]
+        aggregates["q3"] = quartiles[0.75]
+
+        # Whiskers: most extreme values within 1.5 IQR of each school's box
+        iqr = aggregates["q3"] - aggregates["q1"]
+        schools = valid[school_col]
+        low = schools.map(aggregates["q1"] - 1.5 * iqr).astype(float)
+        high = schools.map(aggregates["q3"] + 1.5 * iqr).astype(float)
+        inside = valid[(valid[column] >= low) & (valid[column] <= high)]
+        fences = inside.groupby(school_col, observed=True)[column].agg(["min", "max"])
+        aggregates["lowerfence"] = fences["min"]
+        aggregates["upperfence"] = fences["max"]
+
+        aggregates["se"] = aggregates["sd"] / np.sqrt(aggregates["n"])
+        t_crit = stats.t.ppf((1 + confidence) / 2, np.maximum(aggregates["n"] - 1, 1))
+        aggregates["ci_lower"] = aggregates["mean"] - t_crit * aggregates["se"].fillna(0)
+        aggregates["ci_upper"] = aggregates["mean"] + t_crit * aggregates["se"].fillna(0)
+        aggregates["rank"] = aggregates["mean"].rank(ascending=False, method="min").astype(int)
+
+        return aggregates.sort_values("mean")
+
+    return _AGGREGATES_CACHE.get_or_compute(key, _compute)
+
+def select_schools(aggregates, n=10, mode="both"):
+    """
+    Select the highest and/or lowest ranked schools.
+
+    Args:
+        aggregates (pandas.DataFrame): Output of school_aggregates
+        n (int): Number of schools taken from each end
+        mode (str): "top", "bottom" or "both"
+
+    Returns:
+        pandas.DataFrame: Selected rows, sorted by mean
+    """
+    if mode == "top":
+        return aggregates.tail(n)
+    if mode == "bottom":
+        return aggregates.head(n)
+    if len(aggregates) <= 2 * n:
+        return aggregates
+    return pd.concat([aggregates.head(n), aggregates.tail(n)])
+
+def create_caterpillar_plot(aggregates, t, title, yaxis_title):
+    """
+    Plot every school's mean with its confidence interval, ordered by mean.
+
+    Schools whose interval lies entirely above or below the overall mean are
+    highlighted.
+
+    Args:
+        aggregates (pandas.DataFrame): Output of school_aggregates
+        t (dict): Translation dictionary
+        title (str): Figure title
+        yaxis_title (str): Y-axis title
+
+    Returns:
+        plotly.graph_objects.Figure: Caterpillar plot
+    """
+    overall_mean = np.average(aggregates["mean"], weights=aggregates["n"])
+    position = np.arange(1, len(aggregates) + 1)
+    status = np.where(
+        aggregates["ci_lower"] > overall_mean, "above",
+        np.where(aggregates["ci_upper"] < overall_mean, "below", "average")
+    )
+    status_labels = {
+        "above": t.get("above_average", "Above average"),
+        "below": t.get("below_average", "Below average"),
+        "average": t.get("not_different", "Not different from average")
+    }
+
+    fig = go.Figure()
+    for key, label in status_labels.items():
+        mask = status == key
+        if not mask.any():
+            continue
+        subset = aggregates[mask]
+        fig.add_trace(go.Scatter(
+            x=position[mask],
+            y=subset["mean"],
+            mode="markers",
+            name=label,
+            marker=dict(color=RANKING_COLORS[key], size=5),
+            error_y=dict(
+                type="data",
+                symmetric=False,
+                array=subset["ci_upper"] - subset["mean"],
+                arrayminus=subset["mean"] - subset["ci_lower"],
+                thickness=1,
+                width=0
+            ),
+            customdata=np.column_stack([subset.index.astype(str), subset["n"], subset["rank"]]),
+            hovertemplate=(
+                f"%{{customdata[0]}}<br>{t.get('mean', 'Mean')}: %{{y:.2f}}"
+                f"<br>n = %{{customdata[1]}}<br>{t.get('rank', 'Rank')}: %{{customdata[2]}}<extra></extra>"
+            )
+        ))
+
+    fig.add_hline(
+        y=overall_mean,
+        line_dash="dash",
+        line_color="black",
+        annotation_text=t.get("overall_mean", "Overall mean")
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title=t.get("schools_ranked", "Schools (ranked by mean)"),
+        yaxis_title=yaxis_title,
+        xaxis=dict(showticklabels=False),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=500
+    )
+    return fig
+
+def create_school_means_histogram(aggregates, t, title, xaxis_title, bins=30):
+    """
+    Plot the distribution of school means as server-side bin counts.
+
+    Args:
+        aggregates (pandas.DataFrame): Output of school_aggregates
+        t (dict): Translation dictionary
+        title (str): Figure title
+        xaxis_title (str): X-axis title
+        bins (int): Number of bins
+
+    Returns:
+        plotly.graph_objects.Figure: Histogram of school means
+    """
+    counts, edges = np.histogram(aggregates["mean"].to_numpy(dtype=float), bins=bins)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=COLOR_SCHEMES["categorical"][0],
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate=f"%{{customdata[0]:.1f}} – %{{customdata[1]:.1f}}<br>{t.get('schools', 'Schools')}: %{{y}}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=t.get("number_of_schools", "Number of schools"),
+        bargap=0,
+        height=400
+    )
+    return fig
+
+def create_ranked_box_plot(aggregates, t, title, yaxis_title):
+    """
+    Draw one box per selected school from its precomputed quartiles.
+
+    Args:
+        aggregates (pandas.DataFrame): Selected rows of school_aggregates
+        t (dict): Translation dictionary
+        title (str): Figure title
+        yaxis_title (str): Y-axis title
+
+    Returns:
+        plotly.graph_objects.Figure: Box plot ordered by school mean
+    """
+    colors = COLOR_SCHEMES["categorical"]
+    fig = go.Figure()
+    for i, (school, row) in enumerate(aggregates.iterrows()):
+        fig.add_trace(aggregated_box_trace(row, school, color=colors[i % len(colors)]))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=t.get("school", "School"),
+        yaxis_title=yaxis_title,
+        xaxis=dict(type="category", tickangle=-45),
+        height=450
+    )
+    return fig
@@ -4,8 +4,7 @@ import logging
 import os
 from datetime import datetime
 import traceback
-import matplotlib.pyplot as plt
-import seaborn as sns
+import plotly.graph_objects as go
 from typing import List, Dict, Optional, Tuple, Union, Any, Callable
 import streamlit as st
 
@@ -29,6 +28,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("datavizir_validation")
 
+# Missingness view: number of row blocks and of co-missingness patterns shown
+MISSING_ROW_BLOCKS = 50
+MISSING_TOP_PATTERNS = 15
+
 # Define assessment-specific constants
 VALID_SCORE_RANGES = {
     # EGRA variables
@@ -451,43 +454,150 @@ class DataValidator:
         
         return result_df
     
-    def plot_missing_values(self, df):
+    def missingness_matrix(self, df, group_col=None, n_blocks=MISSING_ROW_BLOCKS):
         """
-        Create a visualization of missing values.
+        Compute missing rates per column and row block (or group) over the whole
+        DataFrame.
         
         Args:
-            df (pd.DataFrame): DataFrame to visualize
+            df (pd.DataFrame): DataFrame to analyze
+            group_col (str, optional): Aggregate per value of this column (e.g.
+                school) instead of per block of consecutive rows
+            n_blocks (int): Number of row blocks
             
         Returns:
-            matplotlib.figure.Figure: Missing values heatmap
+            pd.DataFrame: Missing rate (0-1) with one row per block or group and
+                one column per column having missing values
         """
-        # Create a mask of missing values
-        plt.figure(figsize=(10, 6))
-        plt.title('Missing Values Heatmap')
+        na_cols = [col for col in df.columns if col != group_col]
+        mask = df[na_cols].isna()
+        na_cols = mask.columns[mask.to_numpy().any(axis=0)]
+        mask = mask[na_cols]
+        
+        if group_col is not None:
+            return mask.groupby(df[group_col].astype(str).to_numpy()).mean()
+        
+        # Sum the mask over contiguous blocks of rows in one pass
+        n_rows = len(mask)
+        n_blocks = max(1, min(n_blocks, n_rows))
+        starts = np.arange(n_blocks) * n_rows // n_blocks
+        counts = np.add.reduceat(mask.to_numpy(dtype=np.int64), starts, axis=0) if n_rows else np.zeros((0, len(na_cols)))
+        sizes = np.diff(np.append(starts, n_rows))
+        labels = [f"{start + 1}-{start + size}" for start, size in zip(starts, sizes)]
+        return pd.DataFrame(counts / sizes[:, None], index=labels, columns=na_cols)
+    
+    def missingness_patterns(self, df, top=MISSING_TOP_PATTERNS):
+        """
+        Count co-missingness patterns (sets of columns missing together).
         
-        # Only show columns with at least some missing values
-        na_cols = [col for col in df.columns if df[col].isna().any()]
+        Each row's missing mask is packed into a bitset, so counting the
+        patterns is a single unique over fixed-size byte strings.
         
-        if na_cols:
-            # Create a subset of the DataFrame with only columns that have missing values
-            miss_df = df[na_cols].isna()
+        Args:
+            df (pd.DataFrame): DataFrame to analyze
+            top (int): Number of most frequent patterns returned
             
-            # Limit to max 100 rows for visualization
-            if len(miss_df) > 100:
-                miss_df = miss_df.iloc[:100]
+        Returns:
+            tuple: (pd.DataFrame of patterns with one boolean column per column
+                having missing values plus 'count' and 'percentage', sorted by
+                count; number of distinct patterns)
+        """
+        mask = df.isna()
+        na_cols = mask.columns[mask.to_numpy().any(axis=0)]
+        mask = mask[na_cols].to_numpy()
+        if len(na_cols) == 0 or len(mask) == 0:
+            return pd.DataFrame(columns=list(na_cols) + ['count', 'percentage']), 0
+        
+        bitsets = np.packbits(mask, axis=1)
+        rows = np.ascontiguousarray(bitsets).view(np.dtype((np.void, bitsets.shape[1]))).ravel()
+        unique_rows, first_index, counts = np.unique(rows, return_index=True, return_counts=True)
+        order = np.argsort(counts)[::-1][:top]
+        
+        patterns = pd.DataFrame(mask[first_index[order]], columns=na_cols)
+        patterns['count'] = counts[order]
+        patterns['percentage'] = (counts[order] / len(mask) * 100).round(2)
+        return patterns, len(unique_rows)
+    
+    def plot_missing_values(self, df, group_col=None, n_blocks=MISSING_ROW_BLOCKS):
+        """
+        Create a visualization of missing values over the whole DataFrame.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to visualize
+            group_col (str, optional): Show one row per value of this column
+                instead of blocks of consecutive rows
+            n_blocks (int): Number of row blocks
             
-            # Plot heatmap
-            sns.heatmap(miss_df, cbar=False, cmap='viridis')
-            plt.xlabel('Columns')
-            plt.ylabel('Rows')
-            plt.tight_layout()
+        Returns:
+            plotly.graph_objects.Figure: Heatmap of missing rates
+        """
+        rates = self.missingness_matrix(df, group_col=group_col, n_blocks=n_blocks)
+        
+        fig = go.Figure()
+        if rates.empty or rates.shape[1] == 0:
+            fig.add_annotation(text=get_text("no_missing_values", "No missing values"), x=0.5, y=0.5,
+                               xref="paper", yref="paper", showarrow=False, font=dict(size=14))
+            fig.update_layout(xaxis_visible=False, yaxis_visible=False, height=300)
+            return fig
+        
+        fig.add_trace(go.Heatmap(
+            z=rates.to_numpy() * 100,
+            x=[str(col) for col in rates.columns],
+            y=[str(idx) for idx in rates.index],
+            colorscale='Viridis',
+            zmin=0,
+            zmax=100,
+            colorbar=dict(title="%"),
+            hovertemplate="%{x}<br>%{y}<br>%{z:.1f}%<extra></extra>"
+        ))
+        fig.update_layout(
+            title=get_text("missing_values_heatmap", "Missing Values Heatmap"),
+            xaxis_title=get_text("columns", "Columns"),
+            yaxis_title=group_col if group_col is not None else get_text("rows", "Rows"),
+            yaxis=dict(autorange="reversed", type="category"),
+            height=min(900, max(400, 12 * len(rates)))
+        )
+        return fig
+    
+    def plot_missing_patterns(self, df, top=MISSING_TOP_PATTERNS):
+        """
+        Create a visualization of the most frequent co-missingness patterns.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to visualize
+            top (int): Number of patterns shown
             
-            return plt.gcf()
-        else:
-            # No missing values
-            plt.text(0.5, 0.5, 'No missing values', ha='center', va='center', fontsize=14)
-            plt.tight_layout()
-            return plt.gcf()
+        Returns:
+            plotly.graph_objects.Figure or None: One row per pattern (missing
+                cells highlighted, labelled with its number of rows), or None if
+                there are no missing values
+        """
+        patterns, n_patterns = self.missingness_patterns(df, top=top)
+        if patterns.empty:
+            return None
+        
+        columns = [col for col in patterns.columns if col not in ('count', 'percentage')]
+        labels = [f"{count} ({percentage}%)" for count, percentage in zip(patterns['count'], patterns['percentage'])]
+        
+        fig = go.Figure(go.Heatmap(
+            z=patterns[columns].to_numpy(dtype=int),
+            x=[str(col) for col in columns],
+            y=[f"#{i + 1}: {label}" for i, label in enumerate(labels)],
+            colorscale=[[0, "#EBEBEB"], [1, "#A63603"]],
+            zmin=0,
+            zmax=1,
+            showscale=False,
+            xgap=1,
+            ygap=1,
+            hovertemplate="%{x}<br>%{y}<extra></extra>"
+        ))
+        fig.update_layout(
+            title=get_text("missing_patterns_title", "Most frequent missing value patterns ({} distinct)").format(n_patterns),
+            xaxis_title=get_text("columns", "Columns"),
+            yaxis=dict(autorange="reversed", type="category"),
+            height=max(300, 28 * len(patterns) + 150)
+        )
+        return fig
 
 class ErrorHandler:
     """Class for handling errors in a consistent way across the application."""
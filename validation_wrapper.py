@@ -400,8 +400,15 @@ class StandardValidator:
         
         # Option to visualize missing values
         if st.checkbox(get_text("visualize_missing", "Visualize missing values")):
-            missing_fig = self.validator.plot_missing_values(df)
-            st.pyplot(missing_fig)
+            group_col = None
+            if "school" in df.columns:
+                by_school = st.checkbox(get_text("missing_by_school", "By school"))
+                group_col = "school" if by_school else None
+            missing_fig = self.validator.plot_missing_values(df, group_col=group_col)
+            st.plotly_chart(missing_fig, use_container_width=True)
+            patterns_fig = self.validator.plot_missing_patterns(df)
+            if patterns_fig is not None:
+                st.plotly_chart(patterns_fig, use_container_width=True)
         
         return missing_report
     
@@ -1,12 +1,14 @@
 import plotly.express as px
 import plotly.graph_objects as go
-import plotly.figure_factory as ff
 import numpy as np
 import pandas as pd
 from scipy import stats
 import tempfile
 import os
 from pathlib import Path
+from figure_export import write_figure, render_figure
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint
+from config import HEATMAP_FULL_TEXT_CELLS, HEATMAP_MAX_TEXT_CELLS, HEATMAP_TEXT_THRESHOLD
 
 # Define standard color schemes that are colorblind-friendly
 # Based on ColorBrewer and IBM Design Library
@@ -19,6 +21,212 @@ COLOR_SCHEMES = {
     "binary": ["#4E79A7", "#F28E2B"]  # For binary comparisons (e.g., gender)
 }
 
+# Maximum number of outlier points drawn per box (the most extreme are kept)
+MAX_BOX_OUTLIERS = 200
+
+# Hierarchical clustering orders keyed by correlation matrix content
+_CLUSTER_ORDER_CACHE = LRUCache(max_entries=64)
+
+def histogram_aggregates(values, bins=20):
+    """
+    Compute histogram bin counts on the server.
+    
+    Args:
+        values (array-like): Values to bin (missing values are ignored)
+        bins (int or array-like): Number of bins or bin edges
+        
+    Returns:
+        tuple: (counts, bin edges) as NumPy arrays
+    """
+    values = np.asarray(pd.Series(values).dropna(), dtype=float)
+    if len(values) == 0:
+        return np.zeros(0), np.zeros(1)
+    return np.histogram(values, bins=bins)
+
+def box_aggregates(values):
+    """
+    Compute the statistics drawn by a box plot on the server.
+    
+    Quartiles use linear interpolation and the whiskers reach the most extreme
+    values within 1.5 IQR of the box, as in Plotly's own box plots.
+    
+    Args:
+        values (array-like): Values to summarise (missing values are ignored)
+        
+    Returns:
+        dict: n, q1, median, q3, mean, lowerfence, upperfence and outliers
+            (at most MAX_BOX_OUTLIERS, the most extreme ones), or None if empty
+    """
+    values = np.sort(np.asarray(pd.Series(values).dropna(), dtype=float))
+    if len(values) == 0:
+        return None
+    
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    
+    if len(outliers) > MAX_BOX_OUTLIERS:
+        # Keep the most extreme values on both sides
+        distance = np.maximum(q1 - outliers, outliers - q3)
+        outliers = np.sort(outliers[np.argsort(distance)[-MAX_BOX_OUTLIERS:]])
+    
+    return {
+        "n": len(values),
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "mean": values.mean(),
+        "lowerfence": inside.min(),
+        "upperfence": inside.max(),
+        "outliers": outliers
+    }
+
+def aggregated_box_trace(stats_dict, name, color=None, horizontal=False, **trace_kwargs):
+    """
+    Build a box trace from precomputed statistics (no raw values are sent).
+    
+    Args:
+        stats_dict (dict): Output of box_aggregates
+        name (str): Trace name and category position
+        color (str, optional): Box color
+        horizontal (bool): Draw the box horizontally
+        **trace_kwargs: Extra go.Box properties (e.g. xaxis, yaxis)
+        
+    Returns:
+        plotly.graph_objects.Box: Box trace
+    """
+    position = {"y": [name]} if horizontal else {"x": [name]}
+    return go.Box(
+        q1=[stats_dict["q1"]],
+        median=[stats_dict["median"]],
+        q3=[stats_dict["q3"]],
+        lowerfence=[stats_dict["lowerfence"]],
+        upperfence=[stats_dict["upperfence"]],
+        mean=[stats_dict["mean"]],
+        name=str(name),
+        orientation="h" if horizontal else "v",
+        marker_color=color,
+        showlegend=False,
+        **position,
+        **trace_kwargs
+    )
+
+def outlier_trace(stats_dict, name, color=None, horizontal=False, **trace_kwargs):
+    """
+    Build a marker trace for the outliers of a precomputed box.
+    
+    Args:
+        stats_dict (dict): Output of box_aggregates
+        name (str): Category position of the box
+        color (str, optional): Marker color
+        horizontal (bool): Whether the box is horizontal
+        **trace_kwargs: Extra go.Scatter properties (e.g. xaxis, yaxis)
+        
+    Returns:
+        plotly.graph_objects.Scatter: Marker trace
+    """
+    outliers = stats_dict["outliers"]
+    categories = [str(name)] * len(outliers)
+    return go.Scatter(
+        x=outliers if horizontal else categories,
+        y=categories if horizontal else outliers,
+        mode="markers",
+        marker=dict(color=color, size=5, opacity=0.7),
+        name=str(name),
+        showlegend=False,
+        hovertemplate="%{x}<extra></extra>" if horizontal else "%{y}<extra></extra>",
+        **trace_kwargs
+    )
+
+def cluster_order(corr_matrix):
+    """
+    Order variables so that strongly correlated ones are adjacent.
+    
+    Uses average-linkage hierarchical clustering on the distance 1 - |r|. The
+    order is computed once per matrix and cached.
+    
+    Args:
+        corr_matrix (pd.DataFrame): Square correlation matrix
+        
+    Returns:
+        list: Column labels in clustered order
+    """
+    if len(corr_matrix) < 3:
+        return list(corr_matrix.columns)
+    
+    key = make_cache_key("cluster_order", dataframe_fingerprint(corr_matrix))
+    
+    def _compute():
+        from scipy.cluster.hierarchy import linkage, leaves_list
+        from scipy.spatial.distance import squareform
+        
+        distance = 1 - np.abs(np.nan_to_num(corr_matrix.to_numpy(dtype=float)))
+        distance = (distance + distance.T) / 2
+        np.fill_diagonal(distance, 0)
+        order = leaves_list(linkage(squareform(np.clip(distance, 0, None), checks=False), method="average"))
+        return [corr_matrix.columns[i] for i in order]
+    
+    return _CLUSTER_ORDER_CACHE.get_or_compute(key, _compute)
+
+def correlation_heatmap(corr_matrix, labels=None, title=None, colorscale="Viridis", zmin=-1, zmax=1,
+                        cluster=False, colorbar_title=None):
+    """
+    Build a correlation heatmap as a single trace, whatever the matrix size.
+    
+    Values are written through the trace's text template instead of one
+    annotation per cell: every value for small matrices, only values with
+    |r| >= HEATMAP_TEXT_THRESHOLD for medium ones and none above
+    HEATMAP_MAX_TEXT_CELLS cells (hover still shows every value).
+    
+    Args:
+        corr_matrix (pd.DataFrame): Square correlation matrix
+        labels (dict, optional): Display labels keyed by column name
+        title (str, optional): Chart title
+        colorscale (str): Colorscale to use
+        zmin (float): Minimum value of the color scale
+        zmax (float): Maximum value of the color scale
+        cluster (bool): Reorder variables by hierarchical clustering
+        colorbar_title (str, optional): Color bar title
+        
+    Returns:
+        plotly.graph_objects.Figure: Correlation heatmap
+    """
+    labels = labels or {}
+    if cluster:
+        order = cluster_order(corr_matrix)
+        corr_matrix = corr_matrix.loc[order, order]
+    
+    values = corr_matrix.to_numpy(dtype=float)
+    axis_labels = [labels.get(col, col) for col in corr_matrix.columns]
+    
+    if values.size <= HEATMAP_MAX_TEXT_CELLS:
+        text = np.where(np.isnan(values), "", np.char.mod("%.2f", np.nan_to_num(values)))
+        if values.size > HEATMAP_FULL_TEXT_CELLS:
+            text = np.where(np.abs(np.nan_to_num(values)) >= HEATMAP_TEXT_THRESHOLD, text, "")
+        text_kwargs = {"text": text, "texttemplate": "%{text}", "textfont": {"size": 10}}
+    else:
+        text_kwargs = {}
+    
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=axis_labels,
+        y=axis_labels,
+        colorscale=colorscale,
+        zmin=zmin,
+        zmax=zmax,
+        colorbar={"title": colorbar_title} if colorbar_title else None,
+        hovertemplate="%{y} / %{x}<br>r = %{z:.2f}<extra></extra>",
+        **text_kwargs
+    ))
+    fig.update_layout(
+        title=title,
+        height=max(600, min(1200, 12 * len(axis_labels))),
+        xaxis={"side": "bottom"},
+        yaxis={"autorange": "reversed"}
+    )
+    return fig
+
 class VisualizationUtilities:
     """Utility class for creating standardized, publication-quality visualizations."""
     
@@ -215,22 +423,36 @@ class VisualizationUtilities:
         if yaxis_title is None:
             yaxis_title = self._get_text("score")
         
-        # Create box plot
-        fig = px.box(
-            data,
-            x=x,
-            y=y,
-            color=color,
-            notched=notched,
-            points=points,
-            color_discrete_sequence=COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES["categorical"]),
-            title=title,
-            labels={
-                x: xaxis_title,
-                y: yaxis_title,
-                color: self._get_text("group") if color else None
-            }
-        )
+        # Create box plot; one box per group is drawn from server-side statistics
+        # unless every point or a separate color grouping is requested
+        aggregated = points != "all" and color in (None, x) and x is not None and not notched
+        if aggregated:
+            palette = COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES["categorical"])
+            fig = go.Figure()
+            for i, (group, values) in enumerate(data.groupby(x, sort=True)[y]):
+                box_stats = box_aggregates(values)
+                if box_stats is None:
+                    continue
+                group_color = palette[i % len(palette)]
+                fig.add_trace(aggregated_box_trace(box_stats, group, color=group_color))
+                if points and len(box_stats["outliers"]):
+                    fig.add_trace(outlier_trace(box_stats, group, color=group_color))
+        else:
+            fig = px.box(
+                data,
+                x=x,
+                y=y,
+                color=color,
+                notched=notched,
+                points=points,
+                color_discrete_sequence=COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES["categorical"]),
+                title=title,
+                labels={
+                    x: xaxis_title,
+                    y: yaxis_title,
+                    color: self._get_text("group") if color else None
+                }
+            )
         
         # Apply standard layout
         fig = self._apply_standard_layout(fig, title, xaxis_title, yaxis_title)
@@ -242,7 +464,7 @@ class VisualizationUtilities:
             
             # Add mean markers
             fig.add_trace(go.Scatter(
-                x=means[x],
+                x=means[x].astype(str) if aggregated else means[x],
                 y=means[y],
                 mode='markers',
                 marker=dict(
@@ -312,15 +534,19 @@ class VisualizationUtilities:
         if bins is None:
             bins = min(max(int(np.sqrt(len(series))), 5), 50)  # Between 5 and 50 bins
         
-        # Create histogram
-        fig = px.histogram(
-            series,
-            nbins=bins,
+        # Create histogram from bin counts computed on the server
+        hist_values, bin_edges = histogram_aggregates(series, bins=bins)
+        fig = go.Figure(go.Bar(
+            x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+            y=hist_values,
+            width=np.diff(bin_edges),
             opacity=0.8,
-            color_discrete_sequence=[COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES["sequential_blue"])[2]],
-            title=title,
-            labels={"value": xaxis_title, "count": yaxis_title}
-        )
+            marker_color=COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES["sequential_blue"])[2],
+            name=var_name,
+            showlegend=False,
+            hovertemplate=f"{xaxis_title}: %{{x:.2f}}<br>{yaxis_title}: %{{y}}<extra></extra>"
+        ))
+        fig.update_layout(bargap=0)
         
         # Apply standard layout
         fig = self._apply_standard_layout(fig, title, xaxis_title, yaxis_title)
@@ -340,7 +566,6 @@ class VisualizationUtilities:
             y_normal = stats.norm.pdf(x_normal, mean, std)
             
             # Scale to match histogram height
-            hist_values, _ = np.histogram(series, bins=bins)
             scaling_factor = max(hist_values) / max(y_normal) if max(y_normal) > 0 else 1
             y_normal = y_normal * scaling_factor
             
@@ -360,7 +585,6 @@ class VisualizationUtilities:
             kde_y = kde(kde_x)
             
             # Scale to match histogram height
-            hist_values, _ = np.histogram(series, bins=bins)
             scaling_factor = max(hist_values) / max(kde_y) if max(kde_y) > 0 else 1
             kde_y = kde_y * scaling_factor
             
@@ -375,6 +599,66 @@ class VisualizationUtilities:
         
         return fig
     
+    def create_binned_histogram(self, series, title=None, xaxis_title=None, yaxis_title=None, bins=20,
+                                color=None, show_box=True):
+        """
+        Create a histogram with a marginal box plot from server-side aggregates.
+        
+        Only the bin counts and the box statistics are sent to the browser, so
+        the figure size does not depend on the number of observations.
+        
+        Args:
+            series (pd.Series): Values to plot
+            title (str, optional): Chart title
+            xaxis_title (str, optional): X-axis title
+            yaxis_title (str, optional): Y-axis title
+            bins (int, optional): Number of bins
+            color (str, optional): Bar and box color
+            show_box (bool, optional): Whether to add the marginal box plot
+            
+        Returns:
+            plotly.graph_objects.Figure: Histogram
+        """
+        var_name = series.name if series.name else "Value"
+        if xaxis_title is None:
+            xaxis_title = var_name
+        if yaxis_title is None:
+            yaxis_title = self._get_text("count", "Count")
+        if color is None:
+            color = COLOR_SCHEMES["categorical"][0]
+        
+        counts, bin_edges = histogram_aggregates(series, bins=bins)
+        
+        fig = go.Figure(go.Bar(
+            x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+            y=counts,
+            width=np.diff(bin_edges),
+            marker_color=color,
+            opacity=0.7,
+            name=var_name,
+            hovertemplate=f"{xaxis_title}: %{{x:.2f}}<br>{yaxis_title}: %{{y}}<extra></extra>"
+        ))
+        fig.update_layout(
+            title=title,
+            bargap=0,
+            showlegend=False,
+            xaxis_title=xaxis_title,
+            yaxis_title=yaxis_title
+        )
+        
+        box_stats = box_aggregates(series) if show_box else None
+        if box_stats is not None:
+            # Marginal box above the histogram, as with px.histogram(marginal="box")
+            fig.add_trace(aggregated_box_trace(box_stats, var_name, color=color, horizontal=True, yaxis="y2"))
+            if len(box_stats["outliers"]):
+                fig.add_trace(outlier_trace(box_stats, var_name, color=color, horizontal=True, yaxis="y2"))
+            fig.update_layout(
+                yaxis=dict(domain=[0, 0.78]),
+                yaxis2=dict(domain=[0.82, 1], showticklabels=False, showgrid=False)
+            )
+        
+        return fig
+    
     def create_correlation_heatmap(self, data, columns=None, title=None, 
                                   colorscale="RdBu_r", zmin=-1, zmax=1, text_auto=True):
         """
@@ -405,17 +689,17 @@ class VisualizationUtilities:
         if title is None:
             title = self._get_text("correlation")
         
-        # Create heatmap using figure_factory for annotated heatmap
-        fig = ff.create_annotated_heatmap(
-            z=corr_matrix.values,
-            x=list(corr_matrix.columns),
-            y=list(corr_matrix.index),
-            annotation_text=corr_matrix.values.round(2) if text_auto else None,
+        # Single-trace heatmap (text through the trace, not one annotation per cell)
+        fig = correlation_heatmap(
+            corr_matrix,
+            title=title,
             colorscale=colorscale,
-            showscale=True,
             zmin=zmin,
-            zmax=zmax
+            zmax=zmax,
+            colorbar_title=self._get_text("correlation")
         )
+        if not text_auto:
+            fig.update_traces(text=None, texttemplate=None)
         
         # Update layout for better appearance
         fig.update_layout(
@@ -424,20 +708,7 @@ class VisualizationUtilities:
                 "font": {"size": 18, "family": "Arial", "color": "#333333"},
                 "x": 0.5
             },
-            autosize=True,
-            height=600,
-            xaxis={"side": "bottom"}
-        )
-        
-        # Improve font and annotations
-        fig.update_annotations(font={"size": 10, "family": "Arial", "color": "black"})
-        
-        # Add color bar title
-        fig.update_layout(
-            coloraxis_colorbar={
-                "title": self._get_text("correlation"),
-                "titlefont": {"size": 12, "family": "Arial"}
-            }
+            autosize=True
         )
         
         return fig
@@ -555,7 +826,7 @@ class VisualizationUtilities:
                 os.makedirs(directory)
             
             # Save figure
-            fig.write_image(filename, format=format, width=width, height=height, scale=scale)
+            write_figure(fig, filename, format=format, width=width, height=height, scale=scale)
             return True
         except Exception as e:
             print(f"{self._get_text('save_failed')}: {str(e)}")
@@ -576,7 +847,7 @@ class VisualizationUtilities:
             bytes: Image bytes if successful, None otherwise
         """
         try:
-            return fig.to_image(format=format, width=width, height=height, scale=scale)
+            return render_figure(fig, format=format, width=width, height=height, scale=scale)
         except Exception as e:
             print(f"{self._get_text('save_failed')}: {str(e)}")
             return None
@@ -5,13 +5,18 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import plotly.figure_factory as ff
 import pandas as pd
 import numpy as np
-import tempfile
-import os
 from language_utils import get_text, get_current_language
-from viz_utils import VisualizationUtilities
+from viz_utils import VisualizationUtilities, correlation_heatmap
+from figure_export import render_figure, get_render_service
+from cache_utils import LRUCache, make_cache_key, dataframe_fingerprint, get_or_build_figure
+from config import SCHOOL_RANKING_THRESHOLD
+from report_jobs import report_issue
+from school_ranking import school_aggregates, create_caterpillar_plot
+
+# Figures (as dicts) kept across Streamlit reruns, keyed by data, selection, language and style
+_FIGURE_CACHE = LRUCache(max_entries=128)
 
 class StandardVisualization:
     """
@@ -43,6 +48,30 @@ class StandardVisualization:
             except:
                 pass
     
+    def _memoized_figure(self, kind, build, df, columns, **params):
+        """
+        Return a figure from the figure cache, building it on a miss.
+        
+        The key covers the content of the plotted columns, the plot kind, its
+        parameters and the display language, so a rerun with unchanged data and
+        selections reuses the figure instead of rebuilding it. Each call gets a
+        figure of its own (the cache is shared by sessions and report threads).
+        
+        Args:
+            kind (str): Plot kind
+            build (callable): Function without arguments creating the figure
+            df (pd.DataFrame): Data plotted
+            columns (list): Columns of df the figure depends on
+            **params: Selections and styling the figure depends on
+            
+        Returns:
+            figure: The cached or newly created plot
+        """
+        key = make_cache_key(
+            kind, dataframe_fingerprint(df, columns), get_current_language(), self.language, params
+        )
+        return get_or_build_figure(_FIGURE_CACHE, key, build)
+    
     # analyse1.py: Statistical Overview visualizations
     
     def show_histogram_with_stats(self, df, column, title=None, description=None):
@@ -57,7 +86,7 @@ class StandardVisualization:
             description (str, optional): Additional description text
         """
         if column not in df.columns:
-            st.error(f"Column '{column}' not found in data")
+            report_issue(f"Column '{column}' not found in data")
             return None
             
         col1, col2 = st.columns(2)
@@ -80,7 +109,7 @@ class StandardVisualization:
                 )
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
-                st.error(f"Error creating histogram for {column}: {str(e)}")
+                report_issue(f"Error creating histogram for {column}: {str(e)}")
                 fig = None
         
         # Show description if provided
@@ -91,7 +120,7 @@ class StandardVisualization:
     
     # analyse2.py: Zero Scores Analysis visualizations
     
-    def show_zero_scores_chart(self, df_zero_scores, task_names=None, percentages=None):
+    def show_zero_scores_chart(self, df_zero_scores, task_names=None, percentages=None, display=True):
         """
         Display a horizontal bar chart for zero scores analysis.
         For analyse2.py (Zero Scores Analysis).
@@ -100,6 +129,8 @@ class StandardVisualization:
             df_zero_scores (pd.DataFrame): DataFrame with zero scores data
             task_names (list, optional): List of task display names (if not in df_zero_scores)
             percentages (list, optional): List of percentage values (if not in df_zero_scores)
+            display (bool): Whether to draw the chart on the page (reports
+                only need the figure)
         """
         try:
             # Create DataFrame for visualization if not provided
@@ -112,7 +143,7 @@ class StandardVisualization:
                         "Percentage": percentages
                     })
                 else:
-                    st.error("Invalid input for zero scores chart. Provide either a DataFrame with Task and Percentage columns, or both task_names and percentages lists")
+                    report_issue("Invalid input for zero scores chart. Provide either a DataFrame with Task and Percentage columns, or both task_names and percentages lists")
                     return None
             elif task_names and percentages and len(task_names) == len(percentages):
                 df_viz = pd.DataFrame({
@@ -120,7 +151,7 @@ class StandardVisualization:
                     "Percentage": percentages
                 })
             else:
-                st.error("Invalid input for zero scores chart")
+                report_issue("Invalid input for zero scores chart")
                 return None
             
             # Sort by percentage for better visualization
@@ -164,16 +195,17 @@ class StandardVisualization:
             )
             
             fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             
             return fig
         except Exception as e:
-            st.error(f"Error creating zero scores chart: {str(e)}")
+            report_issue(f"Error creating zero scores chart: {str(e)}")
             return None
     
     # analyse5.py: Correlation Analysis visualizations
     
-    def show_correlation_matrix(self, df, columns):
+    def show_correlation_matrix(self, df, columns, display=True):
         """
         Display a correlation matrix heatmap.
         For analyse5.py (Correlation Analysis).
@@ -181,6 +213,8 @@ class StandardVisualization:
         Args:
             df (pd.DataFrame): DataFrame containing the data
             columns (list): List of columns to include in correlation
+            display (bool): Whether to draw the heatmap on the page (reports
+                only need the figure)
             
         Returns:
             tuple: (figure, correlation_matrix)
@@ -190,49 +224,43 @@ class StandardVisualization:
             valid_columns = [col for col in columns if col in df.columns]
             
             if len(valid_columns) < 2:
-                st.error("At least two valid columns are required for correlation analysis")
+                report_issue("At least two valid columns are required for correlation analysis")
                 return None, None
                 
             # Calculate correlation matrix
             corr_matrix = df[valid_columns].corr().round(2)
             
-            # Get translated column names for display
-            translated_labels = [get_text("columns_of_interest", {}).get(col, col) for col in corr_matrix.columns]
-            
-            # Create heatmap using figure_factory for annotated heatmap
-            fig = ff.create_annotated_heatmap(
-                z=corr_matrix.values,
-                x=translated_labels,
-                y=translated_labels,
-                annotation_text=corr_matrix.values.round(2),
-                colorscale='Viridis',
-                showscale=True,
-                zmin=-1, zmax=1
+            # Single-trace heatmap (values written only where readable)
+            fig = self._memoized_figure(
+                "correlation_matrix",
+                lambda: correlation_heatmap(
+                    corr_matrix,
+                    labels=get_text("columns_of_interest", {}),
+                    title=get_text("correlation_matrix", "Correlation Matrix"),
+                    colorscale='Viridis'
+                ),
+                corr_matrix, list(corr_matrix.columns)
             )
             
-            # Update layout for better appearance
-            fig.update_layout(
-                title=get_text("correlation_matrix", "Correlation Matrix"),
-                height=600,
-                xaxis={'side': 'bottom'}
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             
             return fig, corr_matrix
         except Exception as e:
-            st.error(f"Error creating correlation matrix: {str(e)}")
+            report_issue(f"Error creating correlation matrix: {str(e)}")
             return None, None
     
     # analyse6.py: Test Reliability (Cronbach Alpha) visualizations
     
-    def show_reliability_visualization(self, alpha_results):
+    def show_reliability_visualization(self, alpha_results, display=True):
         """
         Display a bar chart of Cronbach's Alpha results.
         For analyse6.py (Test Reliability).
         
         Args:
             alpha_results (pd.DataFrame): DataFrame with alpha results
+            display (bool): Whether to draw the chart on the page (reports
+                only need the figure)
             
         Returns:
             figure: The created plot
@@ -242,7 +270,7 @@ class StandardVisualization:
             required_columns = ['test_group', 'alpha_numeric', 'reliability_level']
             if not all(col in alpha_results.columns for col in required_columns):
                 missing = [col for col in required_columns if col not in alpha_results.columns]
-                st.error(f"Missing required columns for reliability visualization: {', '.join(missing)}")
+                report_issue(f"Missing required columns for reliability visualization: {', '.join(missing)}")
                 return None
                 
             # Create a bar chart of alpha values
@@ -282,15 +310,16 @@ class StandardVisualization:
                 height=500
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating reliability visualization: {str(e)}")
+            report_issue(f"Error creating reliability visualization: {str(e)}")
             return None
     
     # analyse7.py: School Performance Analysis visualizations
     
-    def show_school_comparison(self, df, column, group_col="school"):
+    def show_school_comparison(self, df, column, group_col="school", display=True):
         """
         Display a box plot comparing schools for a specific variable.
         For analyse7.py (School Performance Analysis).
@@ -299,6 +328,8 @@ class StandardVisualization:
             df (pd.DataFrame): DataFrame containing the data
             column (str): Column name to visualize
             group_col (str): Column to group by (default: "school")
+            display (bool): Whether to draw the plot on the page (reports
+                only need the figure)
             
         Returns:
             figure: The created plot
@@ -306,37 +337,66 @@ class StandardVisualization:
         try:
             # Validate inputs
             if column not in df.columns:
-                st.error(f"Column '{column}' not found in data")
+                report_issue(f"Column '{column}' not found in data")
                 return None
                 
             if group_col not in df.columns:
-                st.error(f"Group column '{group_col}' not found in data")
+                report_issue(f"Group column '{group_col}' not found in data")
                 return None
                 
-            # Get translated column name
-            column_name = get_text("columns_of_interest", {}).get(column, column)
-            group_label = get_text(group_col, group_col.capitalize())
-            
-            # Create the box plot
-            fig = self.viz_utils.create_box_plot(
-                df,
-                x=group_col,
-                y=column,
-                color=group_col,
-                title=f"{column_name} - {get_text('by_group', 'by')} {group_label}",
-                xaxis_title=group_label,
-                yaxis_title=column_name
+            fig = self._memoized_figure(
+                "school_comparison",
+                lambda: self.create_school_comparison(df, column, group_col),
+                df, [group_col, column],
+                column=column, group_col=group_col
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating school comparison: {str(e)}")
+            report_issue(f"Error creating school comparison: {str(e)}")
             return None
     
+    def create_school_comparison(self, df, column, group_col="school"):
+        """
+        Create the box plot comparing schools for a specific variable.
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing the data
+            column (str): Column name to visualize
+            group_col (str): Column to group by (default: "school")
+            
+        Returns:
+            figure: The created plot
+        """
+        # Get translated column name
+        column_name = get_text("columns_of_interest", {}).get(column, column)
+        group_label = get_text(group_col, group_col.capitalize())
+        
+        # With many schools, rank school means instead of drawing one box each
+        if df[group_col].nunique() > SCHOOL_RANKING_THRESHOLD:
+            return create_caterpillar_plot(
+                school_aggregates(df, column, school_col=group_col),
+                {"mean": get_text("mean", "Mean"), "rank": get_text("rank", "Rank")},
+                title=f"{column_name} - {get_text('by_group', 'by')} {group_label}",
+                yaxis_title=column_name
+            )
+        
+        # Create the box plot
+        return self.viz_utils.create_box_plot(
+            df,
+            x=group_col,
+            y=column,
+            color=group_col,
+            title=f"{column_name} - {get_text('by_group', 'by')} {group_label}",
+            xaxis_title=group_label,
+            yaxis_title=column_name
+        )
+    
     # analyse10.py: Gender Effect Analysis visualizations
     
-    def show_gender_comparison(self, df, column, gender_col="stgender"):
+    def show_gender_comparison(self, df, column, gender_col="stgender", display=True):
         """
         Display a comparison of scores by gender for a column.
         For analyse10.py (Gender Effect Analysis).
@@ -345,6 +405,8 @@ class StandardVisualization:
             df (pd.DataFrame): DataFrame containing the data
             column (str): Column name to visualize
             gender_col (str): Name of the gender column
+            display (bool): Whether to draw the plot on the page (reports
+                only need the figure)
             
         Returns:
             figure: The created plot
@@ -352,37 +414,57 @@ class StandardVisualization:
         try:
             # Validate inputs
             if column not in df.columns:
-                st.error(f"Column '{column}' not found in data")
+                report_issue(f"Column '{column}' not found in data")
                 return None
                 
             if gender_col not in df.columns:
-                st.error(f"Gender column '{gender_col}' not found in data")
+                report_issue(f"Gender column '{gender_col}' not found in data")
                 return None
                 
-            # Get translated column name
-            column_name = get_text("columns_of_interest", {}).get(column, column)
-            
-            # Create the box plot
-            fig = self.viz_utils.create_box_plot(
-                df,
-                x=gender_col,
-                y=column,
-                color=gender_col,
-                title=f"{column_name} - {get_text('by_gender', 'by Gender')}",
-                xaxis_title=get_text("gender", "Gender"),
-                yaxis_title=column_name,
-                color_scheme="binary"
+            fig = self._memoized_figure(
+                "gender_comparison",
+                lambda: self.create_gender_comparison(df, column, gender_col),
+                df, [gender_col, column],
+                column=column, gender_col=gender_col, color_scheme="binary"
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating gender comparison: {str(e)}")
+            report_issue(f"Error creating gender comparison: {str(e)}")
             return None
     
+    def create_gender_comparison(self, df, column, gender_col="stgender"):
+        """
+        Create the box plot comparing scores by gender for a column.
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing the data
+            column (str): Column name to visualize
+            gender_col (str): Name of the gender column
+            
+        Returns:
+            figure: The created plot
+        """
+        # Get translated column name
+        column_name = get_text("columns_of_interest", {}).get(column, column)
+        
+        # Create the box plot
+        return self.viz_utils.create_box_plot(
+            df,
+            x=gender_col,
+            y=column,
+            color=gender_col,
+            title=f"{column_name} - {get_text('by_gender', 'by Gender')}",
+            xaxis_title=get_text("gender", "Gender"),
+            yaxis_title=column_name,
+            color_scheme="binary"
+        )
+    
     # analyse12.py: International Standards Comparison visualizations
     
-    def show_international_benchmark_comparison(self, local_means, benchmarks):
+    def show_international_benchmark_comparison(self, local_means, benchmarks, display=True):
         """
         Display a comparison of local means against international benchmarks.
         For analyse12.py (International Standards Comparison).
@@ -390,6 +472,8 @@ class StandardVisualization:
         Args:
             local_means (dict): Dictionary of local mean values
             benchmarks (dict): Dictionary of benchmark values
+            display (bool): Whether to draw the chart on the page (reports
+                only need the figure)
             
         Returns:
             figure: The created plot
@@ -397,21 +481,21 @@ class StandardVisualization:
         try:
             # Validate inputs
             if not isinstance(local_means, dict) or not isinstance(benchmarks, dict):
-                st.error("Local means and benchmarks must be dictionaries")
+                report_issue("Local means and benchmarks must be dictionaries")
                 return None
                 
             if not local_means or not benchmarks:
-                st.error("Local means and benchmarks cannot be empty")
+                report_issue("Local means and benchmarks cannot be empty")
                 return None
                 
             # Check that keys in local_means exist in benchmarks
             missing_benchmarks = [key for key in local_means if key not in benchmarks]
             if missing_benchmarks:
-                st.warning(f"Missing benchmarks for: {', '.join(missing_benchmarks)}")
+                report_issue(f"Missing benchmarks for: {', '.join(missing_benchmarks)}", level="warning")
                 # Filter out variables without benchmarks
                 local_means = {k: v for k, v in local_means.items() if k in benchmarks}
                 if not local_means:
-                    st.error("No valid variables with benchmarks remaining")
+                    report_issue("No valid variables with benchmarks remaining")
                     return None
             
             # Prepare data for chart
@@ -463,19 +547,22 @@ class StandardVisualization:
                 height=600
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating benchmark comparison: {str(e)}")
+            report_issue(f"Error creating benchmark comparison: {str(e)}")
             return None
     
-    def show_benchmark_percentage(self, percentage_df):
+    def show_benchmark_percentage(self, percentage_df, display=True):
         """
         Display a percentage achievement chart compared to benchmarks.
         For analyse12.py (International Standards Comparison).
         
         Args:
             percentage_df (pd.DataFrame): DataFrame with percentage data
+            display (bool): Whether to draw the chart on the page (reports
+                only need the figure)
             
         Returns:
             figure: The created plot
@@ -485,54 +572,73 @@ class StandardVisualization:
             required_columns = ["variable_name", "percentage", "achievement_level"]
             if not all(col in percentage_df.columns for col in required_columns):
                 missing = [col for col in required_columns if col not in percentage_df.columns]
-                st.error(f"Missing required columns for percentage visualization: {', '.join(missing)}")
+                report_issue(f"Missing required columns for percentage visualization: {', '.join(missing)}")
                 return None
             
-            # Create percentage chart
-            fig = px.bar(
-                percentage_df,
-                x="variable_name",
-                y="percentage",
-                color="achievement_level",
-                title=get_text("percentage_chart_title", "Percentage of International Benchmark Achieved"),
-                labels={
-                    "variable_name": get_text("assessment_variable", "Assessment Variable"),
-                    "percentage": get_text("percentage_of_benchmark", "% of Benchmark"),
-                    "achievement_level": get_text("achievement_level", "Achievement Level")
-                },
-                color_discrete_map={
-                    get_text("critical", "Critical"): "#E74C3C",  # Red
-                    get_text("concerning", "Concerning"): "#F39C12",  # Orange
-                    get_text("approaching", "Approaching"): "#F1C40F",  # Yellow
-                    get_text("meeting", "Meeting"): "#2ECC71"  # Green
-                }
+            fig = self._memoized_figure(
+                "benchmark_percentage",
+                lambda: self.create_benchmark_percentage(percentage_df),
+                percentage_df, required_columns
             )
             
-            # Add reference line at 100%
-            fig.add_hline(
-                y=100, 
-                line_dash="dash", 
-                line_color="black",
-                annotation_text=get_text("benchmark_line", "Benchmark")
-            )
-            
-            # Add reference lines for achievement levels
-            fig.add_hline(y=85, line_dash="dot", line_color="#F1C40F")  # Approaching (Yellow)
-            fig.add_hline(y=70, line_dash="dot", line_color="#F39C12")  # Concerning (Orange)
-            
-            # Update layout
-            fig.update_layout(
-                xaxis_tickangle=-45,
-                legend_title=get_text("achievement_level", "Achievement Level"),
-                height=600
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            if display:
+                st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating percentage visualization: {str(e)}")
+            report_issue(f"Error creating percentage visualization: {str(e)}")
             return None
     
+    def create_benchmark_percentage(self, percentage_df):
+        """
+        Create the percentage achievement chart compared to benchmarks.
+        
+        Args:
+            percentage_df (pd.DataFrame): DataFrame with percentage data
+            
+        Returns:
+            figure: The created plot
+        """
+        # Create percentage chart
+        fig = px.bar(
+            percentage_df,
+            x="variable_name",
+            y="percentage",
+            color="achievement_level",
+            title=get_text("percentage_chart_title", "Percentage of International Benchmark Achieved"),
+            labels={
+                "variable_name": get_text("assessment_variable", "Assessment Variable"),
+                "percentage": get_text("percentage_of_benchmark", "% of Benchmark"),
+                "achievement_level": get_text("achievement_level", "Achievement Level")
+            },
+            color_discrete_map={
+                get_text("critical", "Critical"): "#E74C3C",  # Red
+                get_text("concerning", "Concerning"): "#F39C12",  # Orange
+                get_text("approaching", "Approaching"): "#F1C40F",  # Yellow
+                get_text("meeting", "Meeting"): "#2ECC71"  # Green
+            }
+        )
+        
+        # Add reference line at 100%
+        fig.add_hline(
+            y=100, 
+            line_dash="dash", 
+            line_color="black",
+            annotation_text=get_text("benchmark_line", "Benchmark")
+        )
+        
+        # Add reference lines for achievement levels
+        fig.add_hline(y=85, line_dash="dot", line_color="#F1C40F")  # Approaching (Yellow)
+        fig.add_hline(y=70, line_dash="dot", line_color="#F39C12")  # Concerning (Orange)
+        
+        # Update layout
+        fig.update_layout(
+            xaxis_tickangle=-45,
+            legend_title=get_text("achievement_level", "Achievement Level"),
+            height=600
+        )
+        
+        return fig
+    
     # analyse13.py: Language of Instruction Comparison visualizations
     
     def show_language_comparison(self, df, column, language_col="language_teaching"):
@@ -551,76 +657,105 @@ class StandardVisualization:
         try:
             # Validate inputs
             if column not in df.columns:
-                st.error(f"Column '{column}' not found in data")
+                report_issue(f"Column '{column}' not found in data")
                 return None
                 
             if language_col not in df.columns:
-                st.error(f"Language column '{language_col}' not found in data")
+                report_issue(f"Language column '{language_col}' not found in data")
                 return None
                 
-            # Get translated column name
-            column_name = get_text("columns_of_interest", {}).get(column, column)
-            
-            # Create the box plot
-            fig = px.box(
-                df,
-                x=language_col,
-                y=column,
-                color=language_col,
-                title=f"{column_name} - {get_text('by_language', 'by Language of Instruction')}",
-                labels={
-                    language_col: get_text("language_of_instruction", "Language of Instruction"),
-                    column: column_name
-                },
-                color_discrete_map={
-                    "English": "#3498DB",  # Blue
-                    "Dutch": "#F39C12"     # Orange
-                }
-            )
-            
-            # Update layout
-            fig.update_layout(
-                showlegend=False,
-                height=400
+            fig = self._memoized_figure(
+                "language_comparison",
+                lambda: self.create_language_comparison(df, column, language_col),
+                df, [language_col, column],
+                column=column, language_col=language_col
             )
             
             st.plotly_chart(fig, use_container_width=True)
             return fig
         except Exception as e:
-            st.error(f"Error creating language comparison: {str(e)}")
+            report_issue(f"Error creating language comparison: {str(e)}")
             return None
     
-    # Utility methods for saving figures
+    def create_language_comparison(self, df, column, language_col="language_teaching"):
+        """
+        Create the box plot comparing scores by language of instruction.
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing the data
+            column (str): Column name to visualize
+            language_col (str): Name of the language column
+            
+        Returns:
+            figure: The created plot
+        """
+        # Get translated column name
+        column_name = get_text("columns_of_interest", {}).get(column, column)
+        
+        # Create the box plot
+        fig = px.box(
+            df,
+            x=language_col,
+            y=column,
+            color=language_col,
+            title=f"{column_name} - {get_text('by_language', 'by Language of Instruction')}",
+            labels={
+                language_col: get_text("language_of_instruction", "Language of Instruction"),
+                column: column_name
+            },
+            color_discrete_map={
+                "English": "#3498DB",  # Blue
+                "Dutch": "#F39C12"     # Orange
+            }
+        )
+        
+        # Update layout
+        fig.update_layout(
+            showlegend=False,
+            height=400
+        )
+        
+        return fig
     
-    def _ensure_temp_dir(self):
-        """Ensure a temporary directory exists."""
-        if self.temp_dir is None:
-            self.temp_dir = tempfile.mkdtemp()
-        return self.temp_dir
+    # Utility methods for saving figures
     
-    def save_figure_for_word(self, fig, filename):
+    def save_figure_for_word(self, fig, filename, wait=True):
         """
-        Save a figure to a temporary file for use in Word documents.
+        Render a figure to PNG in memory for use in Word documents.
         
         Args:
-            fig: Plotly figure to save
-            filename (str): Base filename (without path)
+            fig: Plotly figure to render
+            filename (str): Image name (used in error messages)
+            wait (bool): Wait for the image; otherwise return the pending render,
+                so several figures render concurrently
             
         Returns:
-            str: Full path to saved image or None if saving failed
+            bytes or Future: PNG image (None if rendering failed), or the pending render
         """
         try:
             if fig is None:
                 return None
-                
-            # Create a temporary directory if it doesn't exist
-            temp_dir = self._ensure_temp_dir()
-            
-            # Save the figure
-            img_path = os.path.join(temp_dir, filename)
-            fig.write_image(img_path, width=800, height=500)
             
-            return img_path
+            if not wait:
+                return get_render_service().submit(fig, width=800, height=500)
+            return render_figure(fig, width=800, height=500)
         except Exception as e:
-            st.error(f"Error saving figure: {str(e)}")
-            return None
\ No newline at end of file
+            report_issue(f"Error saving figure {filename}: {str(e)}")
+            return None
+
+
+def show_figure_cache_stats(t):
+    """
+    Display figure cache statistics in the sidebar once figures have been built.
+    
+    Args:
+        t (dict): Translation dictionary
+    """
+    stats = _FIGURE_CACHE.stats()
+    if stats["hits"] + stats["misses"] == 0:
+        return
+    
+    with st.sidebar.expander(t.get("figure_cache_title", "📈 Figure cache")):
+        st.write(f"{t.get('figure_cache_hit_rate', 'Hit rate')}: {stats['hit_rate']:.0%} "
+                 f"({stats['hits']} / {stats['hits'] + stats['misses']})")
+        st.write(f"{t.get('figure_cache_entries', 'Cached figures')}: {stats['entries']}")
@@ -1,5 +1,6 @@
+import copy
+import logging
 import os
-import tempfile
 from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
@@ -13,6 +14,33 @@ from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+from figure_export import render_figure, RENDER_TIMEOUT_SECONDS
+from docx_tables import add_bulk_table
+from markdown_docx import add_markdown
+from cache_utils import LRUCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Styled base documents (styles, page number footer, table of contents) by
+# language; each report starts from an in-memory copy
+_TEMPLATE_CACHE = LRUCache(max_entries=16)
+
+
+def document_to_bytes(doc):
+    """
+    Serialise a Word document to bytes in memory (no temporary file).
+    
+    Args:
+        doc (Document): python-docx document
+        
+    Returns:
+        bytes: The .docx file content
+    """
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
 class WordReportGenerator:
     """
     Comprehensive system for generating professional Word reports from analysis results.
@@ -35,6 +63,10 @@ class WordReportGenerator:
         self.temp_dir = None
         self.image_count = 0
         self.table_count = 0
+        # Added to section heading levels (1 when sections are nested in a combined report)
+        self.heading_offset = 0
+        # Pictures whose rendering is still pending: (run, future, width, caption)
+        self._pending_pictures = []
         
         # Translation dictionary for report elements
         self.translations = {
@@ -156,26 +188,50 @@ class WordReportGenerator:
         Returns:
             Document: The created document
         """
-        # Create new document
-        self.doc = Document()
-        
-        # Create temporary directory for images
-        if self.temp_dir is None:
-            self.temp_dir = tempfile.TemporaryDirectory()
+        # Start from a copy of the styled template of this language
+        template = _TEMPLATE_CACHE.get_or_compute(
+            make_cache_key("word_template", self.language, include_toc),
+            lambda: self._build_template(include_toc)
+        )
+        self.doc = copy.deepcopy(template.part).document
         
         # Reset counters
         self.image_count = 0
         self.table_count = 0
+        self._pending_pictures = []
         
-        # Set up default styles
-        self._setup_styles()
-        
-        # Add title page
+        # Add title page before the template content (table of contents)
         if title is None:
             title = self.get_text("report_title")
         
+        body = self.doc.element.body
+        template_content = [element for element in body if element.tag != qn('w:sectPr')]
+        for element in template_content:
+            body.remove(element)
+        
         self._add_title_page(title, confidential)
         
+        for element in template_content:
+            body.sectPr.addprevious(element)
+        
+        return self.doc
+    
+    def _build_template(self, include_toc):
+        """
+        Build the base document shared by the reports of this language.
+        
+        Args:
+            include_toc (bool): Whether to include a table of contents
+            
+        Returns:
+            Document: Document with styles, page number footer and table of contents
+        """
+        self.doc = Document()
+        
+        # Set up default styles
+        self._setup_styles()
+        self._add_page_numbers(self.doc.sections[0])
+        
         # Add table of contents if requested
         if include_toc:
             self._add_table_of_contents()
@@ -336,6 +392,7 @@ class WordReportGenerator:
             level = 1
         elif level > 3:
             level = 3
+        level += self.heading_offset
             
         # Add heading
         self.doc.add_heading(title, level=level)
@@ -373,6 +430,16 @@ class WordReportGenerator:
             paragraph.style = style
         return paragraph
     
+    def add_markdown(self, text, heading_level=1):
+        """
+        Add Markdown text (e.g. an AI interpretation) to the report.
+        
+        Args:
+            text (str): Markdown text
+            heading_level (int): Section level of the text's top-level ("#") headings
+        """
+        add_markdown(self.doc, text, heading_offset=heading_level - 1 + self.heading_offset)
+    
     def add_bullet_point(self, text, level=0, style=None):
         """
         Add a bullet point to the report.
@@ -450,33 +517,19 @@ class WordReportGenerator:
             self.doc.add_paragraph("No data available for table.")
             return None
         
-        # Create table
-        table = self.doc.add_table(rows=rows, cols=cols)
-        table.style = style
-        
-        # Add headers if provided
-        if headers:
-            header_row = table.rows[0]
-            for i, header in enumerate(headers):
-                cell = header_row.cells[i]
-                cell.text = str(header)
-                # Format header cell
-                for paragraph in cell.paragraphs:
-                    for run in paragraph.runs:
-                        run.font.bold = True
-        
-        # Add data rows
-        start_row = 1 if headers else 0
-        for i, row_data in enumerate(data_values):
-            row = table.rows[i + start_row]
-            for j, value in enumerate(row_data):
-                cell = row.cells[j]
-                
-                # Format numbers according to language conventions
-                if isinstance(value, (int, float)) and not isinstance(value, bool):
-                    cell.text = self.format_number(value)
-                else:
-                    cell.text = str(value)
+        # Create and fill the table in one pass, formatting numbers according to language conventions
+        def _cell_text(value):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return self.format_number(value)
+            return str(value)
+        
+        table = add_bulk_table(
+            self.doc,
+            data_values,
+            headers=[str(header) for header in headers] if headers else None,
+            style=style,
+            formatters=[_cell_text] * cols
+        )
         
         # Autofit columns to content if requested
         if autofit:
@@ -503,26 +556,23 @@ class WordReportGenerator:
             dpi (int): Resolution in dots per inch
             
         Returns:
-            str: Path to the saved image
+            bytes: The rendered PNG image
         """
-        if self.temp_dir is None:
-            self.temp_dir = tempfile.TemporaryDirectory()
-            
-        # Create unique filename
         self.image_count += 1
-        img_path = os.path.join(self.temp_dir.name, f"figure_{self.image_count}.png")
         
-        # Save figure to file
+        # Render figure in memory
         if height:
             figure.set_size_inches(width, height)
         else:
             figure.set_size_inches(width, width * 0.75)  # 4:3 aspect ratio if height not specified
             
-        figure.savefig(img_path, dpi=dpi, bbox_inches='tight')
+        buffer = BytesIO()
+        figure.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
         plt.close(figure)
+        image = buffer.getvalue()
         
         # Add figure to document
-        self.doc.add_picture(img_path, width=Inches(width))
+        self.doc.add_picture(BytesIO(image), width=Inches(width))
         
         # Add caption if provided
         if title:
@@ -530,7 +580,7 @@ class WordReportGenerator:
             caption = self.doc.add_paragraph(caption_text, style='Caption')
             caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        return img_path
+        return image
     
     def add_plotly_figure(self, fig, title=None, width=6, height=4, scale=1):
         """
@@ -544,20 +594,15 @@ class WordReportGenerator:
             scale (float): Scale factor for resolution
             
         Returns:
-            str: Path to the saved image
+            bytes: The rendered PNG image
         """
-        if self.temp_dir is None:
-            self.temp_dir = tempfile.TemporaryDirectory()
-            
-        # Create unique filename
         self.image_count += 1
-        img_path = os.path.join(self.temp_dir.name, f"figure_{self.image_count}.png")
         
-        # Export plotly figure as image
-        fig.write_image(img_path, width=width*100, height=height*100, scale=scale)
+        # Render plotly figure in memory
+        image = render_figure(fig, width=width*100, height=height*100, scale=scale)
         
         # Add figure to document
-        self.doc.add_picture(img_path, width=Inches(width))
+        self.doc.add_picture(BytesIO(image), width=Inches(width))
         
         # Add caption if provided
         if title:
@@ -565,7 +610,7 @@ class WordReportGenerator:
             caption = self.doc.add_paragraph(caption_text, style='Caption')
             caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
-        return img_path
+        return image
     
     def add_image(self, image_path, title=None, width=6):
         """
@@ -579,15 +624,64 @@ class WordReportGenerator:
         Returns:
             None
         """
+        self.add_picture(image_path, title=title, width=width)
+    
+    def add_picture(self, image, title=None, width=6):
+        """
+        Add an image to the report from a file path, bytes or a file-like object.
+        
+        A pending render (Future) is given its place in the document now and
+        inserted when the report is saved, so figures render concurrently.
+        
+        Args:
+            image (str, bytes, file-like or Future): Image to add
+            title (str, optional): Image title/caption
+            width (float): Width in inches
+            
+        Returns:
+            None
+        """
+        if image is None:
+            return
+        
+        if isinstance(image, (bytes, bytearray)):
+            image = BytesIO(image)
+        
         # Add image to document
         self.image_count += 1
-        self.doc.add_picture(image_path, width=Inches(width))
+        run = None
+        if hasattr(image, "result"):
+            run = self.doc.add_paragraph().add_run()
+        else:
+            self.doc.add_picture(image, width=Inches(width))
         
         # Add caption if provided
+        caption = None
         if title:
             caption_text = f"{self.get_text('figure')} {self.image_count}: {title}"
             caption = self.doc.add_paragraph(caption_text, style='Caption')
             caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        if run is not None:
+            self._pending_pictures.append((run, image, width, caption))
+    
+    def resolve_pictures(self):
+        """
+        Wait for the pending renders and insert their images.
+        
+        A picture whose rendering failed is removed together with its caption.
+        """
+        pending, self._pending_pictures = self._pending_pictures, []
+        for run, future, width, caption in pending:
+            try:
+                image = future.result(timeout=RENDER_TIMEOUT_SECONDS)
+                run.add_picture(BytesIO(image), width=Inches(width))
+            except Exception as e:
+                logger.error(f"Error adding picture to report: {str(e)}")
+                paragraph = run._parent
+                paragraph._p.getparent().remove(paragraph._p)
+                if caption is not None:
+                    caption._p.getparent().remove(caption._p)
     
     def add_page_break(self):
         """Add a page break to the report."""
@@ -607,7 +701,7 @@ class WordReportGenerator:
         """
         # Add heading if indicator name is provided
         if indicator:
-            self.doc.add_heading(f"{self.get_text('interpretation')}: {indicator}", level=3)
+            self.doc.add_heading(f"{self.get_text('interpretation')}: {indicator}", level=3 + self.heading_offset)
         
         # Determine interpretation style based on score
         style = 'Normal'
@@ -642,7 +736,7 @@ class WordReportGenerator:
         """
         # Add heading if indicator name is provided
         if indicator:
-            self.doc.add_heading(f"{self.get_text('recommendations')}: {indicator}", level=3)
+            self.doc.add_heading(f"{self.get_text('recommendations')}: {indicator}", level=3 + self.heading_offset)
         
         # Determine recommendation based on score
         if score is not None:
@@ -710,20 +804,28 @@ class WordReportGenerator:
                     run.font.size = Pt(9)
                     run.font.color.rgb = RGBColor(128, 128, 128)  # Gray
             
-            # Footer
-            if include_page_numbers:
-                footer = section.footer
-                footer_paragraph = footer.paragraphs[0]
-                
-                # Add page numbers field code
-                page_nums_fmt = f"{self.get_text('page')} {{0}} {self.get_text('of')} {{1}}"
-                add_page_number(footer_paragraph, page_nums_fmt)
-                footer_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                # Format footer text
-                for run in footer_paragraph.runs:
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(128, 128, 128)  # Gray
+            # Footer (already present in documents started from the template)
+            if include_page_numbers and not section.footer.paragraphs[0].runs:
+                self._add_page_numbers(section)
+    
+    def _add_page_numbers(self, section):
+        """
+        Add page numbers to the footer of a section.
+        
+        Args:
+            section: Document section
+        """
+        footer_paragraph = section.footer.paragraphs[0]
+        
+        # Add page numbers field code
+        page_nums_fmt = f"{self.get_text('page')} {{0}} {self.get_text('of')} {{1}}"
+        add_page_number(footer_paragraph, page_nums_fmt)
+        footer_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        # Format footer text
+        for run in footer_paragraph.runs:
+            run.font.size = Pt(9)
+            run.font.color.rgb = RGBColor(128, 128, 128)  # Gray
     
     def save(self, filename):
         """
@@ -737,6 +839,7 @@ class WordReportGenerator:
         """
         # Make sure directory exists
         os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self.resolve_pictures()
         
         # Save document
         self.doc.save(filename)
@@ -744,6 +847,21 @@ class WordReportGenerator:
         # Clean up temporary files
         self.cleanup()
     
+    def to_bytes(self):
+        """
+        Serialise the report to bytes in memory.
+        
+        Returns:
+            bytes: The .docx file content
+        """
+        self.resolve_pictures()
+        docx_bytes = document_to_bytes(self.doc)
+        
+        # Clean up temporary files
+        self.cleanup()
+        
+        return docx_bytes
+    
     def get_document(self):
         """
         Get the document object.
@@ -751,6 +869,7 @@ class WordReportGenerator:
         Returns:
             Document: The document object
         """
+        self.resolve_pictures()
         return self.doc
     
     def cleanup(self):